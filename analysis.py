@@ -0,0 +1,260 @@
+# analysis.py : Analysis of the pycnumanal application's stored timings
+#
+#    VERSION 1.00
+#
+#    - empirical complexity fitting: which growth model best explains a
+#      program's timings vs. problem size
+#
+#    - runs on Linux (not tested on Windows)
+#    - Python 3.x (not tested with Python 2.x)
+#
+# --------------------------------------------------------
+#
+# Change log:
+#
+#    10/18/2026 (ag)   - created this module
+#                      - added fit_complexity()
+#                      - added fit_models()
+#                      - added fit_power_law()
+#
+#    10/18/2026 (ag)   - added model_timing() and predict_timing() (used to predict the
+#                        cost of a problem size sweep's next problem size)
+#
+# (ag) agent
+#
+# ---------------------------------------------------------
+
+# third-party modules
+import numpy as np
+
+# -----------------------------------------------------------------
+
+# Growth models fitted as  timing = a + b * f(n)
+#    (O(1) is fitted as  timing = a)
+growth_models = [
+    ["O(1)",       lambda n : np.zeros_like(n)],
+    ["O(log n)",   lambda n : np.log(n)],
+    ["O(n)",       lambda n : n],
+    ["O(n log n)", lambda n : n * np.log(n)],
+    ["O(n^2)",     lambda n : n**2],
+    ["O(n^3)",     lambda n : n**3],
+]
+
+# the power law  timing = a * n^b  is only the best model when the best growth model's
+# relative error is more than power_law_threshold, and the power law's relative error
+# is power_law_advantage (or less) of it (otherwise the simpler, named growth model is reported)
+power_law_threshold = 0.01
+power_law_advantage = 0.5
+
+# -----------------------------------------------------------------
+
+def fit_complexity(prob_sizes, timings) :
+    """ Find the growth model that best fits a program's timings
+
+        In:  prob_sizes - problem sizes (NumPy array, or list, of positive integers)
+             timings    - timing of each problem size (NumPy array, or list, of floats)
+        Out: best_fit   - the best fitting model (dictionary, see fit_models())
+                          (None if there are fewer than 3 timings)
+             fits       - every model's fit, growth models then the power law (list of dictionaries)
+
+        The models are compared by their root mean square relative error, since
+        timings usually cover several orders of magnitude
+    """
+
+    n = np.asarray(prob_sizes, dtype=np.float64)
+    t = np.asarray(timings,    dtype=np.float64)
+
+    if len(n) < 3 :
+        return [None, []]
+
+    fits = fit_models(n, t)
+    fits.append(fit_power_law(n, t))
+
+    # growth models that shrink as n grows (b < 0) don't describe a complexity
+    candidates = [fit for fit in fits[0:len(growth_models)]
+                  if fit["model"] == "O(1)" or fit["coefficients"][1] >= 0.0]
+
+    best_fit = min(candidates, key=lambda fit : fit["rel_rms_error"])
+
+    power_fit = fits[-1]
+    if best_fit["rel_rms_error"] > power_law_threshold and \
+       power_fit["rel_rms_error"] <= power_law_advantage * best_fit["rel_rms_error"] :
+        best_fit = power_fit
+
+    return [best_fit, fits]
+
+# end function: fit_complexity
+
+# -----------------------------------------------------------------
+
+def fit_models(n, t) :
+    """ Fit all the growth models to timings with one (vectorized) least squares solve
+
+        In:  n    - problem sizes (NumPy float64 array)
+             t    - timings (NumPy float64 array)
+        Out: fits - each growth model's fit (list of dictionaries, in growth_models order):
+                       "model"         - model name (string)
+                       "coefficients"  - [a, b] of  timing = a + b * f(n) (list of floats)
+                       "r_squared"     - coefficient of determination (float)
+                       "rel_rms_error" - root mean square relative error (float)
+
+        Each model is fitted by relative error (rows weighted by 1/timing), so that the
+        large problem sizes don't drown out the small ones
+    """
+
+    num_models = len(growth_models)
+
+    # columns of f(n) for every model (points x models), scaled to a maximum of 1
+    # so that the n^3 column doesn't ruin the solve's accuracy
+    f = np.column_stack([model_function(n) for [model_name, model_function] in growth_models])
+    scales = np.max(np.abs(f), axis=0)
+    scales[scales == 0.0] = 1.0
+    f = f / scales
+
+    # relative error weights (timings of 0, e.g. below the clock's resolution, get
+    # the weight of a small timing instead of an infinite one)
+    floor = 1e-3 * np.max(np.abs(t)) if np.max(np.abs(t)) > 0.0 else 1.0
+    w = 1.0 / np.maximum(np.abs(t), floor)
+
+    # weighted design matrices of all models (models x points x 2): [w, w * f(n)]
+    design = np.empty((num_models, len(n), 2))
+    design[:, :, 0] = w
+    design[:, :, 1] = (w[:, np.newaxis] * f).T
+
+    # O(1) only has the constant term (its f(n) column is all zeros); a tiny ridge term
+    # keeps its normal equations solvable without changing the other models' fits
+    normal_matrices = np.einsum("mpi,mpj->mij", design, design)
+    normal_matrices[:, 1, 1] += 1e-300 + 1e-12 * normal_matrices[:, 1, 1]
+    normal_rhs = np.einsum("mpi,p->mi", design, w * t)
+    coefs = np.linalg.solve(normal_matrices, normal_rhs[:, :, np.newaxis])[:, :, 0]
+
+    # predictions of every model (models x points), back on the unscaled f(n)
+    predictions = coefs[:, 0:1] + coefs[:, 1:2] * f.T
+    coefs[:, 1] = coefs[:, 1] / scales
+
+    fits = []
+    for k in range(0, num_models) :
+        [r_squared, rel_rms_error] = goodness_of_fit(t, predictions[k], floor)
+        fits.append( {"model"         : growth_models[k][0],
+                      "coefficients"  : [float(coefs[k, 0]), float(coefs[k, 1])],
+                      "r_squared"     : r_squared,
+                      "rel_rms_error" : rel_rms_error} )
+
+    return fits
+
+# end function: fit_models
+
+# -----------------------------------------------------------------
+
+def fit_power_law(n, t) :
+    """ Fit the power law  timing = a * n^b  to timings (least squares on log timing vs. log n)
+
+        In:  n   - problem sizes (NumPy float64 array)
+             t   - timings (NumPy float64 array)
+        Out: fit - the power law's fit (dictionary, same keys as fit_models()'s fits)
+                   ("model" is "a*n^b"; coefficients are [a, b])
+
+        Only positive timings can be used; with fewer than 2 of them the fit's
+        errors are infinite
+    """
+
+    positive = t > 0.0
+    if np.count_nonzero(positive) < 2 :
+        return {"model" : "a*n^b", "coefficients" : [0.0, 0.0], "r_squared" : -np.inf, "rel_rms_error" : np.inf}
+
+    design = np.column_stack([np.ones(np.count_nonzero(positive)), np.log(n[positive])])
+    [[log_a, b], residuals, rank, singular_values] = np.linalg.lstsq(design, np.log(t[positive]), rcond=None)
+
+    a = np.exp(log_a)
+    prediction = a * n**b
+
+    floor = 1e-3 * np.max(np.abs(t))
+    [r_squared, rel_rms_error] = goodness_of_fit(t, prediction, floor)
+
+    return {"model" : "a*n^b", "coefficients" : [float(a), float(b)], "r_squared" : r_squared, "rel_rms_error" : rel_rms_error}
+
+# end function: fit_power_law
+
+# -----------------------------------------------------------------
+
+def goodness_of_fit(t, prediction, floor) :
+    """ How well a model's predictions match the timings
+
+        In:  t             - timings (NumPy float64 array)
+             prediction    - the model's predicted timings (NumPy float64 array)
+             floor         - smallest timing used when dividing by a timing (float)
+        Out: r_squared     - coefficient of determination (float, 1.0 is a perfect fit)
+             rel_rms_error - root mean square relative error (float, 0.0 is a perfect fit)
+    """
+
+    residuals = t - prediction
+
+    ss_total = np.sum((t - np.mean(t))**2)
+    if ss_total > 0.0 :
+        r_squared = float(1.0 - np.sum(residuals**2) / ss_total)
+    else :
+        r_squared = 1.0 if np.allclose(residuals, 0.0) else 0.0
+
+    rel_rms_error = float(np.sqrt(np.mean((residuals / np.maximum(np.abs(t), floor))**2)))
+
+    return [r_squared, rel_rms_error]
+
+# end function: goodness_of_fit
+
+# -----------------------------------------------------------------
+
+def model_timing(fit, prob_size) :
+    """ Timing of a problem size according to a fitted model
+
+        In:  fit       - a model's fit (dictionary, see fit_models() and fit_power_law())
+             prob_size - problem size (integer, or NumPy array of them)
+        Out: timing    - the model's timing for the problem size (float, or NumPy array of them)
+    """
+
+    [a, b] = fit["coefficients"]
+    n = np.asarray(prob_size, dtype=np.float64)
+
+    if fit["model"] == "a*n^b" :
+        return a * n**b
+
+    for [model_name, model_function] in growth_models :
+        if model_name == fit["model"] :
+            return a + b * model_function(n)
+
+    raise ValueError("unknown model: {}".format(fit["model"]))
+
+# end function: model_timing
+
+# -----------------------------------------------------------------
+
+def predict_timing(prob_sizes, timings, prob_size) :
+    """ Predict the timing of a larger problem size from the timings measured so far
+
+        In:  prob_sizes - problem sizes measured so far (list of integers, at least one)
+             timings    - timing of each problem size (list of floats)
+             prob_size  - problem size to predict the timing of (integer)
+        Out: timing     - predicted timing (float)
+
+        The prediction is the best fitting model's (3 or more timings) or the power
+        law's (2 timings), but never less than the largest problem size's timing scaled
+        linearly, since small problem sizes' timings are often mostly startup overhead
+        that makes the fits underestimate the larger problem sizes
+    """
+
+    n = np.asarray(prob_sizes, dtype=np.float64)
+    t = np.asarray(timings,    dtype=np.float64)
+
+    largest = np.argmax(n)
+    timing = t[largest] * prob_size / n[largest]
+
+    if len(n) >= 3 :
+        [best_fit, fits] = fit_complexity(n, t)
+        timing = max(timing, model_timing(best_fit, prob_size))
+    elif len(n) == 2 :
+        timing = max(timing, model_timing(fit_power_law(n, t), prob_size))
+
+    return float(timing)
+
+# end function: predict_timing
+
+# -----------------------------------------------------------------
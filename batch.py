@@ -0,0 +1,453 @@
+# batch.py : Headless (non-interactive) batch jobs of the pycnumanal application
+#
+#    VERSION 1.00
+#
+#    - runs the sweeps listed in a job specification file (JSON or TOML) without
+#      any prompts, e.g. from cron or a batch scheduler:
+#
+#         python3 pycnumanal.py --batch job.json
+#
+#    - progress is printed as JSON lines (one JSON object per line) on stdout
+#    - the exit status tells whether the job succeeded (see exit_codes)
+#    - a sweep that was interrupted (e.g. its node was preempted) is resumed with its
+#      sweep id (reported in its "sweep_start" line):
+#
+#         python3 pycnumanal.py --resume sweep_id
+#
+#    - runs on Linux (not tested on Windows)
+#    - Python 3.x (not tested with Python 2.x; TOML job files need Python 3.11+)
+#
+# --------------------------------------------------------
+#
+# Job specification file (JSON shown; TOML has the same structure):
+#
+#    {
+#      "settings" : {"num_workers" : 8, "trials" : 5, "on_conflict" : "replace"},
+#      "sweeps"   : [
+#        {"program" : "linear timing", "sizes" : [1000, 2000, 4000]},
+#        {"program" : "nlogn timing",  "range" : {"start" : 1000, "stop" : 10000, "step" : 1000}},
+#        {"program" : "nsquared timing", "range" : {"start" : 100, "stop" : 40000, "factor" : 2},
+#         "settings" : {"trials" : 3}},
+#        {"program" : "l2vecnorm",     "auto_sweep" : {"start" : 1000, "growth_factor" : 2,
+#                                                      "budget" : 600, "max_run_time" : 60,
+#                                                      "max_size" : 100000000}}
+#      ]
+#    }
+#
+#    "settings"   - application settings (see pycnumanal.settings), e.g. the repetitions
+#                   ("trials"), parallelism ("num_workers") and conflict policy ("on_conflict");
+#                   a sweep's own "settings" only apply to that sweep
+#    "sizes"      - list of problem sizes
+#    "range"      - problem sizes from "start" to "stop" (included if reached), adding "step"
+#                   or multiplying by "factor"
+#    "auto_sweep" - a time budgeted sweep (see pycnumanal.sweep_timings(); "max_size" is optional)
+#    "queue"      - true: the sweeps' problem sizes are queued in the database for worker
+#                   processes (see worker.py) instead of being run by the batch job
+#                   ("auto_sweep" sweeps can't be queued: each size depends on the last timing)
+#
+# --------------------------------------------------------
+#
+# Change log:
+#
+#    10/18/2026 (ag)   - created this module
+#                      - added load_job_spec(), get_jobs(), get_sweep_sizes(),
+#                        apply_settings(), run_job(), stop_on_sigterm() and report()
+#
+#    10/18/2026 (ag)   - modified run_job() to only skip problem sizes whose stored timing matches
+#                        the program's current executable; stale ones are reported and rerun
+#
+#    10/18/2026 (ag)   - added "queue" job files: modified run_job() to queue the sweeps for
+#                        worker processes (pycnumanal.enqueue_timings()) instead of running them
+#                      - modified get_jobs() to reject queued "auto_sweep" sweeps
+#
+#    10/18/2026 (ag)   - modified run_job() to record each sweep of problem sizes in the database
+#                        (main.plan_sweep()), so that it can be resumed
+#                      - added resume_sweep()
+#
+#    10/18/2026 (ag)   - modified get_jobs() to check a program's existence with main.program_exists()
+#                        (a sweep's program can be a Python function)
+#
+#    10/18/2026 (ag)   - modified run_job() to rerun problem sizes whose stored timing failed (reported
+#                        as "rerun_failed") instead of skipping them as valid timings
+#
+# (ag) agent
+#
+# ---------------------------------------------------------
+
+# standard modules
+import json
+import signal
+import time
+
+try :
+    import tomllib   # Python 3.11+
+except ImportError :
+    tomllib = None
+
+# -----------------------------------------------------------------
+
+# exit status of a batch job
+#    ok          - every problem size's timing was generated
+#    failed      - some problem sizes failed (e.g. "timeout"; their status is in the database)
+#    error       - invalid job specification file (nothing was run)
+#    interrupted - stopped by Ctrl-C or SIGTERM (the finished timings are in the database)
+exit_codes = {
+    "ok"          : 0,
+    "failed"      : 1,
+    "error"       : 2,
+    "interrupted" : 130,
+}
+
+# -----------------------------------------------------------------
+
+def report(event, fields) :
+    """ Print a machine-readable progress line (a JSON object) on stdout
+
+        In:  event  - what happened (string, e.g. "timing")
+             fields - the event's info (dictionary)
+        Out: nothing
+    """
+
+    line = {"event" : event}
+    line.update(fields)
+
+    print(json.dumps(line), flush=True)
+
+# end function: report
+
+# -----------------------------------------------------------------
+
+def load_job_spec(spec_filename) :
+    """ Read a job specification file
+
+        In:  spec_filename - name of the job specification file (string)
+                             (".toml" files are TOML, all others are JSON)
+        Out: spec          - the job specification (dictionary)
+
+        Raises ValueError if the file can't be read or parsed
+    """
+
+    try :
+        if spec_filename.endswith(".toml") :
+            if tomllib is None :
+                raise ValueError("TOML job files need Python 3.11 or later (use JSON instead)")
+            with open(spec_filename, "rb") as f :
+                spec = tomllib.load(f)
+        else :
+            with open(spec_filename, "rt") as f :
+                spec = json.load(f)
+    except OSError as ex :
+        raise ValueError("can't read job file: {}".format(ex))
+    except (json.JSONDecodeError, getattr(tomllib, "TOMLDecodeError", json.JSONDecodeError)) as ex :
+        raise ValueError("can't parse job file: {}".format(ex))
+
+    if not isinstance(spec, dict) :
+        raise ValueError("job file needs to be an object/table")
+
+    return spec
+
+# end function: load_job_spec
+
+# -----------------------------------------------------------------
+
+def get_sweep_sizes(sweep) :
+    """ Get the problem sizes of a sweep in a job specification
+
+        In:  sweep      - the sweep's specification (dictionary with "sizes" and/or "range")
+        Out: prob_sizes - the sweep's problem sizes, without duplicates (list of integers)
+
+        Raises ValueError for invalid problem sizes
+    """
+
+    prob_sizes = list(sweep.get("sizes", []))
+
+    if "range" in sweep :
+        size_range = sweep["range"]
+        start = size_range.get("start")
+        stop  = size_range.get("stop")
+        if not isinstance(start, int) or not isinstance(stop, int) :
+            raise ValueError("a range needs integer \"start\" and \"stop\"")
+
+        if "step" in size_range :
+            step = size_range["step"]
+            if not isinstance(step, int) or step < 1 :
+                raise ValueError("a range's \"step\" needs to be an integer >= 1")
+            prob_sizes += list(range(start, stop + 1, step))
+
+        elif "factor" in size_range :
+            factor = size_range["factor"]
+            if not isinstance(factor, (int, float)) or factor <= 1 :
+                raise ValueError("a range's \"factor\" needs to be > 1")
+            prob_size = start
+            while prob_size <= stop :
+                prob_sizes.append(prob_size)
+                prob_size = max(prob_size + 1, round(prob_size * factor))
+
+        else :
+            raise ValueError("a range needs a \"step\" or a \"factor\"")
+
+    for prob_size in prob_sizes :
+        if not isinstance(prob_size, int) or prob_size <= 0 :
+            raise ValueError("invalid problem size: {}".format(prob_size))
+
+    # duplicates removed, keeping the first one
+    return list(dict.fromkeys(prob_sizes))
+
+# end function: get_sweep_sizes
+
+# -----------------------------------------------------------------
+
+def apply_settings(setting_values) :
+    """ Change several application settings at once
+
+        In:  setting_values - new values of the settings (dictionary)
+        Out: old_settings   - the settings before the change (dictionary, to restore them)
+
+        Raises ValueError for an unknown setting or an invalid value
+        (the settings are left unchanged)
+    """
+
+    old_settings = dict(main.settings)
+
+    try :
+        for [name, value] in setting_values.items() :
+            main.set_setting(name, value)
+    except ValueError :
+        main.settings.update(old_settings)
+        raise
+
+    return old_settings
+
+# end function: apply_settings
+
+# -----------------------------------------------------------------
+
+def get_jobs(spec) :
+    """ Check a job specification and get the sweeps to run
+
+        In:  spec  - the job specification (dictionary, see load_job_spec())
+        Out: jobs  - the sweeps to run (list of lists):
+                        [prog_name, prob_sizes, auto_sweep, setting_values]
+                     (prob_sizes is None for an "auto_sweep" sweep, auto_sweep is None otherwise;
+                      setting_values are the job's settings updated with the sweep's settings)
+
+        Raises ValueError for an invalid job specification
+        (everything is checked before anything is run)
+    """
+
+    job_settings = spec.get("settings", {})
+    sweeps = spec.get("sweeps", [])
+    if not isinstance(job_settings, dict) or not isinstance(sweeps, list) or len(sweeps) == 0 :
+        raise ValueError("job file needs a \"sweeps\" list (and optionally a \"settings\" object/table)")
+    if not isinstance(spec.get("queue", False), bool) :
+        raise ValueError("job file's \"queue\" needs to be true or false")
+
+    jobs = []
+    for sweep in sweeps :
+        prog_name = sweep.get("program") if isinstance(sweep, dict) else None
+        if not isinstance(prog_name, str) :
+            raise ValueError("every sweep needs a \"program\" name")
+
+        # is the program in the database, and is its executable (or Python module) in the current directory?
+        cmd_line_prefix = main.get_cmd_line_prefix(prog_name)
+        if cmd_line_prefix == "" :
+            raise ValueError("program \"{}\" isn't in the database".format(prog_name))
+        if not main.program_exists(cmd_line_prefix, main.get_program_type(prog_name)) :
+            raise ValueError("the \"{}\" program doesn't exist in current directory".format(cmd_line_prefix))
+
+        setting_values = dict(job_settings)
+        setting_values.update(sweep.get("settings", {}))
+
+        # the settings are checked by applying them (and then restoring the old ones)
+        old_settings = apply_settings(setting_values)
+        main.settings.update(old_settings)
+
+        if "auto_sweep" in sweep :
+            if spec.get("queue", False) :
+                raise ValueError("\"{}\" auto_sweep can't be queued".format(prog_name))
+            auto_sweep = sweep["auto_sweep"]
+            for key in ["start", "growth_factor", "budget", "max_run_time"] :
+                if not isinstance(auto_sweep.get(key), (int, float)) :
+                    raise ValueError("\"{}\" auto_sweep needs a numeric \"{}\"".format(prog_name, key))
+            if not isinstance(auto_sweep["start"], int) or auto_sweep["start"] < 1 :
+                raise ValueError("\"{}\" auto_sweep's \"start\" needs to be an integer >= 1".format(prog_name))
+            if auto_sweep["growth_factor"] <= 1 :
+                raise ValueError("\"{}\" auto_sweep's \"growth_factor\" needs to be > 1".format(prog_name))
+            if "max_size" in auto_sweep and not isinstance(auto_sweep["max_size"], int) :
+                raise ValueError("\"{}\" auto_sweep's \"max_size\" needs to be an integer".format(prog_name))
+            jobs.append([prog_name, None, auto_sweep, setting_values])
+        else :
+            prob_sizes = get_sweep_sizes(sweep)
+            if len(prob_sizes) == 0 :
+                raise ValueError("\"{}\" sweep needs \"sizes\", a \"range\" or an \"auto_sweep\"".format(prog_name))
+            jobs.append([prog_name, prob_sizes, None, setting_values])
+
+    return jobs
+
+# end function: get_jobs
+
+# -----------------------------------------------------------------
+
+def stop_on_sigterm(signal_num, frame) :
+    """ SIGTERM handler (e.g. a batch scheduler stopping the job): stops like Ctrl-C,
+        so that the finished timings are still added to the database
+
+        In:  signal_num - signal # (integer)
+             frame      - current stack frame
+        Out: nothing
+    """
+
+    raise KeyboardInterrupt
+
+# end function: stop_on_sigterm
+
+# -----------------------------------------------------------------
+
+def run_job(spec_filename) :
+    """ Run a batch job: every sweep in a job specification file
+
+        In:  spec_filename - name of the job specification file (string)
+        Out: exit_code     - exit status of the job (integer, see exit_codes)
+
+        Problem sizes that already have a valid timing (see main.get_cached_sizes())
+        are skipped when the "on_conflict" setting is "skip" (the same as the interactive menu);
+        stale and failed ones are reported and rerun
+
+        A "queue" job only queues the sweeps' problem sizes for worker processes
+    """
+
+    try :
+        spec = load_job_spec(spec_filename)
+        jobs = get_jobs(spec)
+    except ValueError as ex :
+        report("error", {"message" : str(ex)})
+        return exit_codes["error"]
+
+    queue = spec.get("queue", False)
+
+    signal.signal(signal.SIGTERM, stop_on_sigterm)
+
+    start_time = time.perf_counter()
+    report("job_start", {"spec" : spec_filename, "num_sweeps" : len(jobs)})
+
+    num_ok     = 0
+    num_failed = 0
+    exit_code  = exit_codes["ok"]
+    try :
+        for [prog_name, prob_sizes, auto_sweep, setting_values] in jobs :
+            old_settings = apply_settings(setting_values)
+            try :
+                sweep_start_time = time.perf_counter()
+                sweep_ok     = 0
+                sweep_failed = 0
+
+                if auto_sweep is not None :
+                    report("sweep_start", {"program" : prog_name, "auto_sweep" : auto_sweep})
+                    timings = main.sweep_timings(prog_name, auto_sweep["start"], auto_sweep["growth_factor"],
+                                                 auto_sweep["budget"], auto_sweep["max_run_time"],
+                                                 auto_sweep.get("max_size"))
+                else :
+                    [cached_sizes, stale_sizes, failed_sizes] = main.get_cached_sizes(prog_name, prob_sizes)
+                    for prob_size in prob_sizes :
+                        if prob_size in stale_sizes :
+                            report("stale", {"program" : prog_name, "problem_size" : prob_size})
+                        elif prob_size in failed_sizes :
+                            report("rerun_failed", {"program" : prog_name, "problem_size" : prob_size})
+
+                    if main.settings["on_conflict"] == "skip" :
+                        new_prob_sizes = []
+                        for prob_size in prob_sizes :
+                            if prob_size in cached_sizes :
+                                report("skipped", {"program" : prog_name, "problem_size" : prob_size})
+                            else :
+                                new_prob_sizes.append(prob_size)
+                        prob_sizes = new_prob_sizes
+
+                    if queue :
+                        [batch_id, num_jobs] = main.enqueue_timings(prog_name, prob_sizes)
+                        report("queued", {"program" : prog_name, "num_sizes" : len(prob_sizes),
+                                          "num_jobs" : num_jobs, "batch_id" : batch_id})
+                        continue
+
+                    sweep_id = main.plan_sweep(prog_name, prob_sizes)
+                    report("sweep_start", {"program" : prog_name, "num_sizes" : len(prob_sizes), "sweep_id" : sweep_id})
+                    timings = main.run_sweep(sweep_id)
+
+                for [prob_size, timing, status] in timings :
+                    report("timing", {"program" : prog_name, "problem_size" : prob_size,
+                                      "timing" : timing, "status" : status})
+                    if status == "ok" :
+                        sweep_ok += 1
+                    else :
+                        sweep_failed += 1
+
+                report("sweep_done", {"program" : prog_name, "num_ok" : sweep_ok, "num_failed" : sweep_failed,
+                                      "seconds" : time.perf_counter() - sweep_start_time})
+                num_ok     += sweep_ok
+                num_failed += sweep_failed
+
+            finally :
+                main.settings.update(old_settings)
+
+    except KeyboardInterrupt :
+        exit_code = exit_codes["interrupted"]
+
+    if exit_code == exit_codes["ok"] and num_failed > 0 :
+        exit_code = exit_codes["failed"]
+
+    report("job_done", {"num_ok" : num_ok, "num_failed" : num_failed, "exit_code" : exit_code,
+                        "seconds" : time.perf_counter() - start_time})
+
+    return exit_code
+
+# end function: run_job
+
+# -----------------------------------------------------------------
+
+def resume_sweep(sweep_id) :
+    """ Resume an interrupted sweep (see main.run_sweep()): run its problem sizes that aren't done
+
+        In:  sweep_id  - id of the sweep (integer)
+        Out: exit_code - exit status of the resumed sweep (integer, see exit_codes)
+                         ("error" if there is no such sweep)
+    """
+
+    [prog_name, state, prob_sizes] = main.get_sweep(sweep_id)
+    if prog_name == "" :
+        report("error", {"message" : "there is no sweep {}".format(sweep_id)})
+        return exit_codes["error"]
+
+    signal.signal(signal.SIGTERM, stop_on_sigterm)
+
+    start_time = time.perf_counter()
+    report("sweep_start", {"program" : prog_name, "num_sizes" : len(prob_sizes), "sweep_id" : sweep_id,
+                           "resumed_from" : state})
+
+    num_ok     = 0
+    num_failed = 0
+    exit_code  = exit_codes["ok"]
+    try :
+        for [prob_size, timing, status] in main.run_sweep(sweep_id) :
+            report("timing", {"program" : prog_name, "problem_size" : prob_size, "timing" : timing, "status" : status})
+            if status == "ok" :
+                num_ok += 1
+            else :
+                num_failed += 1
+
+    except KeyboardInterrupt :
+        exit_code = exit_codes["interrupted"]
+
+    if exit_code == exit_codes["ok"] and num_failed > 0 :
+        exit_code = exit_codes["failed"]
+
+    report("sweep_done", {"program" : prog_name, "num_ok" : num_ok, "num_failed" : num_failed, "sweep_id" : sweep_id,
+                          "exit_code" : exit_code, "seconds" : time.perf_counter() - start_time})
+
+    return exit_code
+
+# end function: resume_sweep
+
+# -----------------------------------------------------------------
+
+# custom module
+import pycnumanal as main
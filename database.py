@@ -59,37 +59,346 @@
 #
 #    12/31/2018 (pf)   - RELEASING AS VERSION 1.0
 #
+#    10/18/2026 (ag)   - added versioning of the database's table structures
+#                          - schema.sql sets "PRAGMA user_version" to the current version
+#                          - added db_upgrades (list) and upgrade_db()
+#                          - create_db_connection() upgrades existing databases
+#                      - timings table: added wall_time, user_time, sys_time columns
+#                      - modified add_timing() to also store a generated timing's run info
+#
+#    10/18/2026 (ag)   - added samples table (every measured run of a timing)
+#                      - timings table: added num_samples, timing_min, timing_mean, timing_stdev columns
+#                      - modified add_timing() to store a timing's samples and their statistics
+#                      - added get_timing_stats()
+#
+#    10/18/2026 (ag)   - samples table: added outlier column
+#                      - modified add_timing() to leave outlier samples out of the timing's statistics
+#
+#    10/18/2026 (ag)   - timings table: added unique index on (program_name, problem_size)
+#                          - upgrading removes duplicate timings (the newest one is kept)
+#                          - the index is also used by get_timings()'s query (no full table scan or sort)
+#                      - every timing now has at least one sample (a manually entered timing is its own sample)
+#                      - modified add_timing()
+#                          - added on_conflict argument: "skip", "replace" or "merge" a timing that
+#                            is already in the database (added timing_upserts (dictionary))
+#                          - returns whether the timing was stored
+#                      - added has_timing()
+#
+#    10/18/2026 (ag)   - added Database class, replacing the GLOBAL VARIABLE conn
+#                          - each thread gets its own connection (connection())
+#                          - WAL journaling, synchronous/cache_size/mmap_size pragmas and a
+#                            busy timeout, so that parallel writers and readers can share timings.db
+#                          - larger prepared statement cache
+#                          - upgrade_db() is now the upgrade() method
+#                      - create_db_connection() now stores a Database object in the GLOBAL VARIABLE: database
+#                      - functions use the calling thread's connection: database.connection()
+#
+#    10/18/2026 (ag)   - added add_timings(): adds a batch of timings with executemany() and one commit
+#                      - added TimingWriter class: adds queued timings in batches from its own thread
+#                      - moved add_timing()'s work into insert_timing() (doesn't commit) and
+#                        get_timing_samples(), so that add_timings() can use them too
+#
+#    10/18/2026 (ag)   - added get_timings_array(): a program's timings as a NumPy structured array
+#                        (timings_dtype), filled straight from the cursor
+#                      - modified get_timings() to return NumPy arrays (columns of get_timings_array())
+#                      - removed get_timing_stats() (its columns are in get_timings_array())
+#                      - modified get_programs() to turn the rows into columns with zip()
+#
+#    10/18/2026 (ag)   - added iter_timings(): streams timings in chunks (keyset pagination),
+#                        optionally only for one program and/or a range of problem sizes
+#
+#    10/18/2026 (ag)   - added get_timings_many(): several programs' timings with one query
+#
+#    10/18/2026 (ag)   - timings and samples tables: added status column (outcome of the runs, e.g.
+#                        "timeout"); a failed problem size is stored with a NULL timing
+#                      - get_timings_array() and get_timings_many() only get "ok" timings
+#                      - iter_timings() rows end with the timing's status
+#
+#    10/18/2026 (ag)   - timings table: added fingerprint column (the executable and arguments the
+#                        timing was generated with, see runner.get_fingerprint())
+#                      - a generated timing whose fingerprint differs from the stored timing's
+#                        replaces it, even when skipping or merging (the stored timing is stale)
+#                          - added get_conflict_policy(), used by insert_timing() and add_timings()
+#                      - added get_timing_fingerprints() and get_samples_fingerprint()
+#
+#    10/18/2026 (ag)   - added a cache of the programs table (Database programs() and
+#                        invalidate_programs() methods)
+#                          - reloaded when another connection changed the database ("PRAGMA data_version")
+#                          - invalidated by add_program() and delete_program()
+#                      - get_program_info(), get_cmd_line_prefix() and get_programs() use the cache
+#
+#    10/18/2026 (ag)   - added a work queue, so that worker processes (possibly on several hosts)
+#                        can share a sweep's runs
+#                          - queue_batches and queue_jobs tables (a job is a problem size's trial,
+#                            or all of its trials)
+#                          - added enqueue_jobs(), claim_job(), renew_lease(), finish_job(),
+#                            release_job(), collect_prob_size() and get_queue_counts()
+#                          - a job's lease expires unless renewed; expired jobs are requeued
+#                      - added Database journal_mode (class variable): "DELETE" (rollback journal)
+#                        for a database shared by hosts (WAL needs every process on one host)
+#                      - modified get_samples_fingerprint() to skip samples without a fingerprint
+#
+#    10/18/2026 (ag)   - added sweeps and sweep_sizes tables (a sweep's plan, and each problem size's
+#                        state and timestamps), so that an interrupted sweep can be resumed
+#                          - added add_sweep(), get_sweep(), get_unfinished_sweeps(),
+#                            set_sweep_size_running() and set_sweep_state()
+#                          - modified add_timings() and TimingWriter to mark a sweep's problem sizes
+#                            done in the same transaction that stores their timings
+#
+#    10/18/2026 (ag)   - samples table: added max_rss, minor_faults, major_faults, vol_ctx_switches and
+#                        invol_ctx_switches columns (the run's resource usage, see runner.rusage_fields)
+#                          - added sample_metrics (list), used by insert_timing() and add_timings()
+#                          - added get_sample_metric_many(): several programs' medians of a resource
+#                            usage column for each problem size
+#
+#    10/18/2026 (ag)   - programs table: added program_type column ("executable" or "python",
+#                        see runner.program_types)
+#                          - added program_type argument to add_program()
+#                          - added get_program_type()
+#                          - the programs cache holds each program's type
+#
+#    10/18/2026 (ag)   - program_type can also be "library" (a C function in a shared library)
+#
+#    10/18/2026 (ag)   - program_type can also be "sweep" (measures all of the problem sizes in one run)
+#
+#    10/18/2026 (ag)   - samples table: added iteration_times column (the timings a run wrote to its
+#                        result channel, see runner.create_result_channel())
+#                          - added get_iteration_times() and get_iteration_times_blob()
+#                          - modified finish_job() to store the queued runs' iteration times as lists
+#
+#    10/18/2026 (ag)   - modified get_conflict_policy() to also replace a stored timing that failed
+#                        (e.g. "timeout"), whatever the conflict policy
+#
+#    10/18/2026 (ag)   - added Database.close_connection() and close_thread_connection(): a thread's
+#                        connection is closed when the thread is done with the database, instead of
+#                        being kept (with its page cache and memory map) until close_db()
+#
+#    10/18/2026 (ag)   - modified TimingWriter: a batch that couldn't be written is kept and written again
+#                        by close() (left in its "unwritten" list if that fails too), and its thread closes
+#                        its database connection when it is done
+#
+#    10/18/2026 (ag)   - modified add_timing() and add_timings(): the transaction is rolled back when
+#                        they fail (its rows were committed by the connection's next commit)
+#
+#    10/18/2026 (ag)   - modified get_timings_array(): no longer counts the timings first (a timing
+#                        committed between the count and the rows made np.fromiter() fail or drop rows)
+#
 # (pf) Patrick Flynn
+# (ag) agent
 #
 # ---------------------------------------------------------
 
 # standard modules
+import json
 import os
+import queue
+import threading
+import time
 
 # third-party modules
+import numpy as np
 import sqlite3 as sql
 
+# custom modules
+import timing_stats
+
 # -----------------------------------------------------------------
 
-def create_db_connection(db_filename, schema_filename) :
-    """ Creates the database connection (database file created if needed)
+# Upgrades of the database's table structures
+#
+#    db_upgrades[k] is the SQL script that upgrades a version k database to version k+1
+#    (the version is stored in the database's "PRAGMA user_version"; schema.sql creates
+#    new databases at the latest version, len(db_upgrades))
+db_upgrades = [
+
+    # version 0 -> 1: timings measured in Python, stored next to the program's own timing
+    """ALTER TABLE timings ADD COLUMN wall_time real;
+       ALTER TABLE timings ADD COLUMN user_time real;
+       ALTER TABLE timings ADD COLUMN sys_time  real;""",
+
+    # version 1 -> 2: repeated trials (samples) of a timing, and their statistics
+    """ALTER TABLE timings ADD COLUMN num_samples  integer;
+       ALTER TABLE timings ADD COLUMN timing_min   real;
+       ALTER TABLE timings ADD COLUMN timing_mean  real;
+       ALTER TABLE timings ADD COLUMN timing_stdev real;
+       UPDATE timings SET num_samples = 1, timing_min = timing, timing_mean = timing, timing_stdev = 0.0;
+       CREATE TABLE samples (
+           id           integer primary key autoincrement not null,
+           timing_id    integer not null references timings(id) on delete cascade,
+           trial        integer,
+           timing       real,
+           wall_time    real,
+           user_time    real,
+           sys_time     real
+       );
+       CREATE INDEX samples_timing_id ON samples(timing_id);""",
+
+    # version 2 -> 3: outlier samples are kept, but left out of the timing's statistics
+    """ALTER TABLE samples ADD COLUMN outlier integer default 0;""",
+
+    # version 3 -> 4: one timing per (program, problem size), enforced by a unique index;
+    #                 every timing has at least one sample (needed to merge samples)
+    """DELETE FROM samples WHERE timing_id IN
+           (SELECT id FROM timings WHERE id NOT IN (SELECT MAX(id) FROM timings GROUP BY program_name, problem_size));
+       DELETE FROM timings WHERE id NOT IN (SELECT MAX(id) FROM timings GROUP BY program_name, problem_size);
+       CREATE UNIQUE INDEX timings_program_size ON timings(program_name, problem_size);
+       INSERT INTO samples (timing_id, trial, timing, wall_time, user_time, sys_time, outlier)
+           SELECT id, 1, timing, wall_time, user_time, sys_time, 0 FROM timings
+           WHERE id NOT IN (SELECT timing_id FROM samples);""",
+
+    # version 4 -> 5: outcome of each run (sample) and problem size (timing);
+    #                 failed problem sizes have a NULL timing
+    """ALTER TABLE timings ADD COLUMN status text default 'ok';
+       ALTER TABLE samples ADD COLUMN status text default 'ok';""",
+
+    # version 5 -> 6: fingerprint of the executable and arguments that generated a timing
+    #                 (NULL for manually entered timings, and timings from before this version)
+    """ALTER TABLE timings ADD COLUMN fingerprint text;""",
+
+    # version 6 -> 7: work queue of jobs claimed by worker processes
+    """CREATE TABLE queue_batches (
+           id           integer primary key autoincrement not null,
+           program_name text not null references programs(program_name) on delete cascade,
+           settings     text,
+           created      real
+       );
+       CREATE TABLE queue_jobs (
+           id            integer primary key autoincrement not null,
+           batch_id      integer not null references queue_batches(id) on delete cascade,
+           problem_size  integer not null,
+           trial         integer,
+           state         text default 'queued',
+           worker        text,
+           lease_expires real,
+           attempts      integer default 0,
+           result        text
+       );
+       CREATE INDEX queue_jobs_state ON queue_jobs(state, lease_expires);
+       CREATE INDEX queue_jobs_batch_size ON queue_jobs(batch_id, problem_size);""",
+
+    # version 7 -> 8: sweeps' plans and the state of their problem sizes (resumable sweeps)
+    """CREATE TABLE sweeps (
+           id           integer primary key autoincrement not null,
+           program_name text not null references programs(program_name) on delete cascade,
+           settings     text,
+           state        text default 'running',
+           started      real,
+           finished     real
+       );
+       CREATE TABLE sweep_sizes (
+           sweep_id     integer not null references sweeps(id) on delete cascade,
+           problem_size integer not null,
+           state        text default 'planned',
+           status       text,
+           started      real,
+           finished     real,
+           primary key (sweep_id, problem_size)
+       );""",
+
+    # version 8 -> 9: resource usage of each sample's run
+    """ALTER TABLE samples ADD COLUMN max_rss            integer;
+       ALTER TABLE samples ADD COLUMN minor_faults       integer;
+       ALTER TABLE samples ADD COLUMN major_faults       integer;
+       ALTER TABLE samples ADD COLUMN vol_ctx_switches   integer;
+       ALTER TABLE samples ADD COLUMN invol_ctx_switches integer;""",
+
+    # version 9 -> 10: Python functions as programs
+    """ALTER TABLE programs ADD COLUMN program_type text default 'executable';""",
+
+    # version 10 -> 11: timings written to a run's result channel
+    """ALTER TABLE samples ADD COLUMN iteration_times blob;""",
+]
+
+# NumPy record layout of a program's timings (see get_timings_array())
+#    problem_size - problem size
+#    timing       - the problem size's timing (median of its samples)
+#    timing_min   - smallest sample timing
+#    timing_mean  - mean sample timing
+#    timing_stdev - standard deviation of the sample timings
+#    num_samples  - # of samples (not counting outliers)
+timings_dtype = np.dtype([
+    ("problem_size", np.int64),
+    ("timing",       np.float64),
+    ("timing_min",   np.float64),
+    ("timing_mean",  np.float64),
+    ("timing_stdev", np.float64),
+    ("num_samples",  np.int64),
+])
+
+# columns of the samples table with the resource usage of a sample's run (see runner.rusage_fields)
+# (NULL for manually entered timings, and runs whose resource usage couldn't be measured)
+sample_metrics = ["max_rss", "minor_faults", "major_faults", "vol_ctx_switches", "invol_ctx_switches"]
+
+# ON CONFLICT clauses of add_timing()'s INSERT for each conflict policy
+timing_upserts = {
+    "skip"    : "ON CONFLICT (program_name, problem_size) DO NOTHING",
+    "replace" : """ON CONFLICT (program_name, problem_size) DO UPDATE SET
+                       timing = excluded.timing, wall_time = excluded.wall_time,
+                       user_time = excluded.user_time, sys_time = excluded.sys_time,
+                       num_samples = excluded.num_samples, timing_min = excluded.timing_min,
+                       timing_mean = excluded.timing_mean, timing_stdev = excluded.timing_stdev,
+                       status = excluded.status, fingerprint = excluded.fingerprint""",
+    # no-op update, so that RETURNING gives the existing timing's id
+    "merge"   : "ON CONFLICT (program_name, problem_size) DO UPDATE SET program_name = excluded.program_name",
+}
 
-        In:  db_filename     - database of all programs and their timings (string)
-             schema_filename - structure of the programs/timings tables in the database (string)
-        Out: nothing
-        
-        Side affect: intializes the global variable: conn
+# -----------------------------------------------------------------
+
+class Database :
+    """ The programs/timings database (database file created if needed)
+
+        Each thread using the database gets its own connection, since a sqlite3
+        connection can't be used by more than one thread at a time. The database
+        uses WAL journaling, so that readers (e.g. plotting) and a writer (e.g.
+        generating timings) don't block each other.
     """
 
-    # GLOBAL VARIABLE
-    global conn  # programs/timings database connection
-    
-    # does the database file not exist in the current working directory?
-    db_is_new = not os.path.exists(db_filename)
+    # settings of every connection
+    #    foreign_keys - needed to support cascade deletion in SQLite
+    #    synchronous  - NORMAL is safe with WAL journaling and avoids an fsync per commit
+    #    cache_size   - 64 MB page cache (negative #'s are KB)
+    #    mmap_size    - read the database through a 256 MB memory map
+    connection_pragmas = [
+        "PRAGMA foreign_keys = ON",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA cache_size = -65536",
+        "PRAGMA mmap_size = 268435456",
+    ]
+
+    # journal mode of the database file: "WAL", or "DELETE" (rollback journal) when worker
+    # processes on other hosts share the database through a network filesystem
+    # (WAL's shared memory index only works between processes on one host)
+    journal_mode = "WAL"
+
+    # seconds a connection waits for another connection's write to finish
+    # (instead of failing with "database is locked")
+    busy_timeout = 60.0
 
-    # setup connection to the database
-    # "connect" creates the database if it doesn't yet exist
-    with sql.connect(db_filename) as conn:
+    # # of prepared statements each connection keeps for reuse
+    # (the queries in this module are constant strings, so they are found in the cache)
+    cached_statements = 256
+
+    # -----------------------------------------------------------------
+
+    def __init__(self, db_filename, schema_filename) :
+        """ Opens the database (creating it and its tables if needed, upgrading it if old)
+
+            In:  db_filename     - database of all programs and their timings (string)
+                 schema_filename - structure of the programs/timings tables in the database (string)
+        """
+
+        self.db_filename = db_filename
+
+        self.thread_data      = threading.local()  # this thread's connection (and programs cache)
+        self.connections      = []                 # every thread's connection (for closing them)
+        self.connections_lock = threading.Lock()
+        self.pid              = os.getpid()
+
+        # does the database file not exist in the current working directory?
+        db_is_new = not os.path.exists(db_filename)
+
+        # "connect" creates the database if it doesn't yet exist
+        conn = self.connection()
 
         if db_is_new :  # create the tables if the database is newly created
             print('Created database, setting up tables')
@@ -99,27 +408,207 @@ def create_db_connection(db_filename, schema_filename) :
 
         else :  # database file already exists
             print('Database exists, assuming it contains proper table structures.')
- 
-        # needed to support cascade deletion in SQLite
-        conn.execute("PRAGMA foreign_keys = ON")
+            self.upgrade()
+
+        # the journal mode is remembered by the database file
+        conn.execute("PRAGMA journal_mode = {}".format(Database.journal_mode))
+
+    # end method: __init__
+
+    # -----------------------------------------------------------------
+
+    def connection(self) :
+        """ Gets the calling thread's connection to the database (connecting if needed)
+
+            In:  nothing
+            Out: conn - the calling thread's database connection
+        """
+
+        # a forked worker process can't use its parent's connections
+        if os.getpid() != self.pid :
+            self.thread_data = threading.local()
+            self.connections = []
+            self.connections_lock = threading.Lock()
+            self.pid = os.getpid()
+
+        conn = getattr(self.thread_data, "conn", None)
+
+        if conn is None :
+            # check_same_thread is off only so that close() can close every thread's connection
+            conn = sql.connect(self.db_filename, timeout=Database.busy_timeout, check_same_thread=False,
+                               cached_statements=Database.cached_statements)
+            for pragma in Database.connection_pragmas :
+                conn.execute(pragma)
+
+            self.thread_data.conn = conn
+            with self.connections_lock :
+                self.connections.append(conn)
+
+        return conn
+
+    # end method: connection
+
+    # -----------------------------------------------------------------
+
+    def upgrade(self) :
+        """ Upgrades the database's table structures to the latest version
+
+            In:  nothing
+            Out: nothing
+        """
+
+        conn = self.connection()
+
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+        for k in range(version, len(db_upgrades)) :
+            print('Upgrading database from version {} to {}'.format(k, k+1))
+            conn.executescript(db_upgrades[k])
+            conn.execute("PRAGMA user_version = {:d}".format(k+1))
+            conn.commit()
+
+    # end method: upgrade
+
+    # -----------------------------------------------------------------
+
+    def programs(self) :
+        """ Gets the programs table, from the calling thread's cache when it is up to date
+
+            In:  nothing
+            Out: programs - each program's [description, cmd_line_prefix], in the table's
+                            order (dictionary: program name -> [description, cmd_line_prefix,
+                            program_type]) (don't modify it)
+
+            The cache is reloaded when "PRAGMA data_version" shows that another connection
+            (another thread, process or application) has committed a change to the database
+            since it was loaded; this thread's own changes to the programs table call
+            invalidate_programs(). Checking the data version reads no tables.
+        """
+
+        conn = self.connection()
+
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+
+        programs = getattr(self.thread_data, "programs", None)
+        if programs is None or data_version != self.thread_data.programs_version :
+            cur = conn.execute("SELECT program_name, description, cmd_line_prefix, program_type FROM programs")
+            programs = {}
+            for [prog_name, prog_desc, cmd_line_prefix, program_type] in cur :
+                programs[prog_name] = [prog_desc, cmd_line_prefix, program_type]
+
+            self.thread_data.programs         = programs
+            self.thread_data.programs_version = data_version
+
+        return programs
+
+    # end method: programs
+
+    # -----------------------------------------------------------------
+
+    def invalidate_programs(self) :
+        """ Throws away the calling thread's programs cache (after it changes the programs table)
+
+            In:  nothing
+            Out: nothing
+        """
+
+        self.thread_data.programs = None
+
+    # end method: invalidate_programs
+
+    # -----------------------------------------------------------------
+
+    def close(self) :
+        """ Closes every thread's connection to the database
+
+            In:  nothing
+            Out: nothing
+        """
+
+        with self.connections_lock :
+            for conn in self.connections :
+                conn.close()
+            self.connections = []
+
+        self.thread_data = threading.local()
+
+    # end method: close
+
+    # -----------------------------------------------------------------
+
+    def close_connection(self) :
+        """ Closes the calling thread's connection to the database, if it has one (e.g. a thread
+            that is about to end, so that its connection (and its cache) isn't kept until close())
+
+            In:  nothing
+            Out: nothing
+        """
+
+        # (a forked worker process's inherited connections aren't its own)
+        conn = getattr(self.thread_data, "conn", None)
+        if conn is None or os.getpid() != self.pid :
+            return
+
+        with self.connections_lock :
+            if conn in self.connections :
+                self.connections.remove(conn)
+        conn.close()
+
+        self.thread_data.conn     = None
+        self.thread_data.programs = None
+
+    # end method: close_connection
+
+# end class: Database
+
+# -----------------------------------------------------------------
+
+def create_db_connection(db_filename, schema_filename) :
+    """ Creates the database connection (database file created if needed)
+
+        In:  db_filename     - database of all programs and their timings (string)
+             schema_filename - structure of the programs/timings tables in the database (string)
+        Out: nothing
         
+        Side affect: intializes the global variable: database
+    """
+
+    # GLOBAL VARIABLE
+    global database  # programs/timings database (a Database object)
+
+    database = Database(db_filename, schema_filename)
+
 # end create_db_connection()
 
 # -----------------------------------------------------------------
 
 def close_db() :
-    """ Closes the database connection
+    """ Closes the database connection(s)
     
         In:  nothing
         Out: nothing        
     """
 
-    conn.close()
+    database.close()
         
 # end close_db()
 
 # -----------------------------------------------------------------
 
+def close_thread_connection() :
+    """ Closes the calling thread's database connection (call it before a thread that used
+        the database ends; the thread connects again if it uses the database after that)
+
+        In:  nothing
+        Out: nothing
+    """
+
+    database.close_connection()
+
+# end function: close_thread_connection
+
+# -----------------------------------------------------------------
+
 def get_program_info(prog_name) :
     """ Get a program's info from the database
 
@@ -128,18 +617,7 @@ def get_program_info(prog_name) :
              cmd_line_prefix - command line prefix (string)
     """
 
-    cur = conn.cursor()
-
-    cur.execute("""SELECT description, cmd_line_prefix 
-                   FROM programs WHERE program_name = ?""", (prog_name,) )
-    prog_info = cur.fetchall()
-
-    prog_desc = ""
-    cmd_line_prefix = ""
-    
-    if len(prog_info) > 0 :
-        prog_desc  = prog_info[0][0]
-        cmd_line_prefix = prog_info[0][1]
+    [prog_desc, cmd_line_prefix, program_type] = database.programs().get(prog_name, ["", "", ""])
         
     return [prog_desc, cmd_line_prefix]
 
@@ -154,16 +632,7 @@ def get_cmd_line_prefix(prog_name) :
         Out: cmd_line_prefix - the program's command line prefix (string)
     """
     
-    cur = conn.cursor()
-
-    cur.execute("SELECT cmd_line_prefix FROM programs WHERE program_name = ?",
-                (prog_name,) )
-    data = cur.fetchall()
-
-    cmd_line_prefix = ""
-    
-    if len(data) > 0 :
-        cmd_line_prefix = data[0][0]
+    [prog_desc, cmd_line_prefix, program_type] = database.programs().get(prog_name, ["", "", ""])
     
     return cmd_line_prefix
 
@@ -171,6 +640,22 @@ def get_cmd_line_prefix(prog_name) :
 
 # -----------------------------------------------------------------
 
+def get_program_type(prog_name) :
+    """ Get a program's type from the database
+
+        In:  prog_name    - name of the program (string)
+        Out: program_type - the program's type (string, see runner.program_types)
+                            ("" if the program isn't in the database)
+    """
+
+    [prog_desc, cmd_line_prefix, program_type] = database.programs().get(prog_name, ["", "", ""])
+
+    return program_type
+
+# end function: get_program_type
+
+# -----------------------------------------------------------------
+
 def get_programs() :
     """ Get all the programs from the database
 
@@ -180,42 +665,43 @@ def get_programs() :
              cmd_line_prefixes - retrieved command line prefixes (list)
     """
 
-    cur = conn.cursor()
-    cur.execute("SELECT program_name, description, cmd_line_prefix FROM programs")
+    progs = [ [prog_name] + prog_info[0:2] for [prog_name, prog_info] in database.programs().items() ]
 
-    progs  = cur.fetchall()
+    # turn the rows into columns
+    if len(progs) == 0 :
+        return [[], [], []]
+
+    [prog_names, descriptions, cmd_line_prefixes] = [list(column) for column in zip(*progs)]
 
-    prog_names        = []
-    descriptions      = []
-    cmd_line_prefixes = []
-    
-    for prog_info in progs :
-        prog_names.append(prog_info[0])
-        descriptions.append(prog_info[1])
-        cmd_line_prefixes.append(prog_info[2])
-        
     return [prog_names, descriptions, cmd_line_prefixes]
 
 # end function: get_programs
 
 # -----------------------------------------------------------------
 
-def add_program(prog_name, prog_desc, cmd_line_prefix) :
+def add_program(prog_name, prog_desc, cmd_line_prefix, program_type="executable") :
     """ Add a new program to the database
 
         In:  prog_name       - program name (string)
              prog_desc       - program description (string)
              cmd_line_prefix - command line prefix (string)
+                               (a Python program's "module:function", see runner.run_python_program(),
+                               a shared library program's "library:function(argument types)", see
+                               runner.run_library_program())
+             program_type    - type of the program (string, see runner.program_types)
         Out: nothing
     """
 
+    conn = database.connection()
     cur = conn.cursor()
 
-    cur.execute("INSERT INTO programs (program_name, description, cmd_line_prefix) VALUES (?, ?, ?)",
-                (prog_name, prog_desc, cmd_line_prefix) )
+    cur.execute("INSERT INTO programs (program_name, description, cmd_line_prefix, program_type) VALUES (?, ?, ?, ?)",
+                (prog_name, prog_desc, cmd_line_prefix, program_type) )
 
     conn.commit()
 
+    database.invalidate_programs()
+
 # end function: add_program
 
 # -----------------------------------------------------------------
@@ -227,6 +713,7 @@ def delete_program(prog_name) :
         Out: nothing
     """
 
+    conn = database.connection()
     cur = conn.cursor()
 
     # assumes database is properly set up for cascade deletion
@@ -236,58 +723,754 @@ def delete_program(prog_name) :
 
     conn.commit()
 
+    database.invalidate_programs()
+
 # end function: delete_program
 
 # -----------------------------------------------------------------
 
+def get_timings_array(prog_name) :
+    """ Get a program's timings (and their statistics) from the database as a NumPy array
+
+        In:  prog_name     - name of the program getting timings for (string)
+        Out: timings_array - the program's timings in problem size order
+                             (NumPy structured array, see timings_dtype)
+                             (failed problem sizes, which have no timing, are left out)
+
+        Each field (e.g. timings_array["problem_size"]) is a column that can be used
+        without copying it. The array is filled straight from the cursor's rows,
+        without building Python lists first.
+    """
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    cur.execute("""SELECT problem_size, timing, timing_min, timing_mean, timing_stdev, num_samples
+                   FROM timings WHERE program_name = ? AND status = 'ok' ORDER BY problem_size ASC""",
+                (prog_name,) )
+
+    # (no count from a separate COUNT(*) query: another connection can commit timings
+    # between the two queries, so the array grows as the rows are read instead)
+    timings_array = np.fromiter(cur, dtype=timings_dtype)
+
+    return timings_array
+
+# end function: get_timings_array
+
+# -----------------------------------------------------------------
+
+def get_timings_many(prog_names) :
+    """ Get several programs' timings from the database with one query
+
+        In:  prog_names     - names of the programs getting timings for (list of strings)
+        Out: timings_arrays - each program's timings in problem size order
+                              (list of NumPy structured arrays (see timings_dtype),
+                               in the same order as prog_names; no failed problem sizes)
+
+        The rows of all the programs are read into one array, in program order,
+        which is then split up into each program's part (no copies)
+    """
+
+    if len(prog_names) == 0 :
+        return []
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    # each program's position in prog_names is joined onto its rows, so the rows
+    # come back grouped by program (each program's rows found with the index)
+    wanted_values = ", ".join(["(?, ?)"] * len(prog_names))
+    wanted_params = []
+    for k in range(0, len(prog_names)) :
+        wanted_params += [k, prog_names[k]]
+
+    cur.execute("""WITH wanted (prog_index, program_name) AS (VALUES """ + wanted_values + """)
+                   SELECT wanted.prog_index, problem_size, timing, timing_min, timing_mean, timing_stdev, num_samples
+                   FROM wanted JOIN timings ON timings.program_name = wanted.program_name
+                   WHERE timings.status = 'ok'
+                   ORDER BY wanted.prog_index, problem_size""",
+                wanted_params)
+
+    many_dtype = np.dtype([("prog_index", np.int64)] + timings_dtype.descr)
+    many_array = np.fromiter(cur, dtype=many_dtype)
+
+    # where each program's rows start and end in the array (one pass over the sorted program positions)
+    bounds = np.searchsorted(many_array["prog_index"], np.arange(0, len(prog_names) + 1))
+
+    timings_fields = list(timings_dtype.names)
+    timings_arrays = []
+    for k in range(0, len(prog_names)) :
+        timings_arrays.append(many_array[bounds[k]:bounds[k+1]][timings_fields])
+
+    return timings_arrays
+
+# end function: get_timings_many
+
+# -----------------------------------------------------------------
+
+def get_sample_metric_many(prog_names, metric) :
+    """ Get several programs' resource usage (one of the samples' metrics) for each problem size
+
+        In:  prog_names    - names of the programs getting the resource usage of (list of strings)
+             metric        - the resource usage (string, one of sample_metrics, e.g. "max_rss")
+        Out: metric_arrays - each program's problem sizes and the median of their samples' metric
+                             (list of [problem sizes, medians] NumPy arrays, in the same order as
+                              prog_names; no failed problem sizes or outlier samples)
+
+        Problem sizes whose samples don't have the metric (e.g. manually entered timings)
+        are left out
+    """
+
+    if metric not in sample_metrics :
+        raise ValueError("unknown resource usage: {}".format(metric))
+
+    if len(prog_names) == 0 :
+        return []
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    # (same program ordering as get_timings_many())
+    wanted_values = ", ".join(["(?, ?)"] * len(prog_names))
+    wanted_params = []
+    for k in range(0, len(prog_names)) :
+        wanted_params += [k, prog_names[k]]
+
+    cur.execute("""WITH wanted (prog_index, program_name) AS (VALUES """ + wanted_values + """)
+                   SELECT wanted.prog_index, timings.problem_size, samples.""" + metric + """
+                   FROM wanted JOIN timings ON timings.program_name = wanted.program_name
+                               JOIN samples ON samples.timing_id = timings.id
+                   WHERE timings.status = 'ok' AND samples.outlier = 0 AND samples.""" + metric + """ IS NOT NULL
+                   ORDER BY wanted.prog_index, timings.problem_size""",
+                wanted_params)
+
+    rows_dtype = np.dtype([("prog_index", np.int64), ("problem_size", np.int64), ("value", np.float64)])
+    rows_array = np.fromiter(cur, dtype=rows_dtype)
+
+    bounds = np.searchsorted(rows_array["prog_index"], np.arange(0, len(prog_names) + 1))
+
+    metric_arrays = []
+    for k in range(0, len(prog_names)) :
+        prog_rows = rows_array[bounds[k]:bounds[k+1]]
+
+        # each problem size's samples are one run of the (sorted) problem sizes
+        [prob_sizes, size_starts] = np.unique(prog_rows["problem_size"], return_index=True)
+        medians = np.zeros(len(prob_sizes))
+        if len(prob_sizes) > 0 :
+            medians[:] = [np.median(values) for values in np.split(prog_rows["value"], size_starts[1:])]
+
+        metric_arrays.append([prob_sizes, medians])
+
+    return metric_arrays
+
+# end function: get_sample_metric_many
+
+# -----------------------------------------------------------------
+
+def get_iteration_times(prog_name, prob_size) :
+    """ Get the timings a program's runs of a problem size wrote to their result channels
+
+        In:  prog_name       - name of the program (string)
+             prob_size       - problem size (integer)
+        Out: iteration_times - each sample's timings (list of [trial #, NumPy float64 array],
+                               in trial # order; samples without timings are left out)
+    """
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    cur.execute("""SELECT samples.trial, samples.iteration_times
+                   FROM timings JOIN samples ON samples.timing_id = timings.id
+                   WHERE timings.program_name = ? AND timings.problem_size = ? AND samples.iteration_times IS NOT NULL
+                   ORDER BY samples.trial""",
+                (prog_name, prob_size) )
+
+    iteration_times = [ [trial, np.frombuffer(blob, dtype=np.float64)] for [trial, blob] in cur.fetchall() ]
+
+    return iteration_times
+
+# end function: get_iteration_times
+
+# -----------------------------------------------------------------
+
 def get_timings(prog_name) :
     """ Get a program's timings from the database
 
         In:  prog_name    - name of the program getting timings for (string)
-        Out: prob_sizes   - all problem sizes for the program (list)
-             timings      - all timings for the program (list)
+        Out: prob_sizes   - all problem sizes for the program (NumPy int64 array)
+             timings      - all timings for the program (NumPy float64 array)
     """
-    
+
+    timings_array = get_timings_array(prog_name)
+
+    return [timings_array["problem_size"], timings_array["timing"]]
+
+# end function: get_timings
+
+# -----------------------------------------------------------------
+
+def iter_timings(prog_name=None, min_prob_size=None, max_prob_size=None, chunk_size=1000) :
+    """ Stream timings from the database, a chunk of rows at a time (bounded memory)
+
+        In:  prog_name     - only this program's timings (string)
+                             (None for all programs' timings)
+             min_prob_size - only problem sizes >= this (integer, None for no minimum)
+             max_prob_size - only problem sizes <= this (integer, None for no maximum)
+             chunk_size    - # of rows read from the database at a time (integer)
+        Out: yields each timing's row, in (program name, problem size) order:
+                [prog_name, prob_size, timing, timing_min, timing_mean, timing_stdev, num_samples, status]
+             (a failed problem size's timing and statistics are None; status is e.g. "timeout")
+
+        Uses keyset pagination: each chunk is its own query that continues after the
+        last (program name, problem size) of the previous chunk, using the
+        (program_name, problem_size) index. No query stays open between chunks, so
+        the caller can take as long as it wants with each chunk.
+    """
+
+    conn = database.connection()
+
+    conditions = []
+    filter_values = []
+    if prog_name is not None :
+        conditions.append("program_name = ?")
+        filter_values.append(prog_name)
+    if min_prob_size is not None :
+        conditions.append("problem_size >= ?")
+        filter_values.append(min_prob_size)
+    if max_prob_size is not None :
+        conditions.append("problem_size <= ?")
+        filter_values.append(max_prob_size)
+
+    select = """SELECT program_name, problem_size, timing, timing_min, timing_mean, timing_stdev, num_samples, status
+                FROM timings WHERE """
+
+    first_query = select + " AND ".join(conditions + ["1"]) + \
+                  " ORDER BY program_name, problem_size LIMIT ?"
+    next_query  = select + " AND ".join(conditions + ["(program_name, problem_size) > (?, ?)"]) + \
+                  " ORDER BY program_name, problem_size LIMIT ?"
+
     cur = conn.cursor()
+    cur.execute(first_query, filter_values + [chunk_size])
 
-    cur.execute("SELECT problem_size, timing FROM timings WHERE program_name = ? ORDER BY problem_size ASC",
-                (prog_name,) )
-    timings_info = cur.fetchall()
-    
-    prob_sizes = []
-    timings    = []
+    while 1 :
+        rows = cur.fetchmany(chunk_size)
+        if len(rows) == 0 :
+            return
 
-    # build up separate problem sizes and timings lists
-    for [prob_size,timing] in timings_info :
-        prob_sizes.append(prob_size)
-        timings.append(timing)
+        for row in rows :
+            yield list(row)
 
-    return [prob_sizes, timings]
+        if len(rows) < chunk_size :
+            return
 
-# end function: get_timings
+        # the next chunk starts after the last row of this chunk
+        [last_prog_name, last_prob_size] = rows[-1][0:2]
+        cur.execute(next_query, filter_values + [last_prog_name, last_prob_size, chunk_size])
+
+# end function: iter_timings
 
 # -----------------------------------------------------------------
 
-def add_timing(prog_name, prob_size, timing) :
-    """ Add a program's timing for a problem size to the database
+def has_timing(prog_name, prob_size) :
+    """ Does a program already have a timing for a problem size in the database?
 
-        In:  prog_name - name of the program getting timings for (string)
+        In:  prog_name - name of the program (string)
              prob_size - problem size (integer)
-             timing    - timing (float)
-        Out: nothing
+        Out: True/False - is the problem size's timing in the database? (boolean)
+    """
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    # a lookup in the (program_name, problem_size) unique index
+    cur.execute("SELECT 1 FROM timings WHERE program_name = ? AND problem_size = ?",
+                (prog_name, prob_size) )
+
+    return cur.fetchone() is not None
+
+# end function: has_timing
+
+# -----------------------------------------------------------------
+
+def get_timing_fingerprints(prog_name, prob_sizes) :
+    """ Get the fingerprints (and statuses) of a program's stored timings for some problem sizes
+
+        In:  prog_name    - name of the program (string)
+             prob_sizes   - problem sizes (list of integers)
+        Out: fingerprints - fingerprint and status of each problem size that has a timing
+                            (dictionary: problem size -> [fingerprint (string, None if unknown),
+                             status (string, e.g. "ok" or "timeout")])
+    """
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    # the problem sizes are passed as one JSON array parameter (any # of them)
+    cur.execute("""SELECT problem_size, fingerprint, status FROM timings
+                   WHERE program_name = ? AND problem_size IN (SELECT value FROM json_each(?))""",
+                (prog_name, json.dumps([int(prob_size) for prob_size in prob_sizes])) )
+
+    return {row[0] : [row[1], row[2]] for row in cur.fetchall()}
+
+# end function: get_timing_fingerprints
+
+# -----------------------------------------------------------------
+
+def get_conflict_policy(cur, prog_name, prob_size, fingerprint, on_conflict) :
+    """ Get the conflict policy to use for a new timing
+
+        In:  cur         - cursor of the connection doing the insert
+             prog_name   - name of the program (string)
+             prob_size   - problem size (integer)
+             fingerprint - the new timing's fingerprint (string, None for a manually entered timing)
+             on_conflict - the requested conflict policy (string, see insert_timing())
+        Out: on_conflict - "replace" if the stored timing is stale (its fingerprint differs
+                           from the new one's) or failed (e.g. "timeout"), otherwise the
+                           requested policy (string)
+    """
+
+    if on_conflict == "replace" :
+        return on_conflict
+
+    cur.execute("SELECT fingerprint, status FROM timings WHERE program_name = ? AND problem_size = ?",
+                (prog_name, prob_size) )
+    row = cur.fetchone()
+    if row is None :
+        return on_conflict
+
+    # a failed timing isn't a timing to keep (or to merge samples into)
+    [stored_fingerprint, status] = row
+    if status != "ok" or (fingerprint is not None and stored_fingerprint != fingerprint) :
+        return "replace"
+
+    return on_conflict
+
+# end function: get_conflict_policy
+
+# -----------------------------------------------------------------
+
+def insert_timing(cur, prog_name, prob_size, timing, samples, on_conflict) :
+    """ Insert a program's timing for a problem size into the database (without committing)
+
+        In:  cur         - cursor of the connection doing the insert
+             prog_name   - name of the program getting timings for (string)
+             prob_size   - problem size (integer)
+             timing      - timing (float, None for a failed problem size)
+             samples     - info about each measured run that generated the timing (list of dictionaries)
+                           (None for a manually entered timing)
+             on_conflict - what to do when the program already has a timing for the problem size (string):
+                              "skip"    - keep the existing timing
+                              "replace" - replace the existing timing (and its samples)
+                              "merge"   - add the samples to the existing timing's samples
+        Out: stored      - was the timing stored? (boolean)
+                           (False if skipped because the problem size already has a timing)
+
+        A stored timing with a different fingerprint (stale), or that failed, is always replaced
     """ 
 
-    cur = conn.cursor()  
+    samples = get_timing_samples(timing, samples)
+
+    [num_samples, timing_min, timing_median, timing_mean, timing_stdev,
+     wall_time, user_time, sys_time] = timing_stats.summarize_samples(samples)
+    status = timing_stats.get_samples_status(samples)
+    fingerprint = get_samples_fingerprint(samples)
+
+    on_conflict = get_conflict_policy(cur, prog_name, prob_size, fingerprint, on_conflict)
+
+    # the (program_name, problem_size) unique index makes a duplicate timing a conflict;
+    # "RETURNING id" gives no row when the conflict is skipped
+    cur.execute("""INSERT INTO timings (problem_size, timing, program_name, wall_time, user_time, sys_time,
+                                        num_samples, timing_min, timing_mean, timing_stdev, status, fingerprint)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) """ + timing_upserts[on_conflict] + " RETURNING id",
+                (prob_size, timing, prog_name, wall_time, user_time, sys_time,
+                 num_samples, timing_min, timing_mean, timing_stdev, status, fingerprint) )
+    rows = cur.fetchall()
+
+    if len(rows) == 0 :
+        return False
+
+    timing_id = rows[0][0]
+
+    if on_conflict == "replace" :
+        cur.execute("DELETE FROM samples WHERE timing_id = ?", (timing_id,) )
+
+    # merged samples' trial #'s follow the existing samples' trial #'s
+    trial_offset = 0
+    if on_conflict == "merge" :
+        cur.execute("SELECT COALESCE(MAX(trial), 0) FROM samples WHERE timing_id = ?", (timing_id,) )
+        trial_offset = cur.fetchone()[0]
+
+    cur.executemany("""INSERT INTO samples (timing_id, trial, timing, wall_time, user_time, sys_time, outlier, status, """
+                       + ", ".join(sample_metrics) + """, iteration_times)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?""" + ", ?" * len(sample_metrics) + ", ?)",
+                    [ (timing_id, sample["trial"] + trial_offset, sample["timing"], sample["wall_time"],
+                       sample["user_time"], sample["sys_time"], int(sample["outlier"]), sample.get("status", "ok"))
+                      + tuple([sample.get(name) for name in sample_metrics])
+                      + (get_iteration_times_blob(sample),)
+                      for sample in samples ] )
+
+    # a merged timing's statistics (and status) are recalculated from all of its samples
+    if on_conflict == "merge" :
+        cur.execute("SELECT timing, wall_time, user_time, sys_time, status FROM samples WHERE timing_id = ? AND outlier = 0",
+                    (timing_id,) )
+        all_samples = [ {"timing" : row[0], "wall_time" : row[1], "user_time" : row[2], "sys_time" : row[3],
+                         "outlier" : False, "status" : row[4]} for row in cur.fetchall() ]
+
+        [num_samples, timing_min, timing_median, timing_mean, timing_stdev,
+         wall_time, user_time, sys_time] = timing_stats.summarize_samples(all_samples)
+        status = timing_stats.get_samples_status(all_samples)
+
+        # a problem size with a failed run has no timing
+        if status != "ok" :
+            timing_median = None
+
+        cur.execute("""UPDATE timings SET timing = ?, wall_time = ?, user_time = ?, sys_time = ?,
+                                          num_samples = ?, timing_min = ?, timing_mean = ?, timing_stdev = ?,
+                                          status = ?
+                       WHERE id = ?""",
+                    (timing_median, wall_time, user_time, sys_time,
+                     num_samples, timing_min, timing_mean, timing_stdev, status, timing_id) )
+
+    return True
+
+# end function: insert_timing
+
+# -----------------------------------------------------------------
 
-    cur.execute("INSERT INTO timings (problem_size, timing, program_name) VALUES (?, ?, ?)",
-                (prob_size, timing, prog_name) )
+def get_timing_samples(timing, samples) :
+    """ Get the samples to store for a timing
 
-    conn.commit()
+        In:  timing  - timing (float)
+             samples - info about each measured run that generated the timing (list of dictionaries)
+                       (None for a manually entered timing)
+        Out: samples - the samples to store (list of dictionaries)
+                       (a manually entered timing is its own (only) sample)
+    """
+
+    if samples is None :
+        samples = [ {"trial" : 1, "timing" : timing, "wall_time" : None, "user_time" : None,
+                     "sys_time" : None, "outlier" : False} ]
+
+    return samples
+
+# end function: get_timing_samples
+
+# -----------------------------------------------------------------
+
+def get_iteration_times_blob(sample) :
+    """ Get a sample's iteration times as stored in the samples table
+
+        In:  sample - info about a measured run (dictionary, see runner.run_program())
+        Out: blob   - the iteration times' float64 bytes (bytes, None if the run has none)
+                      (its "iteration_times" can be a NumPy array, or a list from the work queue)
+    """
+
+    iteration_times = sample.get("iteration_times")
+    if iteration_times is None :
+        return None
+
+    return np.asarray(iteration_times, dtype=np.float64).tobytes()
+
+# end function: get_iteration_times_blob
+
+# -----------------------------------------------------------------
+
+def get_samples_fingerprint(samples) :
+    """ Get the fingerprint of the program that generated a timing's samples
+
+        In:  samples     - info about each measured run (list of dictionaries, see get_timing_samples())
+        Out: fingerprint - the program's fingerprint (string, see runner.get_fingerprint())
+                           (None for a manually entered timing)
+
+        Samples without a fingerprint (e.g. a queued job whose worker was lost) are skipped
+    """
+
+    for sample in samples :
+        if sample.get("fingerprint") is not None :
+            return sample["fingerprint"]
+
+    return None
+
+# end function: get_samples_fingerprint
+
+# -----------------------------------------------------------------
+
+def add_timing(prog_name, prob_size, timing, samples=None, on_conflict="skip") :
+    """ Add a program's timing for a problem size to the database
+
+        In:  prog_name   - name of the program getting timings for (string)
+             prob_size   - problem size (integer)
+             timing      - timing (float)
+             samples     - info about each measured run that generated the timing (list of dictionaries)
+                           (None for a manually entered timing)
+             on_conflict - what to do when the program already has a timing for the problem size (string):
+                              "skip"    - keep the existing timing
+                              "replace" - replace the existing timing (and its samples)
+                              "merge"   - add the samples to the existing timing's samples
+        Out: stored      - was the timing stored? (boolean)
+                           (False if skipped because the problem size already has a timing)
+    """ 
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    try :
+        stored = insert_timing(cur, prog_name, prob_size, timing, samples, on_conflict)
+        conn.commit()
+
+    except BaseException :
+        conn.rollback()
+        raise
+
+    return stored
 
 # end function: add_timing
 
 # -----------------------------------------------------------------
 
+def add_timings(timing_entries, sweep_id=None) :
+    """ Add many timings to the database in one transaction (one commit)
+
+        In:  timing_entries - timings to add (list of lists):
+                                 [prog_name, prob_size, timing, samples, on_conflict]
+                              (same meanings as add_timing()'s arguments)
+             sweep_id       - id of the sweep the timings belong to (integer, None for none);
+                              their problem sizes are marked done in the same transaction
+        Out: nothing
+    """
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    # (a failure partway through mustn't leave its rows in the connection's open transaction,
+    # where the next commit would store them)
+    try :
+        # a (program, problem size) only gets one timing per batch: the first one
+        # when skipping conflicts, otherwise the last one
+        # (stale and failed stored timings are replaced, see get_conflict_policy())
+        skip_entries    = {}
+        replace_entries = {}
+        merge_entries   = []
+        for entry in timing_entries :
+            [prog_name, prob_size, timing, samples, on_conflict] = entry
+            key = (prog_name, prob_size)
+            fingerprint = get_samples_fingerprint(samples) if samples is not None else None
+            on_conflict = get_conflict_policy(cur, prog_name, prob_size, fingerprint, on_conflict)
+            entry = [prog_name, prob_size, timing, samples, on_conflict]
+            if on_conflict == "skip" :
+                if key not in skip_entries :
+                    skip_entries[key] = entry
+            elif on_conflict == "replace" :
+                replace_entries[key] = entry
+            else :
+                merge_entries.append(entry)
+
+        # timings that are newly inserted by this transaction have ids above this
+        cur.execute("SELECT COALESCE(MAX(id), 0) FROM timings")
+        max_timing_id = cur.fetchone()[0]
+
+        for [entries, on_conflict, min_timing_id] in [ [replace_entries, "replace", 0],
+                                                       [skip_entries,    "skip",    max_timing_id] ] :
+            if len(entries) == 0 :
+                continue
+
+            timing_rows = []
+            sample_rows = []
+            for [prog_name, prob_size, timing, samples, conflict] in entries.values() :
+                samples = get_timing_samples(timing, samples)
+                [num_samples, timing_min, timing_median, timing_mean, timing_stdev,
+                 wall_time, user_time, sys_time] = timing_stats.summarize_samples(samples)
+                status = timing_stats.get_samples_status(samples)
+                timing_rows.append( (prob_size, timing, prog_name, wall_time, user_time, sys_time,
+                                     num_samples, timing_min, timing_mean, timing_stdev, status,
+                                     get_samples_fingerprint(samples)) )
+                for sample in samples :
+                    sample_rows.append( (sample["trial"], sample["timing"], sample["wall_time"], sample["user_time"],
+                                         sample["sys_time"], int(sample["outlier"]), sample.get("status", "ok"))
+                                        + tuple([sample.get(name) for name in sample_metrics])
+                                        + (get_iteration_times_blob(sample), prog_name, prob_size, min_timing_id) )
+
+            cur.executemany("""INSERT INTO timings (problem_size, timing, program_name, wall_time, user_time, sys_time,
+                                                    num_samples, timing_min, timing_mean, timing_stdev, status, fingerprint)
+                               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) """ + timing_upserts[on_conflict],
+                            timing_rows)
+
+            # replaced timings keep their ids, but lose their old samples
+            if on_conflict == "replace" :
+                cur.executemany("""DELETE FROM samples WHERE timing_id =
+                                       (SELECT id FROM timings WHERE program_name = ? AND problem_size = ?)""",
+                                list(entries.keys()) )
+
+            # skipped timings (ids not above max_timing_id) don't get the new samples
+            cur.executemany("""INSERT INTO samples (timing_id, trial, timing, wall_time, user_time, sys_time, outlier, status, """
+                               + ", ".join(sample_metrics) + """, iteration_times)
+                               SELECT id, ?, ?, ?, ?, ?, ?, ?""" + ", ?" * len(sample_metrics) + """, ? FROM timings
+                               WHERE program_name = ? AND problem_size = ? AND id > ?""",
+                            sample_rows)
+
+        # merged timings need their statistics recalculated one at a time
+        for [prog_name, prob_size, timing, samples, on_conflict] in merge_entries :
+            insert_timing(cur, prog_name, prob_size, timing, samples, on_conflict)
+
+        # a sweep's problem size is only done once its timing is stored (so resuming
+        # the sweep after a crash reruns exactly the problem sizes that weren't stored)
+        if sweep_id is not None :
+            finished = time.time()
+            cur.executemany("""UPDATE sweep_sizes SET state = 'done', status = ?, finished = ?
+                               WHERE sweep_id = ? AND problem_size = ?""",
+                            [ (timing_stats.get_samples_status(get_timing_samples(timing, samples)), finished, sweep_id, prob_size)
+                              for [prog_name, prob_size, timing, samples, on_conflict] in timing_entries ] )
+
+        conn.commit()
+
+    except BaseException :
+        conn.rollback()
+        raise
+
+# end function: add_timings
+
+# -----------------------------------------------------------------
+
+class TimingWriter :
+    """ Adds timings to the database from its own thread, in batches
+
+        Timings put() on the writer's queue are added with add_timings(), so a
+        whole batch costs one commit. A batch is written when it has batch_size
+        timings, or when its oldest timing has waited flush_interval seconds.
+        close() (also called when leaving a "with" block, e.g. because of Ctrl-C)
+        writes whatever is still queued.
+
+        A batch that couldn't be written (e.g. "database is locked") isn't thrown
+        away: close() tries to write it again, and keeps it in "unwritten" if that
+        fails too.
+    """
+
+    def __init__(self, batch_size=500, flush_interval=1.0, sweep_id=None) :
+        """ Starts the writer's thread
+
+            In:  batch_size     - most timings written in one transaction (integer)
+                 flush_interval - most seconds a timing waits to be written (float)
+                 sweep_id       - id of the sweep the timings belong to (integer, None for none)
+        """
+
+        self.batch_size     = batch_size
+        self.flush_interval = flush_interval
+        self.sweep_id       = sweep_id
+
+        self.queue = queue.Queue()
+        self.error = None  # exception raised while writing (re-raised by put()/close())
+        self.unwritten = []  # timings of the batches that couldn't be written (put() arguments)
+
+        self.thread = threading.Thread(target=self.write_loop, name="TimingWriter", daemon=True)
+        self.thread.start()
+
+    # end method: __init__
+
+    # -----------------------------------------------------------------
+
+    def put(self, prog_name, prob_size, timing, samples=None, on_conflict="skip") :
+        """ Queues a program's timing to be added to the database
+
+            In:  (same as add_timing()'s arguments)
+            Out: nothing
+        """
+
+        if self.error is not None :
+            raise self.error
+
+        self.queue.put( [prog_name, prob_size, timing, samples, on_conflict] )
+
+    # end method: put
+
+    # -----------------------------------------------------------------
+
+    def write_loop(self) :
+        """ The writer thread: collects queued timings into batches and writes them
+
+            In:  nothing
+            Out: nothing
+        """
+
+        batch    = []
+        deadline = None   # when the current batch has to be written
+        closing  = False
+
+        while not closing :
+            if deadline is None :
+                timeout = None
+            else :
+                timeout = max(0.0, deadline - time.monotonic())
+
+            try :
+                entry = self.queue.get(timeout=timeout)
+                if entry is None :   # close() was called
+                    closing = True
+                else :
+                    batch.append(entry)
+                    if deadline is None :
+                        deadline = time.monotonic() + self.flush_interval
+            except queue.Empty :
+                pass
+
+            if len(batch) > 0 and (closing or len(batch) >= self.batch_size or time.monotonic() >= deadline) :
+                try :
+                    add_timings(batch, self.sweep_id)
+                except Exception as ex :
+                    self.error = ex
+                    self.unwritten += batch
+                batch    = []
+                deadline = None
+
+        # (a writer per generate call: its connection isn't kept until the database is closed)
+        close_thread_connection()
+
+    # end method: write_loop
+
+    # -----------------------------------------------------------------
+
+    def close(self) :
+        """ Writes the queued timings and stops the writer's thread
+
+            In:  nothing
+            Out: nothing
+
+            The batches that couldn't be written are tried again (in one transaction);
+            if that fails as well, they are left in "unwritten" and the error is raised
+        """
+
+        self.queue.put(None)
+
+        # finish writing even if Ctrl-C is pressed while waiting
+        try :
+            self.thread.join()
+        except KeyboardInterrupt :
+            self.thread.join()
+            raise
+
+        if len(self.unwritten) > 0 :
+            try :
+                add_timings(self.unwritten, self.sweep_id)
+                self.unwritten = []
+            except Exception as ex :
+                self.error = ex
+
+        if self.error is not None and len(self.unwritten) > 0 :
+            raise self.error
+
+    # end method: close
+
+    # -----------------------------------------------------------------
+
+    def __enter__(self) :
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) :
+        self.close()
+
+# end class: TimingWriter
+
+# -----------------------------------------------------------------
+
 def delete_program_timings(prog_name) :
     """ Delete all of a program's timings
 
@@ -295,6 +1478,7 @@ def delete_program_timings(prog_name) :
         Out: nothing
     """ 
 
+    conn = database.connection()
     cur = conn.cursor()
 
     cur.execute("DELETE FROM timings WHERE program_name = ?",
@@ -306,3 +1490,402 @@ def delete_program_timings(prog_name) :
 
 # -----------------------------------------------------------------
 
+
+# Work queue
+#
+#    A sweep is queued as a batch of jobs (queue_batches, queue_jobs tables): a job is one
+#    trial of a problem size, or all of a problem size's trials. Worker processes claim
+#    jobs with a lease (claim_job()), renew the lease while the job runs (renew_lease()),
+#    and hand back the job's result (finish_job()). A job whose lease runs out (e.g. its
+#    worker was killed) is requeued; after max_attempts leases it is given up on ("lost").
+#    When every job of a problem size is done, its results are combined into the
+#    problem size's timing (collect_prob_size()).
+#
+#    Every change is one IMMEDIATE transaction (the write lock is taken at its start),
+#    so concurrent workers can't claim the same job or store a timing twice. Leases use
+#    time.time(), so the workers' hosts need synchronized clocks (e.g. NTP).
+
+# result of a job that was given up on (its trial # is set when combined)
+lost_job_result = [None, [ {"trial" : 1, "timing" : None, "wall_time" : None, "user_time" : None,
+                            "sys_time" : None, "outlier" : False, "status" : "lost"} ]]
+
+# -----------------------------------------------------------------
+
+def enqueue_jobs(prog_name, prob_sizes, trials, run_settings) :
+    """ Queue a program's problem sizes as jobs for worker processes
+
+        In:  prog_name    - name of the program (string)
+             prob_sizes   - problem sizes (list of integers)
+             trials       - trial # of each problem size's jobs (list of integers)
+                            ([None]: one job runs all of a problem size's trials)
+             run_settings - application settings the jobs are run with (dictionary)
+        Out: batch_id     - id of the queued batch of jobs (integer)
+    """
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    cur.execute("INSERT INTO queue_batches (program_name, settings, created) VALUES (?, ?, ?) RETURNING id",
+                (prog_name, json.dumps(run_settings), time.time()) )
+    batch_id = cur.fetchone()[0]
+
+    cur.executemany("INSERT INTO queue_jobs (batch_id, problem_size, trial) VALUES (?, ?, ?)",
+                    [ (batch_id, prob_size, trial) for prob_size in prob_sizes for trial in trials ] )
+
+    conn.commit()
+
+    return batch_id
+
+# end function: enqueue_jobs
+
+# -----------------------------------------------------------------
+
+def claim_job(worker_id, lease_time, max_attempts) :
+    """ Claim the next queued job (requeueing jobs whose lease ran out)
+
+        In:  worker_id    - name of the claiming worker (string)
+             lease_time   - seconds the lease lasts unless renewed (float)
+             max_attempts - most leases of a job; an expired job that had them is lost (integer)
+        Out: job          - the claimed job (dictionary, None if no job is queued):
+                               "id", "batch_id", "program_name", "problem_size",
+                               "trial" (None for all trials), "attempts",
+                               "settings" (application settings to run with, dictionary)
+             num_requeued - # of expired jobs requeued (integer)
+             collected    - problem sizes finished by lost jobs (list of [prog_name, prob_size, timing, status])
+    """
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    now = time.time()
+
+    cur.execute("BEGIN IMMEDIATE")
+    try :
+        cur.execute("""UPDATE queue_jobs SET state = 'queued', worker = NULL, lease_expires = NULL
+                       WHERE state = 'leased' AND lease_expires < ? AND attempts < ?""",
+                    (now, max_attempts) )
+        num_requeued = cur.rowcount
+
+        cur.execute("""UPDATE queue_jobs SET state = 'done', worker = NULL, lease_expires = NULL, result = ?
+                       WHERE state = 'leased' AND lease_expires < ?
+                       RETURNING batch_id, problem_size""",
+                    (json.dumps(lost_job_result), now) )
+        collected = []
+        for [batch_id, prob_size] in set(cur.fetchall()) :
+            collected.append(collect_prob_size(cur, batch_id, prob_size))
+
+        cur.execute("""UPDATE queue_jobs SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1
+                       WHERE id = (SELECT id FROM queue_jobs WHERE state = 'queued' ORDER BY id LIMIT 1)
+                       RETURNING id, batch_id, problem_size, trial, attempts""",
+                    (worker_id, now + lease_time) )
+        row = cur.fetchone()
+
+        job = None
+        if row is not None :
+            job = dict(zip(["id", "batch_id", "problem_size", "trial", "attempts"], row))
+            cur.execute("SELECT program_name, settings FROM queue_batches WHERE id = ?", (job["batch_id"],) )
+            [job["program_name"], job_settings] = cur.fetchone()
+            job["settings"] = json.loads(job_settings)
+
+        conn.commit()
+
+    except BaseException :
+        conn.rollback()
+        raise
+
+    return [job, num_requeued, [entry for entry in collected if entry is not None]]
+
+# end function: claim_job
+
+# -----------------------------------------------------------------
+
+def renew_lease(job_id, worker_id, lease_time) :
+    """ Renew a worker's lease of a job (the worker's heartbeat)
+
+        In:  job_id     - id of the job (integer)
+             worker_id  - name of the worker (string)
+             lease_time - seconds the renewed lease lasts (float)
+        Out: renewed    - does the worker still hold the lease? (boolean)
+                          (False if the lease ran out and the job was requeued)
+    """
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    cur.execute("UPDATE queue_jobs SET lease_expires = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                (time.time() + lease_time, job_id, worker_id) )
+    renewed = (cur.rowcount == 1)
+
+    conn.commit()
+
+    return renewed
+
+# end function: renew_lease
+
+# -----------------------------------------------------------------
+
+def finish_job(job_id, worker_id, timing, samples) :
+    """ Store a job's result (and the problem size's timing, if it was its last job)
+
+        In:  job_id    - id of the job (integer)
+             worker_id - name of the worker (string)
+             timing    - the job's timing (float, None if a run failed)
+             samples   - info about each of the job's runs (list of dictionaries)
+        Out: stored    - was the result stored? (boolean)
+                         (False if the worker lost the job's lease)
+             collected - [prog_name, prob_size, timing, status] of the problem size if this
+                         was its last job (None otherwise)
+    """
+
+    # the programs' console output isn't stored (and the iteration times are stored as JSON lists)
+    samples = [ {key : value for [key, value] in sample.items() if key != "output"} for sample in samples ]
+    for sample in samples :
+        if sample.get("iteration_times") is not None :
+            sample["iteration_times"] = np.asarray(sample["iteration_times"]).tolist()
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    cur.execute("BEGIN IMMEDIATE")
+    try :
+        cur.execute("""UPDATE queue_jobs SET state = 'done', lease_expires = NULL, result = ?
+                       WHERE id = ? AND worker = ? AND state = 'leased'
+                       RETURNING batch_id, problem_size""",
+                    (json.dumps([timing, samples]), job_id, worker_id) )
+        row = cur.fetchone()
+
+        collected = None
+        if row is not None :
+            collected = collect_prob_size(cur, row[0], row[1])
+
+        conn.commit()
+
+    except BaseException :
+        conn.rollback()
+        raise
+
+    return [row is not None, collected]
+
+# end function: finish_job
+
+# -----------------------------------------------------------------
+
+def release_job(job_id, worker_id) :
+    """ Give a claimed job back to the queue (e.g. its worker is stopping), without
+        counting the attempt
+
+        In:  job_id    - id of the job (integer)
+             worker_id - name of the worker (string)
+        Out: nothing
+    """
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    cur.execute("""UPDATE queue_jobs SET state = 'queued', worker = NULL, lease_expires = NULL, attempts = attempts - 1
+                   WHERE id = ? AND worker = ? AND state = 'leased'""",
+                (job_id, worker_id) )
+
+    conn.commit()
+
+# end function: release_job
+
+# -----------------------------------------------------------------
+
+def collect_prob_size(cur, batch_id, prob_size) :
+    """ Store a problem size's timing once all of its jobs are done (without committing)
+
+        In:  cur       - cursor of the connection (in the middle of an IMMEDIATE transaction)
+             batch_id  - id of the problem size's batch of jobs (integer)
+             prob_size - problem size (integer)
+        Out: collected - [prog_name, prob_size, timing, status] (None if some of the
+                         problem size's jobs aren't done, or it was already collected)
+
+        The jobs' samples are combined into the problem size's timing (see
+        timing_stats.combine_trials()), which is stored with the batch's conflict policy
+    """
+
+    cur.execute("SELECT 1 FROM queue_jobs WHERE batch_id = ? AND problem_size = ? AND state IN ('queued', 'leased')",
+                (batch_id, prob_size) )
+    if cur.fetchone() is not None :
+        return None
+
+    cur.execute("""UPDATE queue_jobs SET state = 'collected'
+                   WHERE batch_id = ? AND problem_size = ? AND state = 'done'
+                   RETURNING trial, result""",
+                (batch_id, prob_size) )
+    rows = sorted(cur.fetchall(), key=lambda row : row[0] or 0)
+    if len(rows) == 0 :
+        return None
+
+    cur.execute("SELECT program_name, settings FROM queue_batches WHERE id = ?", (batch_id,) )
+    [prog_name, run_settings] = cur.fetchone()
+    run_settings = json.loads(run_settings)
+
+    results = [ [trial] + json.loads(result) for [trial, result] in rows ]
+
+    # a job that ran all of the problem size's trials already has its timing
+    if len(results) == 1 and results[0][0] is None :
+        [trial, timing, samples] = results[0]
+    else :
+        [timing, samples] = timing_stats.combine_trials(
+                                [ [trial, samples] for [trial, timing, samples] in results ],
+                                run_settings["outlier_filter"])
+
+    insert_timing(cur, prog_name, prob_size, timing, samples, run_settings["on_conflict"])
+
+    return [prog_name, prob_size, timing, timing_stats.get_samples_status(samples)]
+
+# end function: collect_prob_size
+
+# -----------------------------------------------------------------
+
+def get_queue_counts() :
+    """ Get the # of jobs in each state in the work queue
+
+        In:  nothing
+        Out: counts - # of jobs of each state (dictionary: "queued", "leased", "done", "collected" -> integer)
+    """
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    counts = {"queued" : 0, "leased" : 0, "done" : 0, "collected" : 0}
+
+    cur.execute("SELECT state, COUNT(*) FROM queue_jobs GROUP BY state")
+    counts.update(dict(cur.fetchall()))
+
+    return counts
+
+# end function: get_queue_counts
+
+# -----------------------------------------------------------------
+
+def add_sweep(prog_name, prob_sizes, run_settings) :
+    """ Record a new sweep: a program's planned problem sizes
+
+        In:  prog_name    - name of the program (string)
+             prob_sizes   - the sweep's problem sizes, in the order they are run (list of integers)
+             run_settings - application settings the sweep runs with (dictionary)
+        Out: sweep_id     - id of the sweep (integer)
+    """
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    cur.execute("INSERT INTO sweeps (program_name, settings, started) VALUES (?, ?, ?) RETURNING id",
+                (prog_name, json.dumps(run_settings), time.time()) )
+    sweep_id = cur.fetchone()[0]
+
+    cur.executemany("INSERT INTO sweep_sizes (sweep_id, problem_size) VALUES (?, ?)",
+                    [ (sweep_id, prob_size) for prob_size in prob_sizes ] )
+
+    conn.commit()
+
+    return sweep_id
+
+# end function: add_sweep
+
+# -----------------------------------------------------------------
+
+def get_sweep(sweep_id) :
+    """ Get a sweep's plan and the problem sizes it still has to run
+
+        In:  sweep_id     - id of the sweep (integer)
+        Out: prog_name    - name of the program (string, "" if there is no such sweep)
+             run_settings - application settings the sweep runs with (dictionary)
+             state        - the sweep's state (string: "running", "interrupted" or "done")
+             prob_sizes   - problem sizes that aren't done, in the planned order (list of integers)
+                            (including "running" ones: a crashed process left them unfinished)
+    """
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    cur.execute("SELECT program_name, settings, state FROM sweeps WHERE id = ?", (sweep_id,) )
+    row = cur.fetchone()
+    if row is None :
+        return ["", {}, "", []]
+
+    [prog_name, run_settings, state] = row
+
+    # rowid order is the order the problem sizes were planned in
+    cur.execute("SELECT problem_size FROM sweep_sizes WHERE sweep_id = ? AND state != 'done' ORDER BY rowid",
+                (sweep_id,) )
+    prob_sizes = [row[0] for row in cur.fetchall()]
+
+    return [prog_name, json.loads(run_settings), state, prob_sizes]
+
+# end function: get_sweep
+
+# -----------------------------------------------------------------
+
+def get_unfinished_sweeps() :
+    """ Get the sweeps that aren't done (interrupted, or their process died)
+
+        In:  nothing
+        Out: sweeps - each sweep's [sweep_id, prog_name, state, started, num_sizes, num_done]
+                      (list of lists, oldest first; started is a time.time())
+    """
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    cur.execute("""SELECT sweeps.id, sweeps.program_name, sweeps.state, sweeps.started,
+                          COUNT(*), SUM(sweep_sizes.state = 'done')
+                   FROM sweeps JOIN sweep_sizes ON sweep_sizes.sweep_id = sweeps.id
+                   WHERE sweeps.state != 'done'
+                   GROUP BY sweeps.id ORDER BY sweeps.id""")
+
+    return [list(row) for row in cur.fetchall()]
+
+# end function: get_unfinished_sweeps
+
+# -----------------------------------------------------------------
+
+def set_sweep_size_running(sweep_id, prob_size) :
+    """ Mark a sweep's problem size as running (its runs have started)
+
+        In:  sweep_id  - id of the sweep (integer)
+             prob_size - problem size (integer)
+        Out: nothing
+    """
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    cur.execute("UPDATE sweep_sizes SET state = 'running', started = ? WHERE sweep_id = ? AND problem_size = ?",
+                (time.time(), sweep_id, prob_size) )
+
+    conn.commit()
+
+# end function: set_sweep_size_running
+
+# -----------------------------------------------------------------
+
+def set_sweep_state(sweep_id, state) :
+    """ Change a sweep's state
+
+        In:  sweep_id - id of the sweep (integer)
+             state    - the sweep's new state (string):
+                           "running"     - started or resumed
+                           "interrupted" - stopped before all of its problem sizes were done
+                           "done"        - all of its problem sizes are done
+        Out: nothing
+    """
+
+    conn = database.connection()
+    cur = conn.cursor()
+
+    if state == "running" :
+        cur.execute("UPDATE sweeps SET state = ?, started = ?, finished = NULL WHERE id = ?",
+                    (state, time.time(), sweep_id) )
+    else :
+        cur.execute("UPDATE sweeps SET state = ?, finished = ? WHERE id = ?",
+                    (state, time.time(), sweep_id) )
+
+    conn.commit()
+
+# end function: set_sweep_state
+
+# -----------------------------------------------------------------
@@ -0,0 +1,92 @@
+/* Compute l2 vector norm many times, and report the timing of each iteration */
+
+/*
+   - used gcc compiler
+
+         gcc -o l2vecnorm_iters l2vecnorm_iters.c -std=gnu99 -lm
+
+   - the first line of its console output is the mean timing of an iteration (as l2vecnorm's)
+   - with pycnumanal's "result_channel_size" setting above 0, each iteration's timing is also
+     written to the result channel: the file named by the PYCNUMANAL_RESULTS environment variable,
+     of 8 byte records (record 0: # of timings (int64), records 1, 2, ...: the timings (double)),
+     at most PYCNUMANAL_RESULTS_CAPACITY timings
+*/
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <stdint.h>
+#include <math.h>
+#include <time.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+
+#define ITERATIONS 1000
+
+int main( int argc, char *argv[]) {
+
+    // get vector (array) size from command line argument
+    long n = atol(argv[1]);
+
+    double *u = malloc((n > 0 ? n : 1) * sizeof(double));
+    if (u == NULL) return 1;
+
+    // initialize vector (array) by incrementing by 1 from 0
+    for (long i = 0; i < n; ++i) {
+        u[i] = i;
+    }
+
+    // map the result channel, if there is one
+    int64_t *num_timings = NULL;
+    double *timings = NULL;
+    long capacity = 0;
+
+    char *results_path = getenv("PYCNUMANAL_RESULTS");
+    if (results_path != NULL) {
+        capacity = atol(getenv("PYCNUMANAL_RESULTS_CAPACITY"));
+        int fd = open(results_path, O_RDWR);
+        if (fd >= 0) {
+            void *results = mmap(NULL, (capacity + 1) * 8, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+            close(fd);
+            if (results != MAP_FAILED) {
+                num_timings = (int64_t *) results;
+                timings = (double *) results + 1;
+            }
+        }
+    }
+
+    volatile double norm;
+    double total_time = 0.;
+
+    for (int k = 0; k < ITERATIONS; ++k) {
+        struct timespec start, end;
+
+        clock_gettime(CLOCK_MONOTONIC, &start);
+
+        // compute l2-norm of vector (array)
+        double accum = 0.;
+        for (long i = 0; i < n; ++i) {
+            accum += u[i] * u[i];
+        }
+        norm = sqrt(accum);
+
+        clock_gettime(CLOCK_MONOTONIC, &end);
+
+        double time_used = (end.tv_sec - start.tv_sec) + (end.tv_nsec - start.tv_nsec) * 1e-9;
+        total_time += time_used;
+
+        if (timings != NULL && k < capacity) {
+            timings[k] = time_used;
+        }
+    }
+
+    if (num_timings != NULL) {
+        *num_timings = (ITERATIONS < capacity ? ITERATIONS : capacity);
+    }
+
+    free(u);
+
+    printf("%.9f\n", total_time / ITERATIONS);
+
+    return 0;
+}
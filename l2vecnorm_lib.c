@@ -0,0 +1,26 @@
+/* Compute l2 vector norm: shared library version of l2vecnorm.c */
+
+/*
+   - used gcc compiler
+
+         gcc -O2 -shared -fPIC -o libl2vecnorm.so l2vecnorm_lib.c -std=gnu99 -lm
+
+   - added to pycnumanal as a "library" program:
+
+         libl2vecnorm.so:l2norm(double*, long)
+
+     (pycnumanal makes the vector (0, 1, 2, ...) and times the calls itself)
+*/
+
+#include <math.h>
+
+double l2norm(const double *u, long n) {
+
+    // compute l2-norm of vector (array)
+    double accum = 0.;
+    for (long i = 0; i < n; ++i) {
+        accum += u[i] * u[i];
+    }
+
+    return sqrt(accum);
+}
@@ -0,0 +1,91 @@
+/* Compute l2 vector norm and timing to do so, for a whole sweep of vector sizes */
+
+/*
+   - used gcc compiler
+
+         gcc -o l2vecnorm_sweep l2vecnorm_sweep.c -std=gnu99 -lm
+
+   - added to pycnumanal as a "sweep" program, which is run once for all of the vector sizes:
+
+         ./l2vecnorm_sweep --trials T --warmup W size1 size2 ...
+
+     and outputs a line of JSON for each trial of each size, e.g.
+
+         {"size": 1000, "trial": 1, "time": 0.000001234}
+*/
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <math.h>
+#include <time.h>
+
+// compute l2-norm of vector (array)
+double l2norm(const double *u, long n) {
+
+    double accum = 0.;
+    for (long i = 0; i < n; ++i) {
+        accum += u[i] * u[i];
+    }
+
+    return sqrt(accum);
+}
+
+int main( int argc, char *argv[]) {
+
+    int trials = 1;
+    int warmup = 0;
+
+    // get # of trials and warmup runs from command line arguments
+    int first_size = 1;
+    while (first_size + 1 < argc && strncmp(argv[first_size], "--", 2) == 0) {
+        if (strcmp(argv[first_size], "--trials") == 0) {
+            trials = atoi(argv[first_size + 1]);
+        }
+        else if (strcmp(argv[first_size], "--warmup") == 0) {
+            warmup = atoi(argv[first_size + 1]);
+        }
+        first_size += 2;
+    }
+
+    // the vector (array) is allocated and initialized once, for the largest size
+    long max_n = 0;
+    for (int k = first_size; k < argc; ++k) {
+        long n = atol(argv[k]);
+        if (n > max_n) max_n = n;
+    }
+
+    double *u = malloc((max_n > 0 ? max_n : 1) * sizeof(double));
+    if (u == NULL) return 1;
+
+    // initialize vector (array) by incrementing by 1 from 0
+    for (long i = 0; i < max_n; ++i) {
+        u[i] = i;
+    }
+
+    volatile double norm;
+
+    for (int k = first_size; k < argc; ++k) {
+        long n = atol(argv[k]);
+
+        for (int trial = 1 - warmup; trial <= trials; ++trial) {
+            struct timespec start, end;
+
+            clock_gettime(CLOCK_MONOTONIC, &start);
+            norm = l2norm(u, n);
+            clock_gettime(CLOCK_MONOTONIC, &end);
+
+            double time_used = (end.tv_sec - start.tv_sec) + (end.tv_nsec - start.tv_nsec) * 1e-9;
+
+            // warmup runs aren't reported
+            if (trial >= 1) {
+                printf("{\"size\": %ld, \"trial\": %d, \"time\": %.9f}\n", n, trial, time_used);
+                fflush(stdout);
+            }
+        }
+    }
+
+    free(u);
+
+    return 0;
+}
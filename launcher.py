@@ -0,0 +1,113 @@
+# launcher.py : Starts an external program of the pycnumanal application and reports its resource usage
+#
+#    VERSION 1.00
+#
+#    - run by runner.py as a small Python process of its own, which starts the program:
+#
+#         python3 -I -S launcher.py RUN_SPEC PROGRAM [ARGUMENTS ...]
+#
+#      (RUN_SPEC is a JSON object: the report pipe's file descriptor and the program's limits)
+#    - the program's wall clock time, exit status and resource usage (os.wait4()) are
+#      written to the report pipe as one line of JSON when the program exits
+#
+#    - why a separate process: Linux carries a process's peak memory over to the program it
+#      exec()'s, so a program started straight from pycnumanal (a large Python process, with
+#      NumPy and matplotlib loaded) would report at least pycnumanal's memory as its peak memory
+#      (ru_maxrss); started from this small process, it carries over only a few MB
+#    - only a few standard modules are imported, so that the process starts quickly and stays small
+#
+#    - runs on Linux (not tested on Windows)
+#    - Python 3.x (not tested with Python 2.x)
+#
+# --------------------------------------------------------
+#
+# Change log:
+#
+#    10/18/2026 (ag)   - created this module
+#                      - added launch() and set_limits()
+#
+# (ag) agent
+#
+# ---------------------------------------------------------
+
+# standard modules
+import json
+import os
+import resource
+import sys
+import time
+
+# -----------------------------------------------------------------
+
+def set_limits(memory_limit, cpu_limit, cpus) :
+    """ Set the resource limits (and CPU affinity) of the program (same as runner.set_limits(),
+        which can't be imported here)
+
+        In:  memory_limit - most address space of the program (integer, bytes, None for no limit)
+             cpu_limit    - most CPU seconds of the program (integer, None for no limit)
+             cpus         - cores the program runs on (list of integers, None for any core)
+        Out: nothing
+    """
+
+    if cpus is not None :
+        os.sched_setaffinity(0, cpus)
+
+    if memory_limit is not None :
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    # the program gets SIGXCPU at the soft limit, and SIGKILL a second later
+    if cpu_limit is not None :
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, cpu_limit + 1))
+
+# end function: set_limits
+
+# -----------------------------------------------------------------
+
+def launch(run_spec, args) :
+    """ Start the program, wait for it and report how its run went
+
+        In:  run_spec - the run's report pipe and limits (dictionary):
+                           "report_fd"    - file descriptor of the report pipe (integer)
+                           "memory_limit", "cpu_limit", "cpus" - see set_limits()
+             args     - the program's command line arguments (list of strings)
+        Out: nothing
+
+        The report is a JSON object: "wall_time" (float, seconds), "wait_status"
+        (integer, see os.waitstatus_to_exitcode()) and "rusage" (the os.wait4()
+        resource usage's fields, e.g. "ru_maxrss"). If the program can't be started,
+        the report is "errno" and "strerror" of the error instead.
+    """
+
+    report_fd = run_spec["report_fd"]
+
+    start_ns = time.perf_counter_ns()
+
+    pid = os.fork()
+    if pid == 0 :
+        # the program doesn't get the report pipe (closed by a successful exec)
+        try :
+            os.set_inheritable(report_fd, False)
+            set_limits(run_spec["memory_limit"], run_spec["cpu_limit"], run_spec["cpus"])
+            os.execvp(args[0], args)
+        except OSError as ex :
+            os.write(report_fd, (json.dumps({"errno" : ex.errno, "strerror" : ex.strerror}) + "\n").encode())
+        os._exit(127)
+
+    [pid, wait_status, rusage] = os.wait4(pid, 0)
+
+    end_ns = time.perf_counter_ns()
+
+    rusage_fields = [name for name in dir(rusage) if name.startswith("ru_")]
+    report = {
+        "wall_time"   : (end_ns - start_ns) * 1e-9,
+        "wait_status" : wait_status,
+        "rusage"      : {name : getattr(rusage, name) for name in rusage_fields},
+    }
+    os.write(report_fd, (json.dumps(report) + "\n").encode())
+
+# end function: launch
+
+# -----------------------------------------------------------------
+
+if __name__ == "__main__" :
+    launch(json.loads(sys.argv[1]), sys.argv[2:])
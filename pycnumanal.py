@@ -5,7 +5,7 @@
 #    pyc:     Python/C program
 #    numanal: timed numerical analysis routines written in C (could be other languages as well)
 #
-#    - adds program to the database
+#    - adds program to the database (an external executable, or a Python function run in-process)
 #    - delete a program from the database (and its timings)
 #    - displays programs in the database
 #    - manually add program timings to database
@@ -13,6 +13,10 @@
 #    - display a program's timings
 #    - delete all of a program's timings
 #    - plot timings for a program
+#    - change application settings (e.g. # of timings generated in parallel)
+#    - export timings to a CSV file
+#    - headless batch jobs from a JSON/TOML job file: python3 pycnumanal.py --batch job.json
+#    - worker processes that run queued jobs (possibly on several hosts): python3 pycnumanal.py --worker
 #
 #    - runs on Linux (not tested on Windows)
 #    - Python 3.x (not tested with Python 2.x)
@@ -83,16 +87,420 @@
 #
 #    12/31/2018 (pf)   - RELEASING AS VERSION 1.0
 #
+#    10/18/2026 (ag)   - added parallel timing generation
+#                          - added get_physical_core_count()
+#                          - added settings (dictionary) and set_setting()
+#                              - "num_workers" setting: # of external programs run at the same time
+#                                (defaults to the # of physical cores)
+#                          - added run_program()
+#                              - generate_timing() now calls it; it is a module-level function
+#                                so that it can be handed to the worker processes
+#                          - added generate_and_add_timings()
+#                              - runs generate_timing()'s work in a process pool and adds
+#                                each timing to the database as soon as it finishes
+#
+#    10/18/2026 (ag)   - external programs are now run by the new runner module
+#                          - no shell is started; timings are also measured in Python
+#                      - modified run_program()
+#                          - calls runner.run_program() instead of os.popen()
+#                          - takes the settings to run with (worker processes don't share settings)
+#                          - returns the run's info along with its timing
+#                      - added "timing_source" setting (program, wall, or cpu timing)
+#                      - added setting_choices (dictionary)
+#                      - modified generate_timing() to also return the run's info
+#                      - modified add_timing() to also store the run's info (wall/user/sys times)
+#
+#    10/18/2026 (ag)   - added repeated trials of a problem size
+#                          - added "warmup_runs" and "trials" settings
+#                          - added run_trials(); generate_timing() and generate_and_add_timings()
+#                            now use it
+#                          - a problem size's timing is now the median of its trials' timings
+#                      - modified generate_timing() to return the info of every trial (samples)
+#                      - modified add_timing() to store the samples (in the new samples table)
+#                      - added get_timing_stats()
+#
+#    10/18/2026 (ag)   - added adaptive repetition of a problem size's trials
+#                          - added "repetition_mode", "ci_target", "confidence", "min_trials",
+#                            "max_trials" and "time_budget" settings
+#                          - modified run_trials() to stop once the median's confidence interval
+#                            is narrow enough (or the problem size's budget runs out)
+#                      - added "outlier_filter" setting; outlier trials are left out of the timing
+#                      - added setting_minimums (dictionary) to check numeric settings
+#
+#    10/18/2026 (ag)   - added "on_conflict" setting (skip, replace or merge an existing timing)
+#                      - modified add_timing() to take the conflict policy and return whether stored
+#                      - added has_timing()
+#
+#    10/18/2026 (ag)   - modified generate_and_add_timings()
+#                          - timings are added by a db.TimingWriter (batches, one commit per batch)
+#                            instead of one add_timing() (one commit) per timing
+#                          - queued timings are written even when stopped early (e.g. Ctrl-C)
+#                      - added "commit_batch_size" and "commit_interval" settings
+#
+#    10/18/2026 (ag)   - added get_timings_array() (NumPy structured array of a program's timings)
+#                      - modified get_timings() and get_timing_stats()
+#                          - return NumPy arrays (columns of db.get_timings_array(), not copies)
+#
+#    10/18/2026 (ag)   - added iter_timings() (streams timings with bounded memory)
+#                      - added export_timings() (streams timings to a CSV file)
+#
+#    10/18/2026 (ag)   - added get_timings_many() (several programs' timings with one query)
+#
+#    10/18/2026 (ag)   - added fit_complexity() (best growth model of a program's timings,
+#                        done by the new analysis module)
+#
+#    10/18/2026 (ag)   - added sweep_timings() and get_next_sweep_size() (problem sizes grown
+#                        geometrically until a time budget would be used up)
+#                      - added "sweep_safety_factor" setting
+#
+#    10/18/2026 (ag)   - added "run_timeout", "memory_limit" and "cpu_limit" settings (limits of each run)
+#                      - a failed run (timeout, out of memory, crash, bad output) no longer stops
+#                        the timings being generated
+#                          - modified run_program() to return a None timing and the run's status
+#                          - modified run_trials() to stop a problem size's runs at its first failed run
+#                          - the failed problem size is stored with its status (and no timing)
+#                      - modified generate_and_add_timings() and sweep_timings() to also yield the
+#                        problem size's status; sweep_timings() stops at the first failed problem size
+#                      - iter_timings() rows (and exported CSV rows) end with the timing's status
+#
+#    10/18/2026 (ag)   - added command line arguments (argparse)
+#                          - "--batch job_file" runs a batch job (new batch module) instead of the menus
+#                      - modified set_setting() to check the type of the new value
+#                      - modified sweep_timings(): added max_size argument (a cheap program's sweep
+#                        can otherwise grow past the largest problem size the database can store)
+#
+#    10/18/2026 (ag)   - timings are tagged with their program's fingerprint (executable's content
+#                        hash, size, modification time and arguments; see runner.get_fingerprint())
+#                          - added get_fingerprint() and get_cached_sizes()
+#                          - a stored timing is only reused (skipped) when its fingerprint matches;
+#                            stale timings (e.g. the program was recompiled) are regenerated
+#
+#    10/18/2026 (ag)   - added an asyncio execution engine ("engine" and "async_concurrency" settings)
+#                          - added generate_and_add_timings_async() (async iterator), run_trials_async()
+#                            and run_program_async(); generate_and_add_timings() uses them through
+#                            iterate_async() when the "engine" setting is "asyncio"
+#                          - moved run_trials()'s per-trial work into add_trial() and get_failed_warmup(),
+#                            and run_program()'s into get_run_limits() and get_run_timing(), so that
+#                            both engines share them
+#
+#    10/18/2026 (ag)   - added a work queue in the database, shared by worker processes (new worker module)
+#                          - added enqueue_timings() (queues a program's problem sizes as jobs) and
+#                            run_queued_job()
+#                          - added "lease_time" and "max_attempts" settings
+#                          - added "--worker", "--worker-id", "--exit-when-empty" and "--shared"
+#                            command line arguments
+#
+#    10/18/2026 (ag)   - added resumable sweeps: a sweep's plan and the state of each problem size
+#                        are recorded in the database (sweeps and sweep_sizes tables)
+#                          - added plan_sweep(), run_sweep(), get_sweep() and get_unfinished_sweeps()
+#                          - modified generate_and_add_timings() (and generate_and_add_timings_async())
+#                            to take the sweep being run; its problem sizes are marked running as they
+#                            start, and done when their timings are stored
+#                          - the "processes" engine hands problem sizes to the worker processes as they
+#                            free up, instead of all at once
+#                          - added "--resume" command line argument
+#
+#    10/18/2026 (ag)   - added "cpu_affinity" setting: the external programs run on these cores, and
+#                        programs running at the same time get disjoint shares of them (runner.get_cpu_slots())
+#                      - added "run_order" and "shuffle_seed" settings: problem sizes can run in a random
+#                        order, and their trials can be interleaved (rounds of one trial of every problem
+#                        size), so that drift (e.g. thermal) doesn't bias one end of a sweep
+#                          - added get_run_units(), start_run_unit() and finish_run_unit()
+#                          - modified generate_and_add_timings() and generate_and_add_timings_async() to run
+#                            the units in that order, each with its own cores
+#                      - modified get_run_limits() to also get the cores a run is pinned to
+#                      - added host_settings (list): settings of the computer doing the runs, which a
+#                        resumed sweep or a queued job doesn't take from where it was planned or queued
+#
+#    10/18/2026 (ag)   - a run's resource usage (peak memory, page faults, context switches) is stored
+#                        with its sample (see runner.rusage_fields)
+#                      - added "launch_mode" setting: programs are started by a small launcher process
+#                        (launcher.py), so that their peak memory is their own
+#                          - the asyncio engine gets the programs' CPU times from the launcher, so it can
+#                            be used with the "cpu" timing source (except in "direct" launch mode)
+#                      - added get_sample_metric_many()
+#
+#    10/18/2026 (ag)   - added Python programs: a program can be a "module:function" called in this
+#                        process (programs table's program_type column, see runner.run_python_program())
+#                          - added program_type argument to add_program(), run_trials(), run_trials_async(),
+#                            run_program() and run_program_async()
+#                          - added "min_loop_time" setting (a Python program's loop calibration)
+#                          - added get_program_type() and program_exists()
+#
+#    10/18/2026 (ag)   - added shared library programs: a C function in a .so file called with ctypes in
+#                        this process ("library" program type, see runner.run_library_program())
+#
+#    10/18/2026 (ag)   - added sweep programs: an executable that measures all of the problem sizes in one
+#                        run, reporting each measurement as a JSON line ("sweep" program type, see
+#                        runner.run_sweep_program())
+#                          - added run_sweep_trials() and generate_and_add_sweep_timings()
+#                          - modified run_trials() and generate_and_add_timings() to run sweep programs
+#                          - get_run_timing() gives "bad_output" whenever the chosen timing is missing
+#
+#    10/18/2026 (ag)   - added "result_channel_size" setting: an external program can write its per-iteration
+#                        timings to a shared memory result channel (see runner.create_result_channel()),
+#                        stored with its samples
+#                      - added get_iteration_times()
+#
+#    10/18/2026 (ag)   - modified iterate_async() to cancel the async iterator's pending step when stopped
+#                        (Ctrl-C or SIGTERM), so that it kills its programs and writes its finished timings
+#
+#    10/18/2026 (ag)   - modified get_cached_sizes() to also return the problem sizes whose stored timing
+#                        failed (e.g. a timeout), which aren't valid timings (they are generated again)
+#
+#    10/18/2026 (ag)   - modified sweep_timings(): its runs are killed after max_run_time seconds (or
+#                        the time left in the budget), instead of only being predicted to fit them
+#
+#    10/18/2026 (ag)   - modified sweep_timings(): a problem size's predicted cost uses the most trials
+#                        it can have ("max_trials" with adaptive repetition), not the last size's # of trials
+#
 # (pf) Patrick Flynn
+# (ag) agent
 #
 # ---------------------------------------------------------
 
 # standard modules
 import os
+import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import csv
+import math
+import random
+import statistics
+import sys
+import time
 
 # custom modules
+import analysis
+import batch
 import database as db
+import runner
+import timing_stats
 import user_interface as ui
+import worker
+
+# -----------------------------------------------------------------
+
+def get_physical_core_count() :
+    """ Get the number of physical CPU cores (hyperthreads are not counted)
+
+        In:  nothing
+        Out: num_cores - number of physical cores (integer)
+    """
+
+    # each (physical id, core id) pair in /proc/cpuinfo is one physical core
+    cores = set()
+    try :
+        with open("/proc/cpuinfo", "rt") as f :
+            physical_id = "0"
+            for line in f :
+                if line.startswith("physical id") :
+                    physical_id = line.split(":")[1].strip()
+                elif line.startswith("core id") :
+                    cores.add( (physical_id, line.split(":")[1].strip()) )
+    except OSError :
+        pass
+
+    # fall back to the logical CPU count when /proc/cpuinfo isn't usable (e.g. not Linux)
+    if len(cores) == 0 :
+        return os.cpu_count() or 1
+
+    return len(cores)
+
+# end function: get_physical_core_count
+
+# -----------------------------------------------------------------
+
+# application settings (changeable from the user interface's settings menu)
+#
+#    num_workers     - # of external programs run at the same time when generating timings
+#                      ("processes" engine)
+#    engine          - how the external programs are run when generating timings:
+#                         "processes" - each run waits in its own worker process
+#                         "asyncio"   - all runs wait in one asyncio event loop (suits programs that
+#                                       mostly wait, e.g. I/O or MPI launchers)
+#    async_concurrency - # of external programs run at the same time by the "asyncio" engine
+#    timing_source   - which timing of a run is stored as the program's timing:
+#                         "program" - the timing output by the program itself
+#                         "wall"    - wall clock time measured in Python
+#                         "cpu"     - the program's user + system CPU time
+#    warmup_runs     - # of runs of a problem size done (and thrown away) before its trials
+#    trials          - # of measured runs (samples) of a problem size; the stored timing
+#                      is the median of the samples
+#    repetition_mode - how many trials are run for a problem size:
+#                         "fixed"    - always "trials" trials
+#                         "adaptive" - trials are run until the median's confidence interval is
+#                                      narrow enough ("ci_target"), at least "min_trials" trials,
+#                                      and at most "max_trials" trials or "time_budget" seconds
+#    ci_target       - adaptive: largest relative width of the median's confidence interval
+#                      (e.g. 0.02 is a confidence interval that is 2% of the median wide)
+#    confidence      - adaptive: confidence level of the median's confidence interval
+#    min_trials      - adaptive: minimum # of trials
+#    max_trials      - adaptive: maximum # of trials
+#    time_budget     - adaptive: maximum seconds spent on a problem size's trials
+#    outlier_filter  - outlier samples are left out of a problem size's timing and statistics:
+#                         "mad"  - median absolute deviation filter
+#                         "iqr"  - interquartile range filter
+#                         "none" - no filtering
+#    on_conflict     - what to do with a new timing for a problem size that already has one:
+#                         "skip"    - keep the existing timing (the problem size isn't rerun)
+#                         "replace" - replace the existing timing
+#                         "merge"   - add the new samples to the existing timing's samples
+#    commit_batch_size - most generated timings added to the database in one transaction
+#    commit_interval   - most seconds a generated timing waits to be added to the database
+#    sweep_safety_factor - a problem size sweep's predicted run times are multiplied by this
+#                          before being checked against the time budget and the run time cap
+#    run_timeout     - most wall clock seconds of one run of a program; the run is killed
+#                      after that (0 for no timeout) (a sweep program: most seconds between
+#                      two of its measurements)
+#    memory_limit    - most MB of address space of a running program (0 for no limit)
+#    cpu_limit       - most CPU seconds of one run of a program (0 for no limit)
+#    lease_time      - work queue: seconds a worker's claim of a job lasts unless renewed (the
+#                      worker renews it while the job runs); then the job is requeued
+#    max_attempts    - work queue: most times a job is claimed before it is given up on
+#    cpu_affinity    - cores the external programs run on (e.g. "2-7", "" for any core); programs
+#                      running at the same time each get their own share of the cores
+#    run_order       - order of the runs when generating timings:
+#                         "given"       - problem sizes in the order they were entered, each
+#                                         problem size's trials one after another
+#                         "shuffled"    - problem sizes in a random order
+#                         "interleaved" - rounds of one trial of every problem size (in a random order),
+#                                         so each problem size's trials are spread across the sweep
+#                                         ("fixed" repetition mode; warmup runs in the first round only)
+#    shuffle_seed    - seed of the random run order (0 for a different order every time)
+#    min_loop_time   - least seconds of one measurement of a Python (or shared library) program: its
+#                      function is called in a loop until the loop takes this long, and timed per call
+#                      (timeit-style)
+#    launch_mode     - how the external programs are started:
+#                         "launcher" - by a small launcher process (launcher.py), which reports the
+#                                      program's resource usage (each run also starts a Python
+#                                      interpreter, which isn't part of the run's timings)
+#                         "direct"   - straight from this application (quicker to start, but a program's
+#                                      peak memory is at least this application's memory, and the
+#                                      "asyncio" engine gets no resource usage)
+#    result_channel_size - most per-iteration timings an external program can write to its result
+#                      channel, a memory-mapped file named in its PYCNUMANAL_RESULTS environment
+#                      variable (see runner.create_result_channel()); they are stored with the run's
+#                      sample (0 for no result channel)
+settings = {
+    "num_workers"     : get_physical_core_count(),
+    "engine"          : "processes",
+    "async_concurrency" : 32,
+    "timing_source"   : "program",
+    "warmup_runs"     : 0,
+    "trials"          : 1,
+    "repetition_mode" : "fixed",
+    "ci_target"       : 0.02,
+    "confidence"      : 0.95,
+    "min_trials"      : 3,
+    "max_trials"      : 50,
+    "time_budget"     : 60.0,
+    "outlier_filter"  : "mad",
+    "on_conflict"     : "skip",
+    "commit_batch_size" : 500,
+    "commit_interval"   : 1.0,
+    "sweep_safety_factor" : 2.0,
+    "run_timeout"     : 0.0,
+    "memory_limit"    : 0,
+    "cpu_limit"       : 0,
+    "lease_time"      : 60.0,
+    "max_attempts"    : 3,
+    "cpu_affinity"    : "",
+    "run_order"       : "given",
+    "shuffle_seed"    : 0,
+    "launch_mode"     : "launcher",
+    "min_loop_time"   : 0.2,
+    "result_channel_size" : 0,
+}
+
+# allowed values of the settings that are chosen from a list
+setting_choices = {
+    "timing_source"   : ["program", "wall", "cpu"],
+    "engine"          : ["processes", "asyncio"],
+    "repetition_mode" : ["fixed", "adaptive"],
+    "outlier_filter"  : ["mad", "iqr", "none"],
+    "on_conflict"     : ["skip", "replace", "merge"],
+    "run_order"       : ["given", "shuffled", "interleaved"],
+    "launch_mode"     : ["launcher", "direct"],
+}
+
+# smallest allowed values of the numeric settings
+setting_minimums = {
+    "num_workers"     : 1,
+    "async_concurrency" : 1,
+    "warmup_runs"     : 0,
+    "trials"          : 1,
+    "ci_target"       : 0.0,
+    "confidence"      : 0.0,
+    "min_trials"      : 1,
+    "max_trials"      : 1,
+    "time_budget"     : 0.0,
+    "commit_batch_size" : 1,
+    "commit_interval"   : 0.0,
+    "sweep_safety_factor" : 1.0,
+    "run_timeout"     : 0.0,
+    "memory_limit"    : 0,
+    "cpu_limit"       : 0,
+    "lease_time"      : 1.0,
+    "max_attempts"    : 1,
+    "shuffle_seed"    : 0,
+    "min_loop_time"   : 0.0,
+    "result_channel_size" : 0,
+}
+
+# settings of the computer doing the runs: a resumed sweep (or a queued job) uses these
+# settings of the computer resuming (or running) it, not the ones it was planned with
+host_settings = ["num_workers", "cpu_affinity"]
+
+# -----------------------------------------------------------------
+
+def set_setting(name, value) :
+    """ Change one of the application settings
+
+        In:  name  - setting name (string)
+             value - new value for the setting
+        Out: nothing
+
+        Raises ValueError for an unknown setting or an invalid value
+    """
+
+    if name not in settings :
+        raise ValueError("unknown setting: {}".format(name))
+
+    # a new value has the same type as the setting's default (an integer is also a float)
+    type_names = {int : "an integer", float : "a number", str : "a string"}
+    if isinstance(settings[name], float) and isinstance(value, int) and not isinstance(value, bool) :
+        value = float(value)
+    if type(value) is not type(settings[name]) :
+        raise ValueError("{} needs to be {}".format(name, type_names[type(settings[name])]))
+
+    if name in setting_minimums and value < setting_minimums[name] :
+        raise ValueError("{} needs to be >= {}".format(name, setting_minimums[name]))
+
+    if name == "confidence" and value >= 1.0 :
+        raise ValueError("confidence needs to be < 1")
+
+    if name in setting_choices and value not in setting_choices[name] :
+        raise ValueError("{} needs to be one of: {}".format(name, ", ".join(setting_choices[name])))
+
+    # the cores need to be ones this process can run on
+    if name == "cpu_affinity" and value != "" :
+        cpus = runner.parse_cpu_list(value)
+        if not set(cpus) <= os.sched_getaffinity(0) :
+            raise ValueError("cpu_affinity can only have these cores: {}".format(runner.format_cpu_list(sorted(os.sched_getaffinity(0)))))
+
+    # the asyncio engine can't get the CPU times of programs it starts directly
+    new_settings = dict(settings)
+    new_settings[name] = value
+    if new_settings["engine"] == "asyncio" and new_settings["timing_source"] == "cpu" and \
+       new_settings["launch_mode"] == "direct" :
+        raise ValueError("the asyncio engine can't be used with the \"cpu\" timing source in \"direct\" launch mode")
+
+    settings[name] = value
+
+# end function: set_setting
 
 # -----------------------------------------------------------------
 
@@ -144,21 +552,67 @@ def get_programs() :
 
 # -----------------------------------------------------------------
 
-def add_program(prog_name, prog_desc, cmd_line_prefix) :   
+def add_program(prog_name, prog_desc, cmd_line_prefix, program_type="executable") :   
     """ Add a new program to the database
 
         In:  prog_name       - program name (string)
              prog_desc       - program description (string)
              cmd_line_prefix - command line prefix (string)
+                               (a Python program's "module:function" or "module:function:setup",
+                               a shared library program's "library:function(argument types)")
+             program_type    - type of the program (string, see runner.program_types)
         Out: nothing
+
+        Raises ValueError for an unknown program type (or a Python program that isn't a "module:function",
+        or a shared library program that isn't a "library:function(argument types)" of known types)
     """
 
-    db.add_program(prog_name, prog_desc, cmd_line_prefix)
+    if program_type not in runner.program_types :
+        raise ValueError("program type needs to be one of: {}".format(", ".join(runner.program_types)))
+
+    if program_type == "python" :
+        runner.split_python_target(cmd_line_prefix)
+    elif program_type == "library" :
+        runner.split_library_target(cmd_line_prefix)
+
+    db.add_program(prog_name, prog_desc, cmd_line_prefix, program_type)
 
 # end function: add_program
 
 # -----------------------------------------------------------------
 
+def get_program_type(prog_name) :
+    """ Get a program's type from the database
+
+        In:  prog_name    - name of the program (string)
+        Out: program_type - the program's type (string, see runner.program_types)
+    """
+
+    program_type = db.get_program_type(prog_name)
+
+    return program_type
+
+# end function: get_program_type
+
+# -----------------------------------------------------------------
+
+def program_exists(cmd_line_prefix, program_type="executable") :
+    """ Check that a program can be run from the current directory
+
+        In:  cmd_line_prefix - the program's command line prefix (string)
+             program_type    - type of the program (string, see runner.program_types)
+        Out: exists          - is the program's executable in the current directory (or its
+                               Python module importable)? (boolean)
+    """
+
+    exists = runner.program_exists(cmd_line_prefix, program_type)
+
+    return exists
+
+# end function: program_exists
+
+# -----------------------------------------------------------------
+
 def delete_program(prog_name) :   
     """ Delete a program from the database
 
@@ -176,18 +630,231 @@ def get_timings(prog_name) :
     """ Get a program's timings from the database
 
         In:  prog_name   - name of the program getting timings for (string)
-        Out: prob_sizes  - all problem sizes for the program (list)
-             timings     - all timings for the program (list)
+        Out: prob_sizes  - all problem sizes for the program (NumPy int64 array)
+             timings     - all timings for the program (NumPy float64 array)
    """
 
-    [prob_sizes, timings] = db.get_timings(prog_name)
-    
-    return [prob_sizes, timings]
+    timings_array = db.get_timings_array(prog_name)
+
+    return [timings_array["problem_size"], timings_array["timing"]]
 
 # end function: get_timings
 
 # -----------------------------------------------------------------
 
+def get_timings_array(prog_name) :
+    """ Get a program's timings (and their statistics) from the database as a NumPy array
+
+        In:  prog_name     - name of the program getting timings for (string)
+        Out: timings_array - the program's timings in problem size order
+                             (NumPy structured array, see db.timings_dtype)
+    """
+
+    timings_array = db.get_timings_array(prog_name)
+
+    return timings_array
+
+# end function: get_timings_array
+
+# -----------------------------------------------------------------
+
+def get_timings_many(prog_names) :
+    """ Get several programs' timings from the database with one query
+
+        In:  prog_names     - names of the programs getting timings for (list of strings)
+        Out: timings_arrays - each program's timings in problem size order
+                              (list of NumPy structured arrays, in the same order as prog_names)
+    """
+
+    timings_arrays = db.get_timings_many(prog_names)
+
+    return timings_arrays
+
+# end function: get_timings_many
+
+# -----------------------------------------------------------------
+
+def get_sample_metric_many(prog_names, metric) :
+    """ Get several programs' resource usage (e.g. peak memory) for each problem size
+
+        In:  prog_names    - names of the programs getting the resource usage of (list of strings)
+             metric        - the resource usage (string, one of db.sample_metrics, e.g. "max_rss")
+        Out: metric_arrays - each program's problem sizes and the median of their samples' metric
+                             (list of [problem sizes, medians] NumPy arrays, in the same order as prog_names)
+    """
+
+    metric_arrays = db.get_sample_metric_many(prog_names, metric)
+
+    return metric_arrays
+
+# end function: get_sample_metric_many
+
+# -----------------------------------------------------------------
+
+def get_iteration_times(prog_name, prob_size) :
+    """ Get the per-iteration timings a program's runs of a problem size wrote to their
+        result channels (see the "result_channel_size" setting)
+
+        In:  prog_name       - name of the program (string)
+             prob_size       - problem size (integer)
+        Out: iteration_times - each sample's timings (list of [trial #, NumPy float64 array])
+    """
+
+    iteration_times = db.get_iteration_times(prog_name, prob_size)
+
+    return iteration_times
+
+# end function: get_iteration_times
+
+# -----------------------------------------------------------------
+
+def fit_complexity(prog_name) :
+    """ Find the growth model (O(1), O(log n), O(n), ..., or a*n^b) that best fits a program's timings
+
+        In:  prog_name - name of the program analyzing the timings of (string)
+        Out: best_fit  - the best fitting model (dictionary, see analysis.fit_models())
+                         (None if the program has fewer than 3 timings)
+             fits      - every model's fit (list of dictionaries)
+    """
+
+    [prob_sizes, timings] = get_timings(prog_name)
+
+    [best_fit, fits] = analysis.fit_complexity(prob_sizes, timings)
+
+    return [best_fit, fits]
+
+# end function: fit_complexity
+
+# -----------------------------------------------------------------
+
+def iter_timings(prog_name=None, min_prob_size=None, max_prob_size=None) :
+    """ Stream timings from the database without reading all of them into memory
+
+        In:  prog_name     - only this program's timings (string, None for all programs)
+             min_prob_size - only problem sizes >= this (integer, None for no minimum)
+             max_prob_size - only problem sizes <= this (integer, None for no maximum)
+        Out: yields each timing's row, in (program name, problem size) order:
+                [prog_name, prob_size, timing, timing_min, timing_mean, timing_stdev, num_samples, status]
+             (a failed problem size's timing and statistics are None)
+    """
+
+    return db.iter_timings(prog_name, min_prob_size, max_prob_size)
+
+# end function: iter_timings
+
+# -----------------------------------------------------------------
+
+def export_timings(csv_filename, prog_name=None) :
+    """ Export timings to a CSV file (streamed, so any # of timings can be exported)
+
+        In:  csv_filename - name of the CSV file written (string)
+             prog_name    - only export this program's timings (string, None for all programs)
+        Out: num_timings  - # of timings exported (integer)
+    """
+
+    num_timings = 0
+
+    with open(csv_filename, "wt", newline="") as f :
+        csv_writer = csv.writer(f)
+        csv_writer.writerow(["program_name", "problem_size", "timing", "timing_min",
+                             "timing_mean", "timing_stdev", "num_samples", "status"])
+        for row in iter_timings(prog_name) :
+            csv_writer.writerow(row)
+            num_timings += 1
+
+    return num_timings
+
+# end function: export_timings
+
+# -----------------------------------------------------------------
+
+def get_timing_stats(prog_name) :
+    """ Get the statistics of a program's timings from the database
+
+        In:  prog_name      - name of the program getting timing statistics for (string)
+        Out: prob_sizes     - all problem sizes for the program (NumPy int64 array)
+             timing_mins    - smallest sample timing of each problem size (NumPy float64 array)
+             timing_medians - median sample timing of each problem size (NumPy float64 array)
+                              (this is the problem size's timing)
+             timing_means   - mean sample timing of each problem size (NumPy float64 array)
+             timing_stdevs  - standard deviation of each problem size's sample timings (NumPy float64 array)
+             nums_samples   - # of sample timings of each problem size (NumPy int64 array)
+    """
+
+    timings_array = db.get_timings_array(prog_name)
+
+    return [timings_array["problem_size"], timings_array["timing_min"], timings_array["timing"],
+            timings_array["timing_mean"], timings_array["timing_stdev"], timings_array["num_samples"]]
+
+# end function: get_timing_stats
+
+# -----------------------------------------------------------------
+
+def has_timing(prog_name, prob_size) :
+    """ Does a program already have a timing for a problem size in the database?
+
+        In:  prog_name  - name of the program (string)
+             prob_size  - problem size (integer)
+        Out: True/False - is the problem size's timing in the database? (boolean)
+    """
+
+    return db.has_timing(prog_name, prob_size)
+
+# end function: has_timing
+
+# -----------------------------------------------------------------
+
+def get_fingerprint(prog_name) :
+    """ Get the fingerprint of a program's executable and arguments
+
+        In:  prog_name   - name of the program (string)
+        Out: fingerprint - the program's fingerprint (string, see runner.get_fingerprint())
+    """
+
+    fingerprint = runner.get_fingerprint(db.get_cmd_line_prefix(prog_name), db.get_program_type(prog_name))
+
+    return fingerprint
+
+# end function: get_fingerprint
+
+# -----------------------------------------------------------------
+
+def get_cached_sizes(prog_name, prob_sizes) :
+    """ Find which problem sizes already have a valid (or a stale, or a failed) timing in the database
+
+        In:  prog_name    - name of the program (string)
+             prob_sizes   - problem sizes (list of integers)
+        Out: cached_sizes - problem sizes whose stored timing was generated by the program
+                            as it is now (same fingerprint), and didn't fail (set of integers)
+             stale_sizes  - problem sizes whose stored timing was generated by a different
+                            executable or arguments, or is from before fingerprints were
+                            stored (set of integers)
+             failed_sizes - problem sizes whose stored timing (of the program as it is now)
+                            failed, e.g. "timeout" (set of integers)
+
+        Problem sizes in none of the sets have no timing. Stale and failed timings are
+        always replaced when generated again, whatever the "on_conflict" setting.
+    """
+
+    fingerprint = get_fingerprint(prog_name)
+
+    cached_sizes = set()
+    stale_sizes  = set()
+    failed_sizes = set()
+    for [prob_size, [stored_fingerprint, status]] in db.get_timing_fingerprints(prog_name, prob_sizes).items() :
+        if stored_fingerprint != fingerprint :
+            stale_sizes.add(prob_size)
+        elif status != "ok" :
+            failed_sizes.add(prob_size)
+        else :
+            cached_sizes.add(prob_size)
+
+    return [cached_sizes, stale_sizes, failed_sizes]
+
+# end function: get_cached_sizes
+
+# -----------------------------------------------------------------
+
 def delete_program_timings(prog_name) :
     """ Delete all of a program's timings
 
@@ -201,17 +868,23 @@ def delete_program_timings(prog_name) :
 
 # -----------------------------------------------------------------
 
-def add_timing(prog_name, prob_size, timing) :
+def add_timing(prog_name, prob_size, timing, samples=None, on_conflict="skip") :
 
     """ Add a program's timing to the database
 
-        In:  prog_name - name of the program getting timings for (string)
-             prob_size - problem size (integer)
-             timing    - timing for problem size (float)
-        Out: nothing
+        In:  prog_name   - name of the program getting timings for (string)
+             prob_size   - problem size (integer)
+             timing      - timing for problem size (float)
+             samples     - info about each measured run that generated the timing
+                           (list of dictionaries, see run_trials())
+                           (None for a manually entered timing)
+             on_conflict - "skip", "replace" or "merge" an existing timing for the problem size (string)
+        Out: stored      - was the timing stored? (boolean)
     """
 
-    db.add_timing(prog_name, prob_size, timing)
+    stored = db.add_timing(prog_name, prob_size, timing, samples, on_conflict)
+
+    return stored
 
 # end function: add_timing
 
@@ -221,43 +894,1029 @@ def generate_timing(prog_name, prob_size) :
 
         In:  prog_name - name of the program getting timings for (string)
              prob_size - problem size (integer)
-        Out: timing    - timing for problem size (float)
+        Out: timing    - timing for problem size (float, None if a run failed)
+             samples   - info about each measured run (list of dictionaries, see run_trials())
     """
 
     cmd_line_prefix = db.get_cmd_line_prefix(prog_name)
+    program_type    = db.get_program_type(prog_name)
 
-    # prepare OS command-line style command that Python will use
-    # to call the external program
-    command_line = "./" + cmd_line_prefix + " " + str(prob_size)
+    [timing, samples] = run_trials(cmd_line_prefix, prob_size, settings, program_type)
 
-    # call the external program; it is assumed that the external program
-    # outputs only the timing in the first line of its console output
-    retvalue = os.popen(command_line).readlines()
-    timing   = float(retvalue[0].strip())
-    
-    return timing
+    return [timing, samples]
 
 # end function: generate_timing
 
 # -----------------------------------------------------------------
 
+def run_program(cmd_line_prefix, prob_size, run_settings, program_type="executable") :
+    """ Run an external program for a problem size and get its timing
+
+        In:  cmd_line_prefix - the program's command line prefix (string)
+             prob_size       - problem size (integer)
+             run_settings    - the application settings to run with (dictionary)
+             program_type    - type of the program (string, see runner.program_types)
+        Out: timing          - timing for problem size, chosen by the "timing_source" setting (float)
+                               (None if the run failed)
+             run_info        - info about the run (dictionary, see runner.run_program())
+                               ("status" is "bad_output" when the program's own timing is used,
+                                but it didn't output one)
+
+        Does not use the database, so it can be run in worker processes
+        (the settings are passed in since worker processes don't share this module's settings)
+
+        A Python (or shared library) program is called in this process (see runner.run_python_program()
+        and runner.run_library_program())
+    """
+
+    [timeout, memory_limit, cpu_limit, cpus] = get_run_limits(run_settings)
+
+    if program_type == "python" :
+        run_info = runner.run_python_program(cmd_line_prefix, prob_size, run_settings["min_loop_time"], cpus)
+    elif program_type == "library" :
+        run_info = runner.run_library_program(cmd_line_prefix, prob_size, run_settings["min_loop_time"], cpus)
+    else :
+        run_info = runner.run_program(cmd_line_prefix, prob_size, timeout, memory_limit, cpu_limit, cpus,
+                                      run_settings["launch_mode"] == "launcher", run_settings["result_channel_size"])
+
+    timing = get_run_timing(run_info, run_settings)
+
+    return [timing, run_info]
+
+# end function: run_program
+
+# -----------------------------------------------------------------
+
+async def run_program_async(cmd_line_prefix, prob_size, run_settings, program_type="executable") :
+    """ Run an external program for a problem size and get its timing (asyncio engine)
+
+        In:  (same as run_program())
+        Out: (same as run_program(); see runner.run_program_async() for the run info)
+
+        A Python (or shared library) program is called in the event loop's thread, so it holds
+        up the other runs while it runs (its own timing isn't affected)
+    """
+
+    [timeout, memory_limit, cpu_limit, cpus] = get_run_limits(run_settings)
+
+    if program_type == "python" :
+        run_info = runner.run_python_program(cmd_line_prefix, prob_size, run_settings["min_loop_time"], cpus)
+    elif program_type == "library" :
+        run_info = runner.run_library_program(cmd_line_prefix, prob_size, run_settings["min_loop_time"], cpus)
+    else :
+        run_info = await runner.run_program_async(cmd_line_prefix, prob_size, timeout, memory_limit, cpu_limit, cpus,
+                                                  run_settings["launch_mode"] == "launcher",
+                                                  run_settings["result_channel_size"])
+
+    timing = get_run_timing(run_info, run_settings)
+
+    return [timing, run_info]
+
+# end function: run_program_async
+
+# -----------------------------------------------------------------
+
+def get_run_limits(run_settings) :
+    """ Get the limits of a run of an external program from the settings
+
+        In:  run_settings - the application settings to run with (dictionary)
+        Out: timeout      - most wall clock seconds of the run (float, None for no timeout)
+             memory_limit - most address space of the program (integer, bytes, None for no limit)
+             cpu_limit    - most CPU seconds of the program (integer, None for no limit)
+             cpus         - cores the program runs on (set of integers, None for any core)
+    """
+
+    # a setting of 0 is no limit
+    timeout      = run_settings["run_timeout"] if run_settings["run_timeout"] > 0 else None
+    memory_limit = run_settings["memory_limit"] * 1024 * 1024 if run_settings["memory_limit"] > 0 else None
+    cpu_limit    = run_settings["cpu_limit"] if run_settings["cpu_limit"] > 0 else None
+    cpus         = set(runner.parse_cpu_list(run_settings["cpu_affinity"])) if run_settings["cpu_affinity"] != "" else None
+
+    return [timeout, memory_limit, cpu_limit, cpus]
+
+# end function: get_run_limits
+
+# -----------------------------------------------------------------
+
+def get_run_timing(run_info, run_settings) :
+    """ Get a run's timing, chosen by the "timing_source" setting
+
+        In:  run_info     - info about the run (dictionary, see runner.run_program())
+             run_settings - the application settings to run with (dictionary)
+        Out: timing       - the run's timing (float, None if the run failed)
+                            (run_info's "status" is set to "bad_output" when the chosen timing
+                             is missing, e.g. the program didn't output its own timing)
+    """
+
+    timing_source = run_settings["timing_source"]
+    if timing_source == "wall" :
+        timing = run_info["wall_time"]
+    elif timing_source == "cpu" :
+        # (no CPU times when the run's launcher was killed, e.g. by the timeout)
+        timing = run_info["user_time"] + run_info["sys_time"] if run_info["user_time"] is not None else None
+    else :
+        # the timing output by the program itself
+        timing = run_info["program_timing"]
+
+    # (e.g. a sweep program's measurement without the timing)
+    if timing is None and run_info["status"] == "ok" :
+        run_info["status"] = "bad_output"
+
+    if run_info["status"] != "ok" :
+        timing = None
+
+    return timing
+
+# end function: get_run_timing
+
+# -----------------------------------------------------------------
+
+def run_trials(cmd_line_prefix, prob_size, run_settings, program_type="executable") :
+    """ Run an external program's warmup runs and trials for a problem size
+
+        In:  cmd_line_prefix - the program's command line prefix (string)
+             prob_size       - problem size (integer)
+             run_settings    - the application settings to run with (dictionary)
+             program_type    - type of the program (string, see runner.program_types)
+        Out: timing          - median of the trials' (non-outlier) timings (float)
+                               (None if a run failed)
+             samples         - info about each trial (list of dictionaries)
+                                  - see runner.run_program() for the run info
+                                  - "trial"   - trial # (integer, starting at 1; 0 for a failed warmup run)
+                                  - "timing"  - the trial's timing (float, None if the run failed)
+                                  - "outlier" - was the trial's timing filtered out? (boolean)
+
+        The problem size's runs stop at its first failed run (e.g. a timeout),
+        since the runs after it would most likely fail the same way
+
+        Does not use the database, so it can be run in worker processes
+
+        A sweep program does the problem size's warmup runs and trials in one run
+        (see run_sweep_trials())
+    """
+
+    if program_type == "sweep" :
+        [[prob_size, timing, samples]] = list(run_sweep_trials(cmd_line_prefix, [prob_size], run_settings))
+        return [timing, samples]
+
+    # warmup runs are not measured (e.g. to get the program into the file cache)
+    for k in range(0, run_settings["warmup_runs"]) :
+        [timing, run_info] = run_program(cmd_line_prefix, prob_size, run_settings, program_type)
+        if run_info["status"] != "ok" :
+            return get_failed_warmup(run_info)
+
+    start_time = time.perf_counter()
+
+    samples = []
+    while 1 :
+        [timing, run_info] = run_program(cmd_line_prefix, prob_size, run_settings, program_type)
+        [done, timing] = add_trial(samples, timing, run_info, start_time, run_settings)
+        if done :
+            return [timing, samples]
+
+# end function: run_trials
+
+# -----------------------------------------------------------------
+
+async def run_trials_async(cmd_line_prefix, prob_size, run_settings, program_type="executable") :
+    """ Run an external program's warmup runs and trials for a problem size (asyncio engine)
+
+        In:  (same as run_trials())
+        Out: (same as run_trials())
+    """
+
+    # warmup runs are not measured (e.g. to get the program into the file cache)
+    for k in range(0, run_settings["warmup_runs"]) :
+        [timing, run_info] = await run_program_async(cmd_line_prefix, prob_size, run_settings, program_type)
+        if run_info["status"] != "ok" :
+            return get_failed_warmup(run_info)
+
+    start_time = time.perf_counter()
+
+    samples = []
+    while 1 :
+        [timing, run_info] = await run_program_async(cmd_line_prefix, prob_size, run_settings, program_type)
+        [done, timing] = add_trial(samples, timing, run_info, start_time, run_settings)
+        if done :
+            return [timing, samples]
+
+# end function: run_trials_async
+
+# -----------------------------------------------------------------
+
+def run_sweep_trials(cmd_line_prefix, prob_sizes, run_settings) :
+    """ Run a sweep program's warmup runs and trials for several problem sizes, in as few
+        runs of the program as possible
+
+        In:  cmd_line_prefix - the program's command line prefix (string)
+             prob_sizes      - problem sizes, in the order they are measured (list)
+             run_settings    - the application settings to run with (dictionary)
+        Out: yields [prob_size, timing, samples] for each problem size as soon as the
+             program has reported all of its trials (or failed) (same as run_trials())
+
+        The program does the "warmup_runs" and "trials" settings' runs of every problem
+        size (the "fixed" repetition mode) and reports each trial as it goes, so its
+        start-up and data initialization are only done once (see runner.run_sweep_program()).
+        If it fails, the problem size it failed on gets the failed run as its last sample,
+        and the program is run again for the problem sizes it hadn't finished.
+
+        Does not use the database
+    """
+
+    [timeout, memory_limit, cpu_limit, cpus] = get_run_limits(run_settings)
+
+    # each run of the program finishes (or fails) at least one problem size
+    prob_sizes = list(dict.fromkeys(prob_sizes))
+    while len(prob_sizes) > 0 :
+        samples = {prob_size : [] for prob_size in prob_sizes}
+        start_time = time.perf_counter()
+
+        for [prob_size, run_info] in runner.run_sweep_program(cmd_line_prefix, prob_sizes, run_settings["trials"],
+                                                              run_settings["warmup_runs"], timeout, memory_limit,
+                                                              cpu_limit, cpus) :
+            # (a problem size that already failed, e.g. a trial without the timing)
+            if prob_size not in prob_sizes :
+                continue
+
+            timing = get_run_timing(run_info, run_settings)
+            [done, timing] = add_trial(samples[prob_size], timing, run_info, start_time,
+                                       dict(run_settings, repetition_mode="fixed"))
+            if done :
+                prob_sizes.remove(prob_size)
+                yield [prob_size, timing, samples[prob_size]]
+
+# end function: run_sweep_trials
+
+# -----------------------------------------------------------------
+
+def get_failed_warmup(run_info) :
+    """ Get the result of a problem size whose warmup run failed
+
+        In:  run_info - info about the failed warmup run (dictionary)
+        Out: timing   - None (no timing)
+             samples  - the warmup run as the only sample (trial # 0) (list of dictionaries)
+    """
+
+    run_info["trial"]   = 0
+    run_info["timing"]  = None
+    run_info["outlier"] = False
+
+    return [None, [run_info]]
+
+# end function: get_failed_warmup
+
+# -----------------------------------------------------------------
+
+def add_trial(samples, timing, run_info, start_time, run_settings) :
+    """ Add a trial to a problem size's samples and check whether its trials are done
+
+        In:  samples      - the problem size's trials so far (list of dictionaries, appended to)
+             timing       - the new trial's timing (float, None if the run failed)
+             run_info     - info about the new trial's run (dictionary)
+             start_time   - time.perf_counter() when the trials started (float)
+             run_settings - the application settings to run with (dictionary)
+        Out: done         - are the problem size's trials done? (boolean)
+             timing       - median of the trials' (non-outlier) timings (float)
+                            (None if the trials aren't done, or a run failed)
+
+        When done, every sample's "outlier" is set
+    """
+
+    run_info["trial"]  = len(samples) + 1
+    run_info["timing"] = timing
+    samples.append(run_info)
+    trial = len(samples)
+
+    if run_info["status"] != "ok" :
+        for sample in samples :
+            sample["outlier"] = False
+        return [True, None]
+
+    timings  = [sample["timing"] for sample in samples]
+    outliers = timing_stats.filter_outliers(timings, run_settings["outlier_filter"])
+    kept_timings = [timings[k] for k in range(0, len(timings)) if not outliers[k]]
+
+    if run_settings["repetition_mode"] != "adaptive" :
+        done = (trial >= run_settings["trials"])
+    else :
+        # adaptive: stop as soon as the median is known well enough ...
+        done = False
+        if trial >= run_settings["min_trials"] :
+            [ci_low, ci_high] = timing_stats.median_ci(kept_timings, run_settings["confidence"])
+            median = statistics.median(kept_timings)
+            done = (ci_high - ci_low <= run_settings["ci_target"] * abs(median))
+
+        # ... or when the problem size's repetition or time budget runs out
+        if trial >= run_settings["max_trials"] or time.perf_counter() - start_time >= run_settings["time_budget"] :
+            done = True
+
+    if not done :
+        return [False, None]
+
+    for k in range(0, len(samples)) :
+        samples[k]["outlier"] = outliers[k]
+
+    return [True, statistics.median(kept_timings)]
+
+# end function: add_trial
+
+# -----------------------------------------------------------------
+
 def generate_and_add_timing(prog_name, prob_size) :
     """ Generate and add a program's timing to the database
 
         In:  prog_name - name of the program getting timings for (string)
              prob_size - problem size (integer)
-        Out: timing    - timing for problem size (float)
+        Out: timing    - timing for problem size (float, None if a run failed)
     """
-    
-    timing = generate_timing(prog_name, prob_size)
-    add_timing(prog_name, prob_size, timing)
+
+    [timing, samples] = generate_timing(prog_name, prob_size)
+    add_timing(prog_name, prob_size, timing, samples, settings["on_conflict"])
 
     return timing
-    
+
 # end function: generate_and_add_timing
 
 # -----------------------------------------------------------------
 
+def generate_and_add_timings(prog_name, prob_sizes, sweep_id=None) :
+    """ Generate and add a program's timings for several problem sizes to the database,
+        running up to settings["num_workers"] external programs at the same time
+
+        In:  prog_name  - name of the program getting timings for (string)
+             prob_sizes - problem sizes (list)
+             sweep_id   - id of the sweep being run (integer, None if not a recorded sweep,
+                          see run_sweep())
+        Out: yields [prob_size, timing, status] for each problem size as soon as its
+             timing has been generated and queued for the database writer
+             (not necessarily in the order of prob_sizes)
+             (a failed problem size's timing is None; status is e.g. "timeout")
+
+        The runs are done in the "run_order" setting's order (see get_run_units()),
+        each pinned to its own share of the "cpu_affinity" setting's cores
+
+        Timings are added to the database in batches by a db.TimingWriter;
+        every generated timing is in the database once this generator finishes
+        (or is stopped early, e.g. by Ctrl-C)
+
+        With the "asyncio" engine setting, generate_and_add_timings_async() does the work
+        (and generate_and_add_sweep_timings() for a sweep program)
+    """
+
+    if db.get_program_type(prog_name) == "sweep" :
+        yield from generate_and_add_sweep_timings(prog_name, prob_sizes, sweep_id)
+        return
+
+    if settings["engine"] == "asyncio" :
+        yield from iterate_async(generate_and_add_timings_async(prog_name, prob_sizes, sweep_id))
+        return
+
+    cmd_line_prefix = db.get_cmd_line_prefix(prog_name)
+    program_type    = db.get_program_type(prog_name)
+
+    [run_units, unit_results] = get_run_units(prob_sizes, settings)
+
+    num_workers = min(settings["num_workers"], len(run_units))
+
+    # cores of each program running at the same time (the free ones)
+    cpu_affinities = get_cpu_affinities(settings, max(1, num_workers))
+
+    writer = db.TimingWriter(settings["commit_batch_size"], settings["commit_interval"], sweep_id)
+    executor = None
+    try :
+        # no need for a process pool when only one program runs at a time
+        if num_workers <= 1 :
+            for [prob_size, trial, unit_settings] in run_units :
+                if not start_run_unit(unit_results, prob_size, sweep_id) :
+                    continue
+                [timing, samples] = run_trials(cmd_line_prefix, prob_size, dict(unit_settings, cpu_affinity=cpu_affinities[0]), program_type)
+                result = finish_run_unit(unit_results, prob_size, trial, timing, samples, settings)
+                if result is not None :
+                    [timing, samples] = result
+                    writer.put(prog_name, prob_size, timing, samples, settings["on_conflict"])
+                    yield [prob_size, timing, timing_stats.get_samples_status(samples)]
+            return
+
+        # worker processes only run the external programs; the database is
+        # only written to from this process, as each timing comes back
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=num_workers)
+
+        # a run unit is handed to a worker process when one is free (so a problem size
+        # is only marked running in its sweep when its runs actually start), along
+        # with the cores freed by the last finished run unit
+        next_run_units = iter(run_units)
+        futures = {}
+        while 1 :
+            while len(futures) < num_workers :
+                run_unit = next(next_run_units, None)
+                if run_unit is None :
+                    break
+                [prob_size, trial, unit_settings] = run_unit
+                if start_run_unit(unit_results, prob_size, sweep_id) :
+                    cpu_affinity = cpu_affinities.pop()
+                    future = executor.submit(run_trials, cmd_line_prefix, prob_size, dict(unit_settings, cpu_affinity=cpu_affinity),
+                                             program_type)
+                    futures[future] = [prob_size, trial, cpu_affinity]
+
+            if len(futures) == 0 :
+                break
+
+            [done, not_done] = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done :
+                [prob_size, trial, cpu_affinity] = futures.pop(future)
+                cpu_affinities.append(cpu_affinity)
+                [timing, samples] = future.result()
+                result = finish_run_unit(unit_results, prob_size, trial, timing, samples, settings)
+                if result is not None :
+                    [timing, samples] = result
+                    writer.put(prog_name, prob_size, timing, samples, settings["on_conflict"])
+                    yield [prob_size, timing, timing_stats.get_samples_status(samples)]
+
+    finally :
+        # don't start problem sizes that haven't started yet if stopped early (e.g. Ctrl-C)
+        if executor is not None :
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        # write the finished timings that are still queued
+        writer.close()
+
+# end function: generate_and_add_timings
+
+# -----------------------------------------------------------------
+
+async def generate_and_add_timings_async(prog_name, prob_sizes, sweep_id=None) :
+    """ Generate and add a program's timings for several problem sizes to the database,
+        running up to settings["async_concurrency"] external programs at the same time
+        in this thread's asyncio event loop
+
+        In:  prog_name  - name of the program getting timings for (string)
+             prob_sizes - problem sizes (list)
+             sweep_id   - id of the sweep being run (integer, None if not a recorded sweep)
+        Out: async iterator of [prob_size, timing, status] for each problem size as soon as
+             its timing has been generated and queued for the database writer
+             (the same as generate_and_add_timings())
+
+        No worker thread or process is used per run: each run's program is started
+        with asyncio, and waited on (its output read) by the event loop, so dozens of
+        programs that mostly wait can be in flight at once
+    """
+
+    cmd_line_prefix = db.get_cmd_line_prefix(prog_name)
+    program_type    = db.get_program_type(prog_name)
+
+    [run_units, unit_results] = get_run_units(prob_sizes, settings)
+
+    # limits the # of run units in flight (they start in run_units' order)
+    semaphore = asyncio.Semaphore(settings["async_concurrency"])
+
+    # cores of each program running at the same time (the free ones)
+    cpu_affinities = get_cpu_affinities(settings, settings["async_concurrency"])
+
+    async def run_unit(prob_size, trial, unit_settings) :
+        async with semaphore :
+            if not start_run_unit(unit_results, prob_size, sweep_id) :
+                return None
+            cpu_affinity = cpu_affinities.pop()
+            try :
+                [timing, samples] = await run_trials_async(cmd_line_prefix, prob_size, dict(unit_settings, cpu_affinity=cpu_affinity),
+                                                             program_type)
+            finally :
+                cpu_affinities.append(cpu_affinity)
+        return [prob_size, trial, timing, samples]
+
+    writer = db.TimingWriter(settings["commit_batch_size"], settings["commit_interval"], sweep_id)
+    tasks = [asyncio.ensure_future(run_unit(prob_size, trial, unit_settings)) for [prob_size, trial, unit_settings] in run_units]
+    try :
+        for next_done in asyncio.as_completed(tasks) :
+            unit_result = await next_done
+            if unit_result is None :   # skipped: an earlier trial of its problem size failed
+                continue
+            [prob_size, trial, timing, samples] = unit_result
+            result = finish_run_unit(unit_results, prob_size, trial, timing, samples, settings)
+            if result is not None :
+                [timing, samples] = result
+                writer.put(prog_name, prob_size, timing, samples, settings["on_conflict"])
+                yield [prob_size, timing, timing_stats.get_samples_status(samples)]
+
+    finally :
+        # stopped early (e.g. Ctrl-C): the runs still in flight kill their programs
+        for task in tasks :
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # write the finished timings that are still queued
+        writer.close()
+
+# end function: generate_and_add_timings_async
+
+# -----------------------------------------------------------------
+
+def generate_and_add_sweep_timings(prog_name, prob_sizes, sweep_id=None) :
+    """ Generate and add a sweep program's timings for several problem sizes to the database,
+        measuring them all in one run of the program
+
+        In:  prog_name  - name of the sweep program getting timings for (string)
+             prob_sizes - problem sizes (list)
+             sweep_id   - id of the sweep being run (integer, None if not a recorded sweep)
+        Out: yields [prob_size, timing, status] for each problem size as soon as its
+             timing has been generated and queued for the database writer
+             (the same as generate_and_add_timings())
+
+        The problem sizes are given to the program in the "run_order" setting's order
+        ("interleaved" is the same as "shuffled": the program does each problem size's
+        trials one after another), pinned to the "cpu_affinity" setting's cores. The
+        "num_workers" and "engine" settings don't apply (the program is run once).
+    """
+
+    cmd_line_prefix = db.get_cmd_line_prefix(prog_name)
+
+    # (one run unit per problem size: the program does all of its trials)
+    [run_units, unit_results] = get_run_units(prob_sizes, dict(settings, trials=1))
+    prob_sizes = [prob_size for [prob_size, trial, unit_settings] in run_units]
+
+    # the program's measurements stream in, so all of its problem sizes are running
+    for prob_size in prob_sizes :
+        start_run_unit(unit_results, prob_size, sweep_id)
+
+    writer = db.TimingWriter(settings["commit_batch_size"], settings["commit_interval"], sweep_id)
+    try :
+        for [prob_size, timing, samples] in run_sweep_trials(cmd_line_prefix, prob_sizes, settings) :
+            writer.put(prog_name, prob_size, timing, samples, settings["on_conflict"])
+            yield [prob_size, timing, timing_stats.get_samples_status(samples)]
+
+    finally :
+        # write the finished timings that are still queued
+        writer.close()
+
+# end function: generate_and_add_sweep_timings
+
+# -----------------------------------------------------------------
+
+def get_run_units(prob_sizes, run_settings) :
+    """ Get the run units of generating timings for several problem sizes, in the order
+        they are run (the "run_order" setting)
+
+        In:  prob_sizes   - problem sizes (list)
+             run_settings - the application settings to run with (dictionary)
+        Out: run_units    - what to run (list of [prob_size, trial, unit_settings]):
+                               trial         - trial # (integer; None when the unit runs all of
+                                               the problem size's trials)
+                               unit_settings - the settings the unit's run_trials() runs with
+                                               (dictionary)
+             unit_results - each problem size's progress (dictionary: problem size -> dictionary,
+                            see start_run_unit() and finish_run_unit())
+
+        "interleaved" only splits a problem size's trials into separate run units with
+        the "fixed" repetition mode (adaptive trials depend on the trials before them);
+        otherwise it is the same as "shuffled"
+    """
+
+    # a seed of 0 is a different order every time
+    rng = random.Random(run_settings["shuffle_seed"] if run_settings["shuffle_seed"] != 0 else None)
+
+    prob_sizes = list(prob_sizes)
+    if run_settings["run_order"] != "given" :
+        rng.shuffle(prob_sizes)
+
+    if run_settings["run_order"] == "interleaved" and run_settings["repetition_mode"] == "fixed" and \
+       run_settings["trials"] > 1 :
+        # each unit runs one trial; the warmup runs are only done in the first round
+        first_round_settings = dict(run_settings, trials=1)
+        later_round_settings = dict(run_settings, trials=1, warmup_runs=0)
+        run_units = []
+        for trial in range(1, run_settings["trials"] + 1) :
+            if trial > 1 :
+                rng.shuffle(prob_sizes)
+            unit_settings = first_round_settings if trial == 1 else later_round_settings
+            run_units += [ [prob_size, trial, unit_settings] for prob_size in prob_sizes ]
+        num_units = run_settings["trials"]
+    else :
+        run_units = [ [prob_size, None, run_settings] for prob_size in prob_sizes ]
+        num_units = 1
+
+    unit_results = {}
+    for prob_size in prob_sizes :
+        unit_results[prob_size] = {"num_units" : num_units, "started" : 0, "finished" : 0,
+                                   "trials" : [], "failed" : False}
+
+    return [run_units, unit_results]
+
+# end function: get_run_units
+
+# -----------------------------------------------------------------
+
+def start_run_unit(unit_results, prob_size, sweep_id) :
+    """ Check whether a problem size's run unit should start, and count it as started
+
+        In:  unit_results - each problem size's progress (dictionary, see get_run_units())
+             prob_size    - problem size (integer)
+             sweep_id     - id of the sweep being run (integer, None if not a recorded sweep)
+        Out: start        - should the run unit start? (boolean)
+                            (False if an earlier trial of the problem size failed)
+    """
+
+    progress = unit_results[prob_size]
+
+    # a problem size's runs stop at its first failed run (see run_trials())
+    if progress["failed"] :
+        return False
+
+    if progress["started"] == 0 and sweep_id is not None :
+        db.set_sweep_size_running(sweep_id, prob_size)
+
+    progress["started"] += 1
+
+    return True
+
+# end function: start_run_unit
+
+# -----------------------------------------------------------------
+
+def finish_run_unit(unit_results, prob_size, trial, timing, samples, run_settings) :
+    """ Add a finished run unit's result to its problem size's, and check whether the
+        problem size is done
+
+        In:  unit_results - each problem size's progress (dictionary, see get_run_units())
+             prob_size    - problem size (integer)
+             trial        - the run unit's trial # (integer, None for all trials)
+             timing       - the run unit's timing (float, None if a run failed)
+             samples      - info about each of the run unit's runs (list of dictionaries)
+             run_settings - the application settings to run with (dictionary)
+        Out: result       - the problem size's [timing, samples] once it is done (None until then)
+
+        A problem size is done when all of its run units are, or when a run unit
+        failed and the ones that had already started are done
+    """
+
+    if trial is None :
+        return [timing, samples]
+
+    progress = unit_results[prob_size]
+    progress["finished"] += 1
+    progress["trials"].append([trial, samples])
+    if timing_stats.get_samples_status(samples) != "ok" :
+        progress["failed"] = True
+
+    if progress["finished"] < progress["started"] or \
+       (progress["started"] < progress["num_units"] and not progress["failed"]) :
+        return None
+
+    return timing_stats.combine_trials(progress["trials"], run_settings["outlier_filter"])
+
+# end function: finish_run_unit
+
+# -----------------------------------------------------------------
+
+def get_cpu_affinities(run_settings, num_slots) :
+    """ Get the cores of each of the external programs running at the same time
+
+        In:  run_settings   - the application settings to run with (dictionary)
+             num_slots      - # of programs running at the same time (integer)
+        Out: cpu_affinities - each program's cores (list of "cpu_affinity" setting values)
+                              (all "" (any core) when the "cpu_affinity" setting is "")
+    """
+
+    if run_settings["cpu_affinity"] == "" :
+        return [""] * num_slots
+
+    cpus = runner.parse_cpu_list(run_settings["cpu_affinity"])
+
+    return [runner.format_cpu_list(slot) for slot in runner.get_cpu_slots(cpus, num_slots)]
+
+# end function: get_cpu_affinities
+
+# -----------------------------------------------------------------
+
+def iterate_async(async_iterator) :
+    """ Iterate over an async iterator from ordinary (non-async) code
+
+        In:  async_iterator - the async iterator (e.g. generate_and_add_timings_async(...))
+        Out: yields each item of the async iterator
+
+        A new event loop runs until the next item is ready; the async iterator
+        is closed (and the loop with it) when this generator is closed or stopped
+        by an exception (e.g. Ctrl-C)
+
+        If stopped (e.g. Ctrl-C or SIGTERM) while the loop runs, the async iterator's
+        pending step is cancelled, so that it cleans up (its finally blocks run)
+        before the exception is passed on
+    """
+
+    async def get_next_item() :
+        return await async_iterator.__anext__()
+
+    loop = asyncio.new_event_loop()
+    try :
+        while 1 :
+            task = loop.create_task(get_next_item())
+            try :
+                item = loop.run_until_complete(task)
+            except StopAsyncIteration :
+                return
+            except BaseException :
+                # (the async iterator can't be closed while its step is still pending)
+                if not task.done() :
+                    task.cancel()
+                    try :
+                        loop.run_until_complete(task)
+                    except BaseException :
+                        pass
+                raise
+            yield item
+
+    finally :
+        loop.run_until_complete(async_iterator.aclose())
+        loop.close()
+
+# end function: iterate_async
+
+# -----------------------------------------------------------------
+
+def plan_sweep(prog_name, prob_sizes) :
+    """ Record a sweep of a program's problem sizes in the database, to be run by run_sweep()
+
+        In:  prog_name  - name of the program getting timings for (string)
+             prob_sizes - problem sizes, in the order they are run (list)
+        Out: sweep_id   - id of the sweep (integer)
+
+        The sweep runs with the current settings, also when it is resumed
+    """
+
+    sweep_id = db.add_sweep(prog_name, prob_sizes, settings)
+
+    return sweep_id
+
+# end function: plan_sweep
+
+# -----------------------------------------------------------------
+
+def run_sweep(sweep_id) :
+    """ Run (or resume) a recorded sweep: generate and add the timings of its problem sizes
+        that aren't done yet
+
+        In:  sweep_id - id of the sweep (integer, see plan_sweep())
+        Out: yields [prob_size, timing, status] for each problem size as soon as its timing
+             has been generated (see generate_and_add_timings())
+
+        The sweep runs with the settings it was planned with, except host_settings (the
+        resuming computer's own). It is recorded as "done" once all of its problem sizes
+        are, or as "interrupted" if stopped early (e.g. Ctrl-C); a sweep whose process died
+        is still recorded as "running". Either way, resuming it only reruns the problem
+        sizes whose timings weren't stored.
+
+        Raises ValueError if there is no such sweep
+    """
+
+    [prog_name, sweep_settings, state, prob_sizes] = db.get_sweep(sweep_id)
+    if prog_name == "" :
+        raise ValueError("there is no sweep {}".format(sweep_id))
+
+    old_settings = dict(settings)
+    settings.update(sweep_settings)
+    for name in host_settings :
+        settings[name] = old_settings[name]
+
+    db.set_sweep_state(sweep_id, "running")
+    state = "interrupted"
+    try :
+        yield from generate_and_add_timings(prog_name, prob_sizes, sweep_id)
+        state = "done"
+    finally :
+        db.set_sweep_state(sweep_id, state)
+        settings.update(old_settings)
+
+# end function: run_sweep
+
+# -----------------------------------------------------------------
+
+def get_sweep(sweep_id) :
+    """ Get a recorded sweep's program, state, and the problem sizes it still has to run
+
+        In:  sweep_id   - id of the sweep (integer)
+        Out: prog_name  - name of the program (string, "" if there is no such sweep)
+             state      - the sweep's state (string: "running", "interrupted" or "done")
+             prob_sizes - problem sizes that aren't done, in the planned order (list of integers)
+    """
+
+    [prog_name, sweep_settings, state, prob_sizes] = db.get_sweep(sweep_id)
+
+    return [prog_name, state, prob_sizes]
+
+# end function: get_sweep
+
+# -----------------------------------------------------------------
+
+def get_unfinished_sweeps() :
+    """ Get the recorded sweeps that aren't done (they can be resumed with run_sweep())
+
+        In:  nothing
+        Out: sweeps - each sweep's [sweep_id, prog_name, state, started, num_sizes, num_done]
+                      (list of lists, see db.get_unfinished_sweeps())
+    """
+
+    sweeps = db.get_unfinished_sweeps()
+
+    return sweeps
+
+# end function: get_unfinished_sweeps
+
+# -----------------------------------------------------------------
+
+def enqueue_timings(prog_name, prob_sizes) :
+    """ Queue a program's problem sizes as jobs for worker processes (see worker.py),
+        instead of running them here
+
+        In:  prog_name  - name of the program getting timings for (string)
+             prob_sizes - problem sizes (list)
+        Out: batch_id   - id of the queued batch of jobs (integer)
+             num_jobs   - # of jobs queued (integer)
+
+        The jobs run with the current settings. With the "fixed" repetition mode each
+        trial is its own job (so a problem size's trials can run on different workers,
+        each doing the warmup runs first); with "adaptive" repetition a job runs all
+        of a problem size's trials.
+    """
+
+    run_settings = dict(settings)
+
+    if run_settings["repetition_mode"] == "fixed" and run_settings["trials"] > 1 :
+        trials = list(range(1, run_settings["trials"] + 1))
+        run_settings["trials"] = 1
+    else :
+        trials = [None]
+
+    batch_id = db.enqueue_jobs(prog_name, prob_sizes, trials, run_settings)
+
+    return [batch_id, len(prob_sizes) * len(trials)]
+
+# end function: enqueue_timings
+
+# -----------------------------------------------------------------
+
+def run_queued_job(job) :
+    """ Run a job claimed from the work queue
+
+        In:  job     - the claimed job (dictionary, see db.claim_job())
+        Out: timing  - the job's timing (float, None if a run failed)
+             samples - info about each of the job's runs (list of dictionaries, see run_trials())
+
+        The job runs with the settings it was queued with, except host_settings
+        (and settings that it was queued without, e.g. by an older version),
+        which are this process's settings
+    """
+
+    run_settings = dict(settings)
+    run_settings.update(job["settings"])
+    for name in host_settings :
+        run_settings[name] = settings[name]
+
+    cmd_line_prefix = db.get_cmd_line_prefix(job["program_name"])
+    program_type    = db.get_program_type(job["program_name"])
+
+    [timing, samples] = run_trials(cmd_line_prefix, job["problem_size"], run_settings, program_type)
+
+    return [timing, samples]
+
+# end function: run_queued_job
+
+# -----------------------------------------------------------------
+
+def sweep_timings(prog_name, start_size, growth_factor, total_budget, max_run_time, max_size=None) :
+    """ Generate and add a program's timings for geometrically growing problem sizes
+        until the time budget would be used up
+
+        In:  prog_name     - name of the program getting timings for (string)
+             start_size    - first problem size (integer)
+             growth_factor - each problem size is (up to) this many times the last one (float, > 1)
+             total_budget  - most wall clock seconds for the whole sweep (float)
+             max_run_time  - most wall clock seconds for one run of the program (float)
+             max_size      - largest problem size (integer, None for no limit other than
+                             the largest integer the database can store)
+        Out: yields [prob_size, timing, status] for each problem size as soon as its
+             timing has been generated and queued for the database writer
+             (a failed problem size's timing is None; status is e.g. "timeout")
+
+        The runs measured so far are used to predict the next problem size's run time
+        (see get_next_sweep_size()); the sweep stops when no larger problem size is
+        predicted to fit in the time left or under max_run_time, or at the first failed
+        problem size. The first problem size is always run, since there is nothing yet
+        to predict its run time from. Every run is killed (a "timeout") after max_run_time
+        seconds, or the time left in the budget if that is less, so a problem size whose
+        run time was underestimated can't overrun them.
+
+        Problem sizes are run one at a time (each one's prediction needs the ones
+        before it). Problem sizes already in the database are still run, and are
+        added according to settings["on_conflict"].
+
+        Raises ValueError for an invalid start_size or growth_factor
+    """
+
+    if start_size < 1 :
+        raise ValueError("starting problem size needs to be >= 1")
+    if growth_factor <= 1.0 :
+        raise ValueError("growth factor needs to be > 1")
+
+    # (SQLite integers are 64-bit)
+    if max_size is None :
+        max_size = 2**63 - 1
+
+    cmd_line_prefix = db.get_cmd_line_prefix(prog_name)
+    program_type    = db.get_program_type(prog_name)
+
+    start_time = time.perf_counter()
+
+    # wall clock seconds of one run (warmup run or trial) of each problem size run so far
+    prob_sizes = []
+    run_times  = []
+
+    # most runs of a problem size (adaptive repetition can stop before its upper bound)
+    if settings["repetition_mode"] == "adaptive" :
+        num_runs = settings["warmup_runs"] + settings["max_trials"]
+    else :
+        num_runs = settings["warmup_runs"] + settings["trials"]
+
+    # the sweep's runs are limited by its run time and budget (the "run_timeout" setting
+    # of a copy of the settings, set before each problem size)
+    run_settings = dict(settings)
+
+    writer = db.TimingWriter(settings["commit_batch_size"], settings["commit_interval"])
+    try :
+        prob_size = start_size
+        while 1 :
+            time_left = total_budget - (time.perf_counter() - start_time)
+            if time_left <= 0.0 :
+                return
+
+            run_settings["run_timeout"] = min(max_run_time, time_left)
+            if settings["run_timeout"] > 0 :
+                run_settings["run_timeout"] = min(run_settings["run_timeout"], settings["run_timeout"])
+
+            size_start_time = time.perf_counter()
+            [timing, samples] = run_trials(cmd_line_prefix, prob_size, run_settings, program_type)
+
+            prob_sizes.append(prob_size)
+            run_times.append((time.perf_counter() - size_start_time) / (settings["warmup_runs"] + len(samples)))
+
+            status = timing_stats.get_samples_status(samples)
+            writer.put(prog_name, prob_size, timing, samples, settings["on_conflict"])
+            yield [prob_size, timing, status]
+
+            # larger problem sizes would most likely fail too
+            if status != "ok" :
+                return
+
+            time_left = total_budget - (time.perf_counter() - start_time)
+            prob_size = get_next_sweep_size(prob_sizes, run_times, num_runs, growth_factor, time_left, max_run_time)
+            if prob_size is not None and prob_size > max_size :
+                prob_size = max_size if max_size > prob_sizes[-1] else None
+            if prob_size is None :
+                return
+
+    finally :
+        # write the finished timings that are still queued
+        writer.close()
+
+# end function: sweep_timings
+
+# -----------------------------------------------------------------
+
+def get_next_sweep_size(prob_sizes, run_times, num_runs, growth_factor, time_left, max_run_time) :
+    """ Choose a problem size sweep's next problem size
+
+        In:  prob_sizes    - problem sizes run so far (list of integers, in increasing order)
+             run_times     - wall clock seconds of one run of each problem size (list of floats)
+             num_runs      - most runs (warmup runs and trials) of the next problem size (integer)
+             growth_factor - the next problem size is (up to) this many times the last one (float, > 1)
+             time_left     - wall clock seconds left in the sweep's budget (float)
+             max_run_time  - most wall clock seconds for one run of the program (float)
+        Out: prob_size     - next problem size (integer)
+                             (None if no larger problem size fits)
+
+        When the fully grown problem size is predicted not to fit, the growth is
+        bisected (geometrically, between the last problem size and the grown one)
+        until one fits; the sweep ends instead of growing by less than 1/8 of growth_factor
+
+        Predicted run times are multiplied by settings["sweep_safety_factor"], since
+        the predictions from only a few small problem sizes are rough
+    """
+
+    last_size = prob_sizes[-1]
+    min_size  = max(last_size + 1, math.ceil(last_size * (1.0 + (growth_factor - 1.0) / 8.0)))
+
+    prob_size = max(last_size + 1, round(last_size * growth_factor))
+    while prob_size >= min_size :
+        run_time = settings["sweep_safety_factor"] * analysis.predict_timing(prob_sizes, run_times, prob_size)
+        if run_time <= max_run_time and run_time * num_runs <= time_left :
+            return prob_size
+
+        prob_size = math.floor(math.sqrt(last_size * prob_size))
+
+    return None
+
+# end function: get_next_sweep_size
+
+# -----------------------------------------------------------------
+
 # ===============================================================================================
 #
 #  Initial execution starts here
@@ -265,13 +1924,50 @@ def generate_and_add_timing(prog_name, prob_size) :
 
 if __name__ == "__main__":
 
-    print()
-    print("working dirctory:", os.getcwd())
+    parser = argparse.ArgumentParser(description="Generate/plot execution timings of external programs")
+    parser.add_argument("--batch", metavar="JOB_FILE",
+                        help="run the sweeps in a JSON/TOML job file without the menus "
+                             "(progress printed as JSON lines; see batch.py)")
+    parser.add_argument("--resume", metavar="SWEEP_ID", type=int,
+                        help="resume an interrupted sweep without the menus "
+                             "(progress printed as JSON lines; see batch.py)")
+    parser.add_argument("--worker", action="store_true",
+                        help="run jobs from the database's work queue until stopped "
+                             "(progress printed as JSON lines; see worker.py)")
+    parser.add_argument("--worker-id", metavar="NAME",
+                        help="name of this worker in the work queue (default: host:pid)")
+    parser.add_argument("--exit-when-empty", action="store_true",
+                        help="stop the worker once no jobs are queued or running")
+    parser.add_argument("--shared", action="store_true",
+                        help="the database is shared by processes on several hosts "
+                             "(rollback journal instead of WAL)")
+    args = parser.parse_args()
 
     # database setup info
     db_filename     = 'timings.db'  # database of all programs and their timings
     schema_filename = 'schema.sql'  # setup script for the programs/timings tables in the database
-    
+
+    if args.shared :
+        db.Database.journal_mode = "DELETE"
+
+    if args.batch is not None or args.resume is not None or args.worker :
+        # stdout only has the batch job's (or worker's) JSON lines
+        with contextlib.redirect_stdout(sys.stderr) :
+            db.create_db_connection(db_filename, schema_filename)
+
+        if args.batch is not None :
+            exit_code = batch.run_job(args.batch)
+        elif args.resume is not None :
+            exit_code = batch.resume_sweep(args.resume)
+        else :
+            exit_code = worker.run_worker(args.worker_id, args.exit_when_empty)
+
+        db.close_db()
+        sys.exit(exit_code)
+
+    print()
+    print("working dirctory:", os.getcwd())
+
     db.create_db_connection(db_filename, schema_filename)
 
     # start application's menuing system
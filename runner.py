@@ -0,0 +1,1444 @@
+# runner.py : Runs the external programs of the pycnumanal application and times them
+#
+#    VERSION 1.00
+#
+#    - the external program is executed directly (no shell is started)
+#    - wall clock time is measured in Python (time.perf_counter_ns())
+#    - the program's user/sys CPU times come from os.wait4()'s resource usage
+#    - the timing the program outputs on the first line of its console output
+#      is still parsed, so it can be used next to (or instead of) the Python timings
+#    - a run can be limited (wall clock timeout, memory and CPU time limits); its
+#      outcome (ok, timeout, oom, signal or error) is returned instead of raised
+#    - a run can be pinned to a set of CPU cores (os.sched_setaffinity())
+#    - a run's resource usage (peak memory, page faults, context switches) is returned too;
+#      the program is started by a small launcher process (see launcher.py), so that
+#      its peak memory isn't inflated by this (large) process's memory
+#    - a program can also be a Python function, called in this process (run_python_program()):
+#      it is called in a loop, long enough to be timed precisely (e.g. microsecond kernels)
+#    - or a C function in a shared library, loaded once with ctypes and called the same way
+#      (run_library_program()), with NumPy arrays passed by pointer (no copy)
+#    - or an executable that measures a whole sweep in one run (run_sweep_program()): it is given
+#      all of the problem sizes and the # of trials, and reports each measurement as a line of
+#      JSON, read while it runs
+#    - a program can also report many timings (e.g. each iteration's) through a result channel:
+#      a memory-mapped file of float64 records, named in its environment (PYCNUMANAL_RESULTS),
+#      read back without a copy as a NumPy array once it exits
+#
+#    - runs on Linux (not tested on Windows)
+#    - Python 3.x (not tested with Python 2.x)
+#
+# --------------------------------------------------------
+#
+# Change log:
+#
+#    10/18/2026 (ag)   - created this module to replace the os.popen() call in
+#                        pycnumanal.py ("CHANGE SO THAT TIMINGS DONE IN PYTHON" in ToDo.txt)
+#                      - added get_command_args()
+#                      - added run_program()
+#
+#    10/18/2026 (ag)   - modified run_program() ("experiment what happens when C numerical code
+#                        explodes" in ToDo.txt)
+#                          - added timeout, memory_limit and cpu_limit arguments
+#                          - the program runs in its own session (process group), which is killed
+#                            as a whole when the timeout is hit
+#                          - returns the run's outcome ("status") instead of failing
+#                      - added set_limits() and get_run_status()
+#
+#    10/18/2026 (ag)   - added get_fingerprint(): identifies the executable (content hash, size,
+#                        modification time) and arguments a timing was generated with
+#                      - modified run_program() to return the run's fingerprint
+#
+#    10/18/2026 (ag)   - added run_program_async(): runs an external program with asyncio, so that
+#                        many runs can wait on their programs in one thread
+#                      - added get_preexec_fn(), kill_process_group() and get_program_timing()
+#                        (shared by run_program() and run_program_async())
+#
+#    10/18/2026 (ag)   - added CPU affinity: a program can be pinned to a set of cores
+#                          - added cpus argument to run_program(), run_program_async(),
+#                            get_preexec_fn() and set_limits()
+#                          - added parse_cpu_list(), format_cpu_list() and get_cpu_slots()
+#
+#    10/18/2026 (ag)   - added the run's resource usage (max_rss, minor_faults, major_faults,
+#                        vol_ctx_switches and invol_ctx_switches) to run_program()'s run info
+#                          - added launcher argument to run_program() and run_program_async():
+#                            the program is started by launcher.py, which reports its resource
+#                            usage (so run_program_async() gets the CPU times as well)
+#                          - added get_spawn_args(), read_launcher_report(), get_run_usage()
+#                            and get_rusage_info()
+#
+#    10/18/2026 (ag)   - added Python programs: a "module:function" (or "module:function:setup")
+#                        called in this process (program_types list)
+#                          - added run_python_program(), get_loop_count(), get_python_functions(),
+#                            get_python_module_path() and split_python_target()
+#                          - added program_type argument to get_fingerprint() (a Python program's
+#                            fingerprint is its module file's)
+#                          - added program_exists()
+#
+#    10/18/2026 (ag)   - added shared library programs: a C function in a .so file, called with
+#                        ctypes in this process ("library" in program_types)
+#                          - added run_library_program(), get_library_function(),
+#                            get_library_args() and split_library_target()
+#                          - moved run_python_program()'s timing loop to run_in_process()
+#                            (shared by both in-process program types)
+#
+#    10/18/2026 (ag)   - added sweep programs: an executable that measures several problem sizes
+#                        in one run, reporting a JSON line per measurement ("sweep" in program_types)
+#                          - added run_sweep_program(), get_sweep_command_args() and
+#                            get_sweep_measurement()
+#
+#    10/18/2026 (ag)   - added the result channel: a program can write per-iteration timings to a
+#                        memory-mapped file of float64 records (run_info's "iteration_times")
+#                          - added result_capacity argument to run_program() and run_program_async()
+#                          - added create_result_channel(), read_result_channel() and
+#                            remove_result_channel()
+#
+#    10/18/2026 (ag)   - modified get_library_function(): a recompiled library is loaded from a copy
+#                        of its file (dlopen() kept returning the library loaded before)
+#
+#    10/18/2026 (ag)   - modified run_program() and run_program_async(): the timeout lasts until the
+#                        program has exited (a program that closed its output and kept running
+#                        wasn't killed)
+#
+#    10/18/2026 (ag)   - modified run_program(): an exception while the program runs (e.g. Ctrl-C,
+#                        which doesn't reach the program in its own session) kills and reaps it,
+#                        and closes its launcher report and result channel
+#
+# (ag) agent
+#
+# ---------------------------------------------------------
+
+# standard modules
+import asyncio
+import ctypes
+import errno
+import hashlib
+import importlib
+import importlib.util
+import json
+import mmap
+import os
+import re
+import resource
+import shlex
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import timeit
+import traceback
+import types
+
+# third-party modules
+import numpy as np
+
+# -----------------------------------------------------------------
+
+# content hashes of the executables fingerprinted so far (see get_fingerprint()):
+#    (path, file size, modification time) -> SHA-256 hex digest of the file
+# so that an unchanged executable is only read once per process
+executable_hashes = {}
+
+# the launcher script that starts the programs (see launcher.py), next to this module
+launcher_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "launcher.py")
+
+# resource usage of a run (see get_rusage_info()): name -> [os.wait4() resource usage field, scale]
+#    user_time          - user CPU time (float, seconds)
+#    sys_time           - system CPU time (float, seconds)
+#    max_rss            - peak resident set size (integer, bytes; Linux gives kilobytes)
+#    minor_faults       - page faults served without I/O (integer)
+#    major_faults       - page faults that needed I/O (integer, e.g. paging)
+#    vol_ctx_switches   - voluntary context switches (integer, e.g. waiting for I/O)
+#    invol_ctx_switches - involuntary context switches (integer, e.g. time slice used up)
+rusage_fields = {
+    "user_time"          : ["ru_utime",  1],
+    "sys_time"           : ["ru_stime",  1],
+    "max_rss"            : ["ru_maxrss", 1024],
+    "minor_faults"       : ["ru_minflt", 1],
+    "major_faults"       : ["ru_majflt", 1],
+    "vol_ctx_switches"   : ["ru_nvcsw",  1],
+    "invol_ctx_switches" : ["ru_nivcsw", 1],
+}
+
+# types of programs (the programs table's program_type column)
+#    "executable" - an external executable in the current directory, run with its command line
+#                   prefix and the problem size as its last argument (run_program())
+#    "python"     - a Python function, called in this process with the problem size
+#                   (run_python_program()); its "command line prefix" is "module:function"
+#                   or "module:function:setup"
+#    "library"    - a C function in a shared library (.so) in the current directory, called in
+#                   this process with ctypes (run_library_program()); its "command line prefix"
+#                   is "library:function(argument types)", e.g. "libl2vecnorm.so:l2norm(double*, long)"
+#    "sweep"      - an external executable in the current directory that measures all of a sweep's
+#                   problem sizes in one run (run_sweep_program()), e.g. "l2vecnorm_sweep"
+program_types = ["executable", "python", "library", "sweep"]
+
+# what a sweep program's measurement (a JSON object) can report (see get_sweep_measurement()):
+#    JSON key -> run info key
+#       "time"      - the program's own timing (float, seconds)
+#       "wall_time", "user_time", "sys_time", "max_rss", ... - the measurement's resource usage
+#                     (see rusage_fields; None when not reported)
+# ("size" (the problem size) is required, and "trial" and other keys are ignored)
+sweep_measurement_keys = dict([["time", "program_timing"], ["wall_time", "wall_time"]]
+                              + [[name, name] for name in rusage_fields])
+
+# argument types of a shared library program's function (see split_library_target()):
+#    C type -> ctypes type (integer argument: gets the problem size)
+#              or NumPy dtype (pointer argument: gets an array of problem size elements)
+library_arg_types = {
+    "int"     : ctypes.c_int,
+    "long"    : ctypes.c_long,
+    "size_t"  : ctypes.c_size_t,
+    "double*" : np.float64,
+    "float*"  : np.float32,
+    "int*"    : np.intc,
+    "long*"   : np.int_,
+}
+
+# # of calls of a Python program's function per measurement (see get_loop_count()):
+#    (program's fingerprint, problem size, least seconds of a measurement) -> # of calls
+# so that each of a problem size's trials isn't calibrated again (a changed module is)
+loop_counts = {}
+
+# modification times of the Python programs' modules when they were imported:
+#    module name -> modification time (ns)
+# so that a changed module is reloaded (like a recompiled executable gets used)
+module_mtimes = {}
+
+# shared libraries loaded so far (see get_library_function()):
+#    (path, modification time (ns)) -> ctypes.CDLL
+# so that a library is loaded once (and a recompiled one loaded again: from a copy of its file,
+# since dlopen() returns the already loaded library for the same file name)
+libraries = {}
+
+# result channel of a run (see create_result_channel()): a file of 8 byte records
+#    record 0      - # of timings the program wrote (int64, written by the program)
+#    records 1 ... - the timings (float64, seconds), at most the channel's capacity
+# the environment variables that give the program the file's path and its capacity
+result_channel_env = ["PYCNUMANAL_RESULTS", "PYCNUMANAL_RESULTS_CAPACITY"]
+
+# -----------------------------------------------------------------
+
+def get_command_args(cmd_line_prefix, prob_size) :
+    """ Get the argument vector used to execute an external program
+
+        In:  cmd_line_prefix - the program's command line prefix (string)
+                               (the executable's name, possibly followed by arguments)
+             prob_size       - problem size (integer)
+        Out: args            - argument vector; args[0] is the executable (list of strings)
+    """
+
+    # same command as the original "./" + cmd_line_prefix + " " + str(prob_size),
+    # split into arguments here instead of by a shell
+    args = shlex.split(cmd_line_prefix)
+    args[0] = "./" + args[0]
+    args.append(str(prob_size))
+
+    return args
+
+# end function: get_command_args
+
+# -----------------------------------------------------------------
+
+def get_sweep_command_args(cmd_line_prefix, prob_sizes, trials, warmup_runs) :
+    """ Get the argument vector used to execute a sweep program
+
+        In:  cmd_line_prefix - the program's command line prefix (string)
+             prob_sizes      - problem sizes, in the order they are measured (list of integers)
+             trials          - # of measurements of each problem size (integer)
+             warmup_runs     - # of unreported runs of each problem size before its
+                               measurements (integer)
+        Out: args            - argument vector; args[0] is the executable (list of strings):
+                                  ./program [arguments] --trials T --warmup W size1 size2 ...
+    """
+
+    args = get_command_args(cmd_line_prefix, "")[0:-1]
+    args += ["--trials", str(trials), "--warmup", str(warmup_runs)]
+    args += [str(prob_size) for prob_size in prob_sizes]
+
+    return args
+
+# end function: get_sweep_command_args
+
+# -----------------------------------------------------------------
+
+def get_fingerprint(cmd_line_prefix, program_type="executable") :
+    """ Get the fingerprint of an external program: what a timing generated with it depends on
+
+        In:  cmd_line_prefix - the program's command line prefix (string)
+             program_type    - type of the program (string, one of program_types)
+        Out: fingerprint     - SHA-256 hex digest of the executable's content hash, file size,
+                               modification time and the argument vector (without the
+                               problem size) (string)
+                               (a Python program's is of its module file and its "module:function",
+                               a shared library program's of its library file and its
+                               "library:function(argument types)")
+
+        A recompiled (or otherwise changed) executable, or changed arguments,
+        give a different fingerprint
+    """
+
+    if program_type == "python" :
+        args = [cmd_line_prefix]
+        path = get_python_module_path(cmd_line_prefix)
+    elif program_type == "library" :
+        args = [cmd_line_prefix]
+        path = "./" + split_library_target(cmd_line_prefix)[0]
+    else :
+        args = get_command_args(cmd_line_prefix, "")[0:-1]
+        path = args[0]
+
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+    if key not in executable_hashes :
+        file_hash = hashlib.sha256()
+        with open(path, "rb") as f :
+            for block in iter(lambda : f.read(1024 * 1024), b"") :
+                file_hash.update(block)
+        executable_hashes[key] = file_hash.hexdigest()
+
+    fingerprint_data = json.dumps([executable_hashes[key], stat.st_size, stat.st_mtime_ns, args])
+
+    return hashlib.sha256(fingerprint_data.encode()).hexdigest()
+
+# end function: get_fingerprint
+
+# -----------------------------------------------------------------
+
+def program_exists(cmd_line_prefix, program_type="executable") :
+    """ Check that a program can be run from the current directory
+
+        In:  cmd_line_prefix - the program's command line prefix (string)
+             program_type    - type of the program (string, one of program_types)
+        Out: exists          - is the program's executable (or shared library) in the current
+                               directory (or its Python module importable)? (boolean)
+    """
+
+    if program_type == "python" :
+        try :
+            get_python_module_path(cmd_line_prefix)
+        except (OSError, ValueError) :
+            return False
+        return True
+
+    if program_type == "library" :
+        try :
+            library = split_library_target(cmd_line_prefix)[0]
+        except ValueError :
+            return False
+        return os.path.isfile("./" + library)
+
+    args = shlex.split(cmd_line_prefix)
+
+    return len(args) > 0 and os.path.isfile("./" + args[0])
+
+# end function: program_exists
+
+# -----------------------------------------------------------------
+
+def set_limits(memory_limit, cpu_limit, cpus=None) :
+    """ Set the resource limits (and CPU affinity) of an external program
+        (run in the child process, before the program starts)
+
+        In:  memory_limit - most address space of the program (integer, bytes, None for no limit)
+             cpu_limit    - most CPU seconds of the program (integer, None for no limit)
+             cpus         - cores the program runs on (set of integers, None for any core)
+        Out: nothing
+    """
+
+    if cpus is not None :
+        os.sched_setaffinity(0, cpus)
+
+    if memory_limit is not None :
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    # the program gets SIGXCPU at the soft limit, and SIGKILL a second later
+    if cpu_limit is not None :
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, cpu_limit + 1))
+
+# end function: set_limits
+
+# -----------------------------------------------------------------
+
+def get_run_status(exit_code, timed_out, memory_limit) :
+    """ Get the outcome of an external program's run
+
+        In:  exit_code    - the program's exit code (integer, negative signal # if killed by a signal)
+             timed_out    - was the program killed because of the timeout? (boolean)
+             memory_limit - the program's memory limit (integer, bytes, None for no limit)
+        Out: status       - the run's outcome (string):
+                               "ok"      - the program exited normally
+                               "timeout" - killed because of the wall clock timeout or CPU time limit
+                               "oom"     - ran out of memory (killed by the kernel's out of memory killer,
+                                           or crashed while at its memory limit)
+                               "signal"  - killed by some other signal (e.g. a segmentation fault)
+                               "error"   - exited with a non-zero exit code
+    """
+
+    # (a timeout that fires just as the program exits by itself doesn't count)
+    if (timed_out and exit_code == -signal.SIGKILL) or exit_code == -signal.SIGXCPU :
+        return "timeout"
+
+    # programs usually crash (e.g. use the NULL returned by malloc()) or
+    # abort when an allocation fails because of the address space limit
+    if exit_code == -signal.SIGKILL or \
+       (memory_limit is not None and exit_code in [-signal.SIGSEGV, -signal.SIGBUS, -signal.SIGABRT]) :
+        return "oom"
+
+    if exit_code < 0 :
+        return "signal"
+
+    if exit_code > 0 :
+        return "error"
+
+    return "ok"
+
+# end function: get_run_status
+
+# -----------------------------------------------------------------
+
+def get_preexec_fn(memory_limit, cpu_limit, cpus=None) :
+    """ Get the function that sets an external program's resource limits (and CPU affinity)
+        in its child process
+
+        In:  memory_limit - most address space of the program (integer, bytes, None for no limit)
+             cpu_limit    - most CPU seconds of the program (integer, None for no limit)
+             cpus         - cores the program runs on (set of integers, None for any core)
+        Out: preexec_fn   - function to run in the child process before the program starts
+                            (None if there are no limits)
+    """
+
+    if memory_limit is None and cpu_limit is None and cpus is None :
+        return None
+
+    return lambda : set_limits(memory_limit, cpu_limit, cpus)
+
+# end function: get_preexec_fn
+
+# -----------------------------------------------------------------
+
+def parse_cpu_list(cpu_list) :
+    """ Get the cores in a CPU list (the format of taskset -c and /sys/devices/system/cpu)
+
+        In:  cpu_list - comma-separated cores and ranges of cores (string, e.g. "0,2,4-7")
+        Out: cpus     - the cores (sorted list of integers)
+
+        Raises ValueError for an invalid CPU list
+    """
+
+    cpus = set()
+    try :
+        for part in cpu_list.split(",") :
+            if "-" in part :
+                [first, last] = [int(cpu) for cpu in part.split("-")]
+                if first > last :
+                    raise ValueError
+                cpus.update(range(first, last + 1))
+            else :
+                cpus.add(int(part))
+    except ValueError :
+        raise ValueError("invalid CPU list: \"{}\" (e.g. \"0,2,4-7\")".format(cpu_list))
+
+    if min(cpus) < 0 :
+        raise ValueError("invalid CPU list: \"{}\" (e.g. \"0,2,4-7\")".format(cpu_list))
+
+    return sorted(cpus)
+
+# end function: parse_cpu_list
+
+# -----------------------------------------------------------------
+
+def format_cpu_list(cpus) :
+    """ Get the CPU list of some cores (see parse_cpu_list())
+
+        In:  cpus     - the cores (list of integers)
+        Out: cpu_list - comma-separated cores (string)
+    """
+
+    return ",".join([str(cpu) for cpu in cpus])
+
+# end function: format_cpu_list
+
+# -----------------------------------------------------------------
+
+def get_cpu_slots(cpus, num_slots) :
+    """ Split cores into disjoint sets, one for each program running at the same time
+
+        In:  cpus      - the cores (list of integers)
+             num_slots - # of programs running at the same time (integer)
+        Out: slots     - cores of each program (list of lists of integers)
+
+        Each slot gets a contiguous share of the cores (neighbouring cores usually
+        share caches). With more slots than cores, each slot gets one core and
+        the cores are shared as evenly as possible.
+    """
+
+    if num_slots >= len(cpus) :
+        return [ [cpus[k % len(cpus)]] for k in range(0, num_slots) ]
+
+    # the first len(cpus) % num_slots slots get one extra core
+    [share, extra] = divmod(len(cpus), num_slots)
+    slots = []
+    start = 0
+    for k in range(0, num_slots) :
+        end = start + share + (1 if k < extra else 0)
+        slots.append(cpus[start:end])
+        start = end
+
+    return slots
+
+# end function: get_cpu_slots
+
+# -----------------------------------------------------------------
+
+def kill_process_group(pid) :
+    """ Kill an external program and any processes it started (its process group)
+
+        In:  pid - process id of the program (integer; it leads its own session)
+        Out: nothing
+    """
+
+    try :
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError :
+        pass
+
+# end function: kill_process_group
+
+# -----------------------------------------------------------------
+
+def get_program_timing(output) :
+    """ Get the timing an external program output
+
+        In:  output         - the program's console output (list of strings)
+        Out: program_timing - the timing (float, None if no timing could be read)
+    """
+
+    # it is assumed that the external program outputs its timing
+    # in the first line of its console output
+    try :
+        program_timing = float(output[0].strip())
+    except (IndexError, ValueError) :
+        program_timing = None
+
+    return program_timing
+
+# end function: get_program_timing
+
+# -----------------------------------------------------------------
+
+def get_spawn_args(args, memory_limit, cpu_limit, cpus, launcher) :
+    """ Get how to start an external program's process
+
+        In:  args         - the program's command line arguments (list of strings)
+             memory_limit - most address space of the program (integer, bytes, None for no limit)
+             cpu_limit    - most CPU seconds of the program (integer, None for no limit)
+             cpus         - cores the program runs on (set of integers, None for any core)
+             launcher     - start the program from the launcher (see launcher.py)? (boolean)
+        Out: spawn_args   - command line arguments of the process to start (list of strings)
+             spawn_kwargs - more arguments for starting the process (dictionary, subprocess.Popen() arguments)
+             report_fds   - read and write ends of the launcher's report pipe (list of integers)
+                            (None if the program is started directly)
+
+        The caller closes the report pipe's write end once the process has started
+        (see get_run_usage() for its read end)
+    """
+
+    if not launcher :
+        return [args, {"preexec_fn" : get_preexec_fn(memory_limit, cpu_limit, cpus)}, None]
+
+    # the launcher sets the program's limits itself, so that they don't apply to the launcher
+    report_fds = list(os.pipe())
+    run_spec = {
+        "report_fd"    : report_fds[1],
+        "memory_limit" : memory_limit,
+        "cpu_limit"    : cpu_limit,
+        "cpus"         : sorted(cpus) if cpus is not None else None,
+    }
+
+    # -I -S: no user site-packages or site module (starts faster, smaller process)
+    spawn_args = [sys.executable, "-I", "-S", launcher_path, json.dumps(run_spec)] + args
+
+    return [spawn_args, {"pass_fds" : (report_fds[1],)}, report_fds]
+
+# end function: get_spawn_args
+
+# -----------------------------------------------------------------
+
+def read_launcher_report(report_fd, args) :
+    """ Read the launcher's report of a finished run (see launcher.launch())
+
+        In:  report_fd - read end of the launcher's report pipe (integer, closed afterwards)
+             args      - the program's command line arguments (list of strings)
+        Out: report    - the launcher's report (dictionary, None if the launcher was killed
+                         before the program exited, e.g. because of the timeout)
+
+        Raises OSError if the launcher couldn't start the program (e.g. it isn't executable)
+    """
+
+    with os.fdopen(report_fd, "rb") as f :
+        lines = f.read().splitlines()
+
+    if len(lines) == 0 :
+        return None
+
+    report = json.loads(lines[0])
+    if "errno" in report :
+        raise OSError(report["errno"], report["strerror"], args[0])
+
+    return report
+
+# end function: read_launcher_report
+
+# -----------------------------------------------------------------
+
+def get_rusage_info(rusage) :
+    """ Get the resource usage of a run
+
+        In:  rusage      - the process's resource usage (os.wait4()'s, or an object with the
+                           same "ru_" fields; None if not available)
+        Out: rusage_info - the run's resource usage (dictionary, see rusage_fields)
+                           (values are None if not available)
+    """
+
+    rusage_info = {}
+    for [name, [field, scale]] in rusage_fields.items() :
+        rusage_info[name] = getattr(rusage, field) * scale if rusage is not None else None
+
+    return rusage_info
+
+# end function: get_rusage_info
+
+# -----------------------------------------------------------------
+
+def get_run_usage(report_fds, args, exit_code, wall_time, rusage) :
+    """ Get the exit code, wall clock time and resource usage of a finished run
+
+        In:  report_fds  - the launcher's report pipe (list of integers, see get_spawn_args())
+                           (None if the program was started directly)
+             args        - the program's command line arguments (list of strings)
+             exit_code   - exit code of the started process (integer)
+             wall_time   - wall clock time of the started process (float, seconds)
+             rusage      - resource usage of the started process (None if not available)
+        Out: exit_code   - the program's exit code (integer)
+             wall_time   - the program's wall clock time (float, seconds)
+             rusage_info - the program's resource usage (dictionary, see get_rusage_info())
+
+        With the launcher, its report of the program replaces what was measured of the
+        launcher's process (which also includes the launcher's start-up)
+    """
+
+    if report_fds is None :
+        return [exit_code, wall_time, get_rusage_info(rusage)]
+
+    report = read_launcher_report(report_fds[0], args)
+    if report is None :
+        return [exit_code, wall_time, get_rusage_info(None)]
+
+    return [os.waitstatus_to_exitcode(report["wait_status"]), report["wall_time"],
+            get_rusage_info(types.SimpleNamespace(**report["rusage"]))]
+
+# end function: get_run_usage
+
+# -----------------------------------------------------------------
+
+def create_result_channel(capacity) :
+    """ Create a run's result channel, which the program can write its timings to
+
+        In:  capacity - most timings the program can write (integer, > 0)
+        Out: channel  - the channel (list: [path of the file, its memory map])
+             env      - the program's environment: this process's, plus the channel's
+                        (dictionary, see result_channel_env)
+
+        The file is in /dev/shm (memory, not disk) when there is one. The program
+        opens it (read/write) and maps it, writes its timings as records 1, 2, ...
+        and their # as record 0 (see result_channel_env).
+    """
+
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    [fd, path] = tempfile.mkstemp(prefix="pycnumanal-", suffix=".results", dir=directory)
+    try :
+        # (a new file's bytes are 0, so the # of timings is 0 until the program writes it)
+        os.ftruncate(fd, (capacity + 1) * 8)
+        channel = [path, mmap.mmap(fd, (capacity + 1) * 8)]
+    except OSError :
+        os.unlink(path)
+        raise
+    finally :
+        os.close(fd)
+
+    env = dict(os.environ)
+    env[result_channel_env[0]] = path
+    env[result_channel_env[1]] = str(capacity)
+
+    return [channel, env]
+
+# end function: create_result_channel
+
+# -----------------------------------------------------------------
+
+def read_result_channel(channel) :
+    """ Read the timings a finished program wrote to its result channel (and remove the channel's file)
+
+        In:  channel         - the channel (list, see create_result_channel())
+        Out: iteration_times - the timings (NumPy float64 array, None if the program wrote none)
+
+        The array is a view of the channel's memory map (not a copy), which stays mapped
+        as long as the array is used
+    """
+
+    [path, memory_map] = channel
+    remove_result_channel(channel)
+
+    capacity = len(memory_map) // 8 - 1
+    count = int(np.frombuffer(memory_map, dtype=np.int64, count=1)[0])
+    count = min(max(count, 0), capacity)
+
+    if count == 0 :
+        return None
+
+    return np.frombuffer(memory_map, dtype=np.float64, count=count, offset=8)
+
+# end function: read_result_channel
+
+# -----------------------------------------------------------------
+
+def remove_result_channel(channel) :
+    """ Remove a result channel's file (its memory map is unmapped once it isn't used)
+
+        In:  channel - the channel (list, see create_result_channel())
+        Out: nothing
+    """
+
+    try :
+        os.unlink(channel[0])
+    except FileNotFoundError :
+        pass
+
+# end function: remove_result_channel
+
+# -----------------------------------------------------------------
+
+def run_program(cmd_line_prefix, prob_size, timeout=None, memory_limit=None, cpu_limit=None, cpus=None,
+                launcher=True, result_capacity=0) :
+    """ Run an external program for a problem size and time it
+
+        In:  cmd_line_prefix - the program's command line prefix (string)
+             prob_size       - problem size (integer)
+             timeout         - most wall clock seconds of the run (float, None for no timeout)
+             memory_limit    - most address space of the program (integer, bytes, None for no limit)
+             cpu_limit       - most CPU seconds of the program (integer, None for no limit)
+             cpus            - cores the program runs on (set of integers, None for any core)
+             launcher        - start the program from the launcher (see launcher.py)? (boolean)
+                               (otherwise the program's peak memory is at least this process's memory)
+             result_capacity - most timings the program can write to its result channel
+                               (integer, 0 for no result channel, see create_result_channel())
+        Out: run_info        - info about the run (dictionary):
+                                  "program_timing" - timing output by the program on the first
+                                                     line of its console output (float)
+                                                     (None if no timing could be read)
+                                  "wall_time"      - wall clock time of the run (float, seconds)
+                                  "user_time"      - user CPU time of the program (float, seconds)
+                                  "sys_time"       - system CPU time of the program (float, seconds)
+                                  "max_rss", ...   - the program's other resource usage (see rusage_fields)
+                                                     (None if the launcher was killed by the timeout)
+                                  "exit_code"      - the program's exit code (integer)
+                                                     (negative signal # if killed by a signal)
+                                  "output"         - the program's console output (list of strings)
+                                  "status"         - the run's outcome (string, see get_run_status())
+                                  "fingerprint"    - the program's fingerprint (string, see get_fingerprint())
+                                  "iteration_times" - timings the program wrote to its result channel
+                                                     (NumPy float64 array, see read_result_channel())
+                                                     (None if it wrote none, or had no channel)
+
+        The program is started in its own session, so that the timeout kills it and
+        any processes it started (its process group)
+    """
+
+    args = get_command_args(cmd_line_prefix, prob_size)
+    fingerprint = get_fingerprint(cmd_line_prefix)
+
+    [spawn_args, spawn_kwargs, report_fds] = get_spawn_args(args, memory_limit, cpu_limit, cpus, launcher)
+
+    channel = None
+    if result_capacity > 0 :
+        [channel, spawn_kwargs["env"]] = create_result_channel(result_capacity)
+
+    start_ns = time.perf_counter_ns()
+
+    try :
+        proc = subprocess.Popen(spawn_args, stdout=subprocess.PIPE, close_fds=True,
+                                start_new_session=True, **spawn_kwargs)
+    except OSError :
+        if report_fds is not None :
+            os.close(report_fds[0])
+        if channel is not None :
+            remove_result_channel(channel)
+        raise
+    finally :
+        if report_fds is not None :
+            os.close(report_fds[1])
+
+    # the timeout kills the process group, which closes the output pipe that is being read
+    timed_out = threading.Event()
+    def kill_program() :
+        timed_out.set()
+        kill_process_group(proc.pid)
+
+    timer = None
+    try :
+        if timeout is not None :
+            timer = threading.Timer(timeout, kill_program)
+            timer.start()
+
+        output = proc.stdout.read()
+        proc.stdout.close()
+
+        # the program can close its output and keep running, so the timeout lasts until it has
+        # exited: waited on without reaping it (WNOWAIT), so its process group can't have been
+        # reused while the timer can still kill it
+        os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOWAIT)
+        if timer is not None :
+            timer.cancel()
+            timer.join()
+
+        # wait4() instead of proc.wait() to also get the program's resource usage
+        [pid, wait_status, rusage] = os.wait4(proc.pid, 0)
+
+        end_ns = time.perf_counter_ns()
+
+        # let the Popen object know the program has already been waited on
+        proc.returncode = os.waitstatus_to_exitcode(wait_status)
+
+    except BaseException :
+        # e.g. Ctrl-C (which doesn't reach the program, in its own session)
+        if timer is not None :
+            timer.cancel()
+            timer.join()
+        # (the program hasn't been reaped yet, so its process group can't have been reused)
+        if proc.returncode is None :
+            kill_process_group(proc.pid)
+            proc.wait()
+        proc.stdout.close()
+        if report_fds is not None :
+            os.close(report_fds[0])
+        if channel is not None :
+            remove_result_channel(channel)
+        raise
+
+    iteration_times = read_result_channel(channel) if channel is not None else None
+
+    [exit_code, wall_time, rusage_info] = get_run_usage(report_fds, args, proc.returncode,
+                                                        (end_ns - start_ns) * 1e-9, rusage)
+
+    output = output.decode(errors="replace").splitlines()
+
+    run_info = {
+        "program_timing" : get_program_timing(output),
+        "wall_time"      : wall_time,
+        "exit_code"      : exit_code,
+        "output"         : output,
+        "status"         : get_run_status(exit_code, timed_out.is_set(), memory_limit),
+        "fingerprint"    : fingerprint,
+        "iteration_times" : iteration_times,
+    }
+    run_info.update(rusage_info)
+
+    return run_info
+
+# end function: run_program
+
+# -----------------------------------------------------------------
+
+async def run_program_async(cmd_line_prefix, prob_size, timeout=None, memory_limit=None, cpu_limit=None, cpus=None,
+                            launcher=True, result_capacity=0) :
+    """ Run an external program for a problem size and time it, without blocking the event loop
+
+        In:  (same as run_program())
+        Out: run_info - info about the run (dictionary, same as run_program()'s, except
+                        that without the launcher the resource usage (e.g. "user_time")
+                        is None: asyncio waits for the program itself, so its resource
+                        usage isn't available)
+
+        The program's output is read as a stream while other runs proceed. If the
+        run is cancelled (e.g. Ctrl-C), the program's process group is killed.
+    """
+
+    args = get_command_args(cmd_line_prefix, prob_size)
+    fingerprint = get_fingerprint(cmd_line_prefix)
+
+    [spawn_args, spawn_kwargs, report_fds] = get_spawn_args(args, memory_limit, cpu_limit, cpus, launcher)
+
+    channel = None
+    if result_capacity > 0 :
+        [channel, spawn_kwargs["env"]] = create_result_channel(result_capacity)
+
+    start_ns = time.perf_counter_ns()
+
+    try :
+        proc = await asyncio.create_subprocess_exec(*spawn_args, stdout=asyncio.subprocess.PIPE, close_fds=True,
+                                                    start_new_session=True, **spawn_kwargs)
+    except (OSError, asyncio.CancelledError) :
+        if report_fds is not None :
+            os.close(report_fds[0])
+        if channel is not None :
+            remove_result_channel(channel)
+        raise
+    finally :
+        if report_fds is not None :
+            os.close(report_fds[1])
+
+    # the timeout covers the program's exit as well as its output (it can close its
+    # output and keep running)
+    async def read_output_and_wait() :
+        output = await proc.stdout.read()
+        return [output, await proc.wait()]
+
+    timed_out = False
+    try :
+        try :
+            [output, exit_code] = await asyncio.wait_for(read_output_and_wait(), timeout)
+        except asyncio.TimeoutError :
+            timed_out = True
+            if proc.returncode is None :
+                kill_process_group(proc.pid)
+            output = b""
+            exit_code = await proc.wait()
+
+    except asyncio.CancelledError :
+        kill_process_group(proc.pid)
+        await proc.wait()
+        if report_fds is not None :
+            os.close(report_fds[0])
+        if channel is not None :
+            remove_result_channel(channel)
+        raise
+
+    end_ns = time.perf_counter_ns()
+
+    iteration_times = read_result_channel(channel) if channel is not None else None
+
+    # (the launcher has exited, so reading its report doesn't block)
+    [exit_code, wall_time, rusage_info] = get_run_usage(report_fds, args, exit_code,
+                                                        (end_ns - start_ns) * 1e-9, None)
+
+    output = output.decode(errors="replace").splitlines()
+
+    run_info = {
+        "program_timing" : get_program_timing(output),
+        "wall_time"      : wall_time,
+        "exit_code"      : exit_code,
+        "output"         : output,
+        "status"         : get_run_status(exit_code, timed_out, memory_limit),
+        "fingerprint"    : fingerprint,
+        "iteration_times" : iteration_times,
+    }
+    run_info.update(rusage_info)
+
+    return run_info
+
+# end function: run_program_async
+
+# -----------------------------------------------------------------
+
+def get_sweep_measurement(line, trials_left) :
+    """ Parse a sweep program's measurement
+
+        In:  line        - a line of the program's console output (string)
+             trials_left - # of measurements still to come of each problem size
+                           (dictionary: problem size -> integer)
+        Out: prob_size   - the measurement's problem size (integer, None if the line isn't
+                           a measurement, or is a bad one)
+             values      - what the measurement reports (dictionary, see sweep_measurement_keys)
+                           (None if the line isn't a measurement, or is a bad one)
+             bad         - is the line a bad measurement? (boolean): not JSON, not of a problem
+                           size being measured (or one more than its trials), or a reported
+                           value isn't a number
+
+        Only lines starting with "{" are measurements; the program's other lines are
+        kept as its output
+    """
+
+    if not line.startswith("{") :
+        return [None, None, False]
+
+    try :
+        measurement = json.loads(line)
+    except ValueError :
+        return [None, None, True]
+
+    prob_size = measurement.get("size") if isinstance(measurement, dict) else None
+    if type(prob_size) is not int or trials_left.get(prob_size, 0) < 1 :
+        return [None, None, True]
+
+    values = {}
+    for [key, name] in sweep_measurement_keys.items() :
+        value = measurement.get(key)
+        if value is not None and (type(value) not in [int, float]) :
+            return [None, None, True]
+        values[name] = value
+
+    return [prob_size, values, False]
+
+# end function: get_sweep_measurement
+
+# -----------------------------------------------------------------
+
+def run_sweep_program(cmd_line_prefix, prob_sizes, trials, warmup_runs=0, timeout=None, memory_limit=None,
+                      cpu_limit=None, cpus=None) :
+    """ Run a sweep program for several problem sizes, getting each measurement as soon
+        as the program reports it
+
+        In:  cmd_line_prefix - the program's command line prefix (string)
+             prob_sizes      - problem sizes, in the order they are measured (list of integers, no repeats)
+             trials          - # of measurements of each problem size (integer)
+             warmup_runs     - # of unreported runs of each problem size before its measurements (integer)
+             timeout         - most wall clock seconds the program goes without reporting a
+                               measurement (float, None for no timeout)
+             memory_limit    - most address space of the program (integer, bytes, None for no limit)
+             cpu_limit       - most CPU seconds of the program's whole run (integer, None for no limit)
+             cpus            - cores the program runs on (set of integers, None for any core)
+        Out: yields [prob_size, run_info] for each measurement (in the order the program reports them):
+                run_info - info about the measurement (dictionary, same keys as run_program()'s):
+                              - "program_timing", "wall_time", "user_time", ... are what the
+                                measurement reports (None when not reported)
+                              - "output" is the measurement's line
+             and, if the program's run failed (or it reported fewer measurements than asked
+             for), a last [prob_size, run_info] of the first problem size that didn't get all
+             of its measurements, whose "status" is the run's outcome (see get_run_status(), or
+             "bad_output" for a bad measurement (see get_sweep_measurement())), and whose
+             "output" is the program's output other than its measurements
+
+        The program is started with the problem sizes and # of trials on its command line
+        (see get_sweep_command_args()); it writes one JSON object per line for each
+        measurement (e.g. {"size": 1000, "trial": 1, "time": 0.0012}, see
+        sweep_measurement_keys), flushed as it goes. It is started directly (not by the
+        launcher): the resource usage of its whole run isn't any one measurement's.
+
+        The program is killed if this generator is closed before it exits (e.g. Ctrl-C)
+    """
+
+    args = get_sweep_command_args(cmd_line_prefix, prob_sizes, trials, warmup_runs)
+    fingerprint = get_fingerprint(cmd_line_prefix, "sweep")
+
+    trials_left = {prob_size : trials for prob_size in prob_sizes}
+
+    [spawn_args, spawn_kwargs, report_fds] = get_spawn_args(args, memory_limit, cpu_limit, cpus, False)
+
+    proc = subprocess.Popen(spawn_args, stdout=subprocess.PIPE, close_fds=True,
+                            start_new_session=True, **spawn_kwargs)
+
+    # the timeout kills the process group, which closes the output pipe that is being read;
+    # it starts over at each measurement
+    timed_out = threading.Event()
+    def kill_program() :
+        timed_out.set()
+        kill_process_group(proc.pid)
+
+    timer = None
+    def restart_timer() :
+        nonlocal timer
+        if timer is not None :
+            timer.cancel()
+        if timeout is not None :
+            timer = threading.Timer(timeout, kill_program)
+            timer.start()
+
+    output = []
+    bad_output = False
+    try :
+        restart_timer()
+        for line in proc.stdout :
+            line = line.decode(errors="replace").rstrip("\n")
+            [prob_size, values, bad_output] = get_sweep_measurement(line.strip(), trials_left)
+            if bad_output :
+                output.append(line)
+                kill_process_group(proc.pid)
+                break
+            if prob_size is None :
+                output.append(line)
+                continue
+
+            restart_timer()
+            trials_left[prob_size] -= 1
+
+            run_info = {
+                "exit_code"   : 0,
+                "output"      : [line],
+                "status"      : "ok",
+                "fingerprint" : fingerprint,
+            }
+            run_info.update(values)
+            yield [prob_size, run_info]
+
+        proc.stdout.close()
+        exit_code = proc.wait()
+
+    finally :
+        if timer is not None :
+            timer.cancel()
+
+        # closed early: (the program hasn't been waited on yet, so its process group can't have been reused)
+        if proc.returncode is None :
+            kill_process_group(proc.pid)
+            proc.wait()
+
+    status = "bad_output" if bad_output else get_run_status(exit_code, timed_out.is_set(), memory_limit)
+    unfinished_sizes = [prob_size for prob_size in prob_sizes if trials_left[prob_size] > 0]
+
+    if len(unfinished_sizes) > 0 :
+        if status == "ok" :
+            status = "bad_output"
+
+        run_info = {
+            "program_timing" : None,
+            "wall_time"      : None,
+            "exit_code"      : exit_code,
+            "output"         : output,
+            "status"         : status,
+            "fingerprint"    : fingerprint,
+        }
+        run_info.update(get_rusage_info(None))
+        yield [unfinished_sizes[0], run_info]
+
+# end function: run_sweep_program
+
+# -----------------------------------------------------------------
+
+def split_python_target(target) :
+    """ Split a Python program into its module and functions
+
+        In:  target - the Python program (string, "module:function" or "module:function:setup")
+        Out: names  - the module, function (and setup function) names (list of strings)
+
+        Raises ValueError if target isn't a "module:function" or "module:function:setup"
+    """
+
+    names = target.split(":")
+    if len(names) not in [2, 3] or "" in names :
+        raise ValueError("a Python program is \"module:function\" or \"module:function:setup\": {}".format(target))
+
+    return names
+
+# end function: split_python_target
+
+# -----------------------------------------------------------------
+
+def get_python_module_path(target) :
+    """ Get the file of a Python program's module
+
+        In:  target - the Python program (string, "module:function" or "module:function:setup")
+        Out: path   - the module's file (string)
+
+        Raises ValueError if target isn't a "module:function", and FileNotFoundError
+        if the module can't be found in the current directory (or Python's module path)
+    """
+
+    names = split_python_target(target)
+
+    # the modules are looked for in the current directory first, like the executables
+    if os.getcwd() not in sys.path :
+        sys.path.insert(0, os.getcwd())
+
+    try :
+        spec = importlib.util.find_spec(names[0])
+    except ImportError :
+        spec = None
+
+    if spec is None or not spec.has_location :
+        raise FileNotFoundError(errno.ENOENT, "Python module not found", names[0])
+
+    return spec.origin
+
+# end function: get_python_module_path
+
+# -----------------------------------------------------------------
+
+def get_python_functions(target) :
+    """ Import a Python program's function (and setup function)
+
+        In:  target   - the Python program (string, "module:function" or "module:function:setup")
+        Out: function - the function timed (callable)
+             setup    - the setup function (callable, None if there is none)
+
+        A module that changed since it was imported is reloaded
+    """
+
+    names = split_python_target(target)
+
+    path = get_python_module_path(target)
+    mtime_ns = os.stat(path).st_mtime_ns
+
+    module = importlib.import_module(names[0])
+    if module_mtimes.setdefault(names[0], mtime_ns) != mtime_ns :
+        module = importlib.reload(module)
+        module_mtimes[names[0]] = mtime_ns
+
+    function = getattr(module, names[1])
+    setup = getattr(module, names[2]) if len(names) == 3 else None
+
+    return [function, setup]
+
+# end function: get_python_functions
+
+# -----------------------------------------------------------------
+
+def get_loop_count(timer, min_loop_time) :
+    """ Get how many calls of a function a measurement needs (like timeit's autorange())
+
+        In:  timer         - timer of the function (timeit.Timer)
+             min_loop_time - least seconds of a measurement (float)
+        Out: loops         - # of calls (integer): 1, 2, 5, 10, 20, 50, ... until
+                             the calls take at least min_loop_time
+    """
+
+    loops = 1
+    while 1 :
+        for factor in [1, 2, 5] :
+            if timer.timeit(loops * factor) >= min_loop_time :
+                return loops * factor
+        loops *= 10
+
+# end function: get_loop_count
+
+# -----------------------------------------------------------------
+
+def run_in_process(fingerprint, get_call, prob_size, min_loop_time, cpus=None) :
+    """ Time calls of a function in this process (a Python or shared library program's)
+
+        In:  fingerprint   - the program's fingerprint (string, see get_fingerprint())
+             get_call      - gets the call to time for a problem size (function: get_call(prob_size)
+                             returns a function without arguments); e.g. makes the input arrays,
+                             which isn't timed
+             prob_size     - problem size (integer)
+             min_loop_time - least seconds of the measurement (float): the function is called
+                             in a loop enough times to take that long (see get_loop_count())
+             cpus          - cores the function runs on (set of integers, None for any core)
+        Out: run_info      - info about the run (dictionary, same as run_program()'s):
+                                - the times are of one call (the loop's times / # of calls)
+                                - "program_timing" is the wall clock time of one call
+                                - "loops" is the # of calls (None if the call failed)
+                                - the other resource usage (e.g. "max_rss") is None
+                                - "status" is "error" if the call (or getting it) raised an
+                                  exception ("output" is the exception)
+
+        The garbage collector is off while the loop runs (like timeit). The run's
+        timeout and memory/CPU limits don't apply to a call in this process.
+    """
+
+    run_info = {
+        "program_timing" : None,
+        "wall_time"      : None,
+        "exit_code"      : 0,
+        "output"         : [],
+        "status"         : "ok",
+        "fingerprint"    : fingerprint,
+        "loops"          : None,
+    }
+    run_info.update(get_rusage_info(None))
+
+    # (sched_setaffinity() of pid 0 pins only the calling thread)
+    old_cpus = os.sched_getaffinity(0)
+    if cpus is not None :
+        os.sched_setaffinity(0, cpus)
+
+    try :
+        timer = timeit.Timer(get_call(prob_size))
+
+        key = (fingerprint, prob_size, min_loop_time)
+        if key not in loop_counts :
+            loop_counts[key] = get_loop_count(timer, min_loop_time)
+        loops = loop_counts[key]
+
+        start_usage = resource.getrusage(resource.RUSAGE_THREAD)
+        wall_time = timer.timeit(loops) / loops
+        end_usage = resource.getrusage(resource.RUSAGE_THREAD)
+
+        run_info["program_timing"] = wall_time
+        run_info["wall_time"]      = wall_time
+        run_info["user_time"]      = (end_usage.ru_utime - start_usage.ru_utime) / loops
+        run_info["sys_time"]       = (end_usage.ru_stime - start_usage.ru_stime) / loops
+        run_info["loops"]          = loops
+
+    except Exception as ex :
+        run_info["exit_code"] = 1
+        run_info["output"]    = "".join(traceback.format_exception_only(ex)).splitlines()
+        run_info["status"]    = "error"
+
+    finally :
+        if cpus is not None :
+            os.sched_setaffinity(0, old_cpus)
+
+    return run_info
+
+# end function: run_in_process
+
+# -----------------------------------------------------------------
+
+def run_python_program(target, prob_size, min_loop_time, cpus=None) :
+    """ Run a Python program (a function) for a problem size in this process and time it
+
+        In:  target        - the Python program (string):
+                                "module:function"       - function(prob_size) is timed
+                                "module:function:setup" - function(setup(prob_size)) is timed,
+                                                          setup(prob_size) isn't (e.g. it makes
+                                                          the function's input arrays)
+             prob_size     - problem size (integer)
+             min_loop_time - least seconds of the measurement (float, see run_in_process())
+             cpus          - cores the function runs on (set of integers, None for any core)
+        Out: run_info      - info about the run (dictionary, see run_in_process())
+
+        Raises FileNotFoundError if the program's module can't be found
+    """
+
+    fingerprint = get_fingerprint(target, "python")
+
+    def get_call(prob_size) :
+        [function, setup] = get_python_functions(target)
+        arg = setup(prob_size) if setup is not None else prob_size
+        return lambda : function(arg)
+
+    run_info = run_in_process(fingerprint, get_call, prob_size, min_loop_time, cpus)
+
+    return run_info
+
+# end function: run_python_program
+
+# -----------------------------------------------------------------
+
+def split_library_target(target) :
+    """ Split a shared library program into its library, function and argument types
+
+        In:  target    - the shared library program (string, "library:function(argument types)",
+                         e.g. "libl2vecnorm.so:l2norm(double*, long)")
+        Out: library   - the shared library file, in the current directory (string)
+             func_name - the function's name (string)
+             arg_types - the function's argument types (list of strings, see library_arg_types)
+
+        Raises ValueError if target isn't a "library:function(argument types)", or
+        has an unknown argument type
+    """
+
+    match = re.fullmatch(r"\s*([^:]+):\s*(\w+)\s*\((.*)\)\s*", target)
+    if match is None :
+        raise ValueError("a shared library program is \"library:function(argument types)\": {}".format(target))
+
+    [library, func_name, arg_list] = match.groups()
+
+    # (the function's arguments are only read, so "const" doesn't matter)
+    arg_types = []
+    for arg_type in arg_list.split(",") :
+        arg_type = re.sub(r"\bconst\b", "", arg_type).replace(" ", "")
+        if arg_type == "" and arg_list.strip() == "" :
+            continue
+        if arg_type not in library_arg_types :
+            raise ValueError("unknown argument type \"{}\" (known types: {})".format(arg_type, ", ".join(library_arg_types)))
+        arg_types.append(arg_type)
+
+    return [library.strip(), func_name, arg_types]
+
+# end function: split_library_target
+
+# -----------------------------------------------------------------
+
+def get_library_function(target) :
+    """ Load a shared library program's function (with ctypes)
+
+        In:  target   - the shared library program (string, see split_library_target())
+        Out: function - the function, with its argument types set (ctypes function)
+
+        A library is loaded once per process (again if its file changed, e.g. recompiled).
+        The function's return value isn't used.
+    """
+
+    [library, func_name, arg_types] = split_library_target(target)
+
+    path = os.path.abspath("./" + library)
+    key = (path, os.stat(path).st_mtime_ns)
+    if key not in libraries :
+        if any(loaded_path == path for [loaded_path, mtime] in libraries) :
+            # recompiled: dlopen() would return the library loaded before, so a copy of the
+            # file is loaded under a new name (the copy's file can go once it's mapped)
+            [fd, copy_path] = tempfile.mkstemp(prefix="{}-{}-".format(os.path.basename(path), key[1]),
+                                               suffix=".so")
+            os.close(fd)
+            try :
+                shutil.copyfile(path, copy_path)
+                libraries[key] = ctypes.CDLL(copy_path)
+            finally :
+                os.remove(copy_path)
+        else :
+            libraries[key] = ctypes.CDLL(path)
+
+    function = getattr(libraries[key], func_name)
+
+    # arrays are passed as pointers to their (C-ordered) data, without copying them
+    function.argtypes = [ np.ctypeslib.ndpointer(dtype=library_arg_types[arg_type], flags="C_CONTIGUOUS")
+                          if arg_type.endswith("*") else library_arg_types[arg_type]
+                          for arg_type in arg_types ]
+    function.restype = None
+
+    return function
+
+# end function: get_library_function
+
+# -----------------------------------------------------------------
+
+def get_library_args(target, prob_size) :
+    """ Get the arguments of a shared library program's function for a problem size
+
+        In:  target    - the shared library program (string, see split_library_target())
+             prob_size - problem size (integer)
+        Out: args      - the function's arguments (list): the problem size for an integer
+                         argument, a NumPy array of problem size elements for a pointer argument
+                         (0, 1, 2, ... like l2vecnorm.c's vector)
+    """
+
+    [library, func_name, arg_types] = split_library_target(target)
+
+    args = []
+    for arg_type in arg_types :
+        if arg_type.endswith("*") :
+            args.append(np.arange(prob_size, dtype=library_arg_types[arg_type]))
+        else :
+            args.append(prob_size)
+
+    return args
+
+# end function: get_library_args
+
+# -----------------------------------------------------------------
+
+def run_library_program(target, prob_size, min_loop_time, cpus=None) :
+    """ Run a shared library program (a C function) for a problem size in this process and time it
+
+        In:  target        - the shared library program (string, "library:function(argument types)",
+                             e.g. "libl2vecnorm.so:l2norm(double*, long)", see split_library_target())
+             prob_size     - problem size (integer)
+             min_loop_time - least seconds of the measurement (float, see run_in_process())
+             cpus          - cores the function runs on (set of integers, None for any core)
+        Out: run_info      - info about the run (dictionary, see run_in_process())
+
+        The function's input arrays are made before the timing (see get_library_args()).
+        A function that crashes (e.g. a segmentation fault) takes this process down with it.
+
+        Raises FileNotFoundError if the library isn't in the current directory
+    """
+
+    fingerprint = get_fingerprint(target, "library")
+
+    def get_call(prob_size) :
+        function = get_library_function(target)
+        args = get_library_args(target, prob_size)
+        return lambda : function(*args)
+
+    run_info = run_in_process(fingerprint, get_call, prob_size, min_loop_time, cpus)
+
+    return run_info
+
+# end function: run_library_program
+
+# -----------------------------------------------------------------
@@ -2,7 +2,12 @@
 create table programs (
     program_name    text primary key,
     description     text,
-    cmd_line_prefix text
+    cmd_line_prefix text,
+    program_type    text default 'executable'  -- 10/18/2026: "executable", "python" (a "module:function"
+                                               --             called in-process, see runner.py),
+                                               --             "library" (a C function in a .so file)
+                                               --             or "sweep" (measures a whole sweep in
+                                               --             one run, see runner.run_sweep_program())
 );
 
 -- Stores the timings for the above programs
@@ -11,6 +16,87 @@ create table timings (
     id           integer primary key autoincrement not null,
     problem_size integer,
     timing       real,
-    program_name text not null references programs(program_name) on delete cascade
+    program_name text not null references programs(program_name) on delete cascade,
+    wall_time    real,  -- 10/18/2026: timings measured in Python (NULL for manually entered timings)
+    user_time    real,  --             (medians of the samples' times)
+    sys_time     real,
+    num_samples  integer,  -- 10/18/2026: statistics of the samples below; timing is their median
+    timing_min   real,
+    timing_mean  real,
+    timing_stdev real,
+    status       text default 'ok',  -- 10/18/2026: outcome of the runs ("ok", "timeout", "oom", ...);
+                                     --             timing is NULL when not "ok"
+    fingerprint  text  -- 10/18/2026: executable/arguments that generated the timing (see runner.py)
 );
 
+-- One timing per program and problem size
+--   10/18/2026:  created (also used to get a program's timings in problem size order)
+create unique index timings_program_size on timings(program_name, problem_size);
+
+-- Stores every measured run (trial) of the above timings
+--   10/18/2026:  created
+create table samples (
+    id           integer primary key autoincrement not null,
+    timing_id    integer not null references timings(id) on delete cascade,
+    trial        integer,
+    timing       real,
+    wall_time    real,
+    user_time    real,
+    sys_time     real,
+    outlier      integer default 0,  -- 10/18/2026: 1 if left out of the timing's statistics
+    status       text default 'ok',  -- 10/18/2026: outcome of the run (timing is NULL when not "ok")
+    max_rss            integer,  -- 10/18/2026: resource usage of the run (see runner.rusage_fields):
+    minor_faults       integer,  --             peak resident set size (bytes), page faults without
+    major_faults       integer,  --             and with I/O, voluntary and involuntary context switches
+    vol_ctx_switches   integer,
+    invol_ctx_switches integer,
+    iteration_times    blob      -- 10/18/2026: float64 timings the run wrote to its result channel
+                                 --             (see runner.create_result_channel())
+);
+create index samples_timing_id on samples(timing_id);
+
+-- Work queue: sweeps turned into jobs that worker processes (possibly on other hosts) claim
+--   10/18/2026:  created (see the work queue functions in database.py and worker.py)
+create table queue_batches (
+    id           integer primary key autoincrement not null,
+    program_name text not null references programs(program_name) on delete cascade,
+    settings     text,  -- JSON of the application settings the jobs are run with
+    created      real   -- time.time() when queued
+);
+create table queue_jobs (
+    id            integer primary key autoincrement not null,
+    batch_id      integer not null references queue_batches(id) on delete cascade,
+    problem_size  integer not null,
+    trial         integer,  -- NULL: all of the problem size's trials in one job
+    state         text default 'queued',  -- "queued", "leased", "done" or "collected" (timing stored)
+    worker        text,     -- worker holding the lease
+    lease_expires real,     -- time.time() when the lease runs out (requeued after that)
+    attempts      integer default 0,
+    result        text      -- JSON of the job's [timing, samples]
+);
+create index queue_jobs_state on queue_jobs(state, lease_expires);
+create index queue_jobs_batch_size on queue_jobs(batch_id, problem_size);
+
+-- Sweeps (a program's planned problem sizes), so that an interrupted sweep can be resumed
+--   10/18/2026:  created
+create table sweeps (
+    id           integer primary key autoincrement not null,
+    program_name text not null references programs(program_name) on delete cascade,
+    settings     text,  -- JSON of the application settings the sweep runs with
+    state        text default 'running',  -- "running", "interrupted" or "done"
+    started      real,  -- time.time() when (last) started or resumed
+    finished     real   -- time.time() when done or interrupted
+);
+create table sweep_sizes (
+    sweep_id     integer not null references sweeps(id) on delete cascade,
+    problem_size integer not null,
+    state        text default 'planned',  -- "planned", "running" or "done" (timing stored)
+    status       text,  -- outcome of the problem size's runs once done ("ok", "timeout", ...)
+    started      real,
+    finished     real,
+    primary key (sweep_id, problem_size)
+);
+
+-- Version of the above table structures (see db_upgrades in database.py)
+pragma user_version = 11;
+
@@ -0,0 +1,81 @@
+# test_analysis.py : Acceptance test of analysis.py's complexity fitting
+#
+#    - times the example programs linear_timing, nlogn_timing and nsquared_timing
+#      (see instructions.txt) and checks that fit_complexity() finds their growth models
+#    - run with pytest, from any directory:
+#
+#          python3 -m pytest test_analysis.py
+#
+# ---------------------------------------------------------
+
+# standard modules
+import os
+import shutil
+import subprocess
+
+# third-party modules
+import pytest
+
+# pycnumanal modules
+import analysis
+import runner
+
+# -----------------------------------------------------------------
+
+# the example programs and the growth model each one's timings have
+fixture_programs = [
+    ["linear_timing",   "O(n)"],
+    ["nlogn_timing",    "O(n log n)"],
+    ["nsquared_timing", "O(n^2)"],
+]
+
+# problem sizes timed (three orders of magnitude, like a typical sweep)
+prob_sizes = [10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+
+package_dir = os.path.dirname(os.path.abspath(__file__))
+
+# -----------------------------------------------------------------
+
+@pytest.fixture
+def program_dir(tmp_path, monkeypatch) :
+    """ Directory with the example programs, made the current directory (programs are run from it)
+
+        In:  tmp_path    - pytest's temporary directory
+             monkeypatch - pytest's monkeypatch (restores the current directory)
+        Out: the directory (string)
+
+        A program that isn't compiled yet is compiled (skipped without gcc)
+    """
+
+    for [prog_name, model] in fixture_programs :
+        if os.path.isfile(os.path.join(package_dir, prog_name)) :
+            shutil.copy(os.path.join(package_dir, prog_name), tmp_path)
+        elif shutil.which("gcc") is None :
+            pytest.skip("{} isn't compiled and gcc isn't available".format(prog_name))
+        else :
+            subprocess.run(["gcc", "-o", str(tmp_path / prog_name),
+                            os.path.join(package_dir, prog_name + ".c"), "-std=gnu99", "-lm"], check=True)
+
+    monkeypatch.chdir(tmp_path)
+
+    return str(tmp_path)
+
+# end function: program_dir
+
+# -----------------------------------------------------------------
+
+@pytest.mark.parametrize("prog_name, model", fixture_programs)
+def test_fit_complexity(program_dir, prog_name, model) :
+    """ The growth model fitted to an example program's timings is the program's """
+
+    timings = []
+    for prob_size in prob_sizes :
+        run_info = runner.run_program(prog_name, prob_size, timeout=10)
+        assert run_info["status"] == "ok"
+        timings.append(run_info["program_timing"])
+
+    [best_fit, fits] = analysis.fit_complexity(prob_sizes, timings)
+
+    assert best_fit["model"] == model
+
+# end function: test_fit_complexity
@@ -0,0 +1,225 @@
+# timing_stats.py : Statistics of the repeated timings (samples) of a program's problem size
+#
+#    VERSION 1.00
+#
+#    - runs on Linux (not tested on Windows)
+#    - Python 3.x (not tested with Python 2.x)
+#
+# --------------------------------------------------------
+#
+# Change log:
+#
+#    10/18/2026 (ag)   - created this module to support repeated trials per problem size
+#                      - added summarize()
+#
+#    10/18/2026 (ag)   - added median_ci() and filter_outliers() for adaptive repetition
+#
+#    10/18/2026 (ag)   - added summarize_samples()
+#
+#    10/18/2026 (ag)   - modified summarize_samples() to leave out failed runs' samples (no timing)
+#                      - added get_samples_status()
+#
+#    10/18/2026 (ag)   - added combine_trials() (a problem size's trials run as separate queued jobs)
+#
+# (ag) agent
+#
+# ---------------------------------------------------------
+
+# standard modules
+import math
+import statistics
+
+# -----------------------------------------------------------------
+
+def summarize(values) :
+    """ Summary statistics of a problem size's sample timings
+
+        In:  values - sample timings (list of floats, at least one)
+        Out: minimum - smallest sample timing (float)
+             median  - median sample timing (float)
+             mean    - mean sample timing (float)
+             stdev   - sample standard deviation (float)
+                       (0.0 when there is only one sample)
+    """
+
+    minimum = min(values)
+    median  = statistics.median(values)
+    mean    = statistics.fmean(values)
+
+    if len(values) > 1 :
+        stdev = statistics.stdev(values)
+    else :
+        stdev = 0.0
+
+    return [minimum, median, mean, stdev]
+
+# end function: summarize
+
+# -----------------------------------------------------------------
+
+def summarize_samples(samples) :
+    """ Summary statistics of a problem size's samples (outlier samples, and
+        failed runs' samples, are left out)
+
+        In:  samples     - info about each measured run (list of dictionaries with
+                           "timing", "wall_time", "user_time", "sys_time" and "outlier")
+                           (a failed run's "timing" is None)
+        Out: num_samples - # of samples that are not outliers or failed runs (integer)
+             minimum     - smallest sample timing (float, None if num_samples is 0)
+             median      - median sample timing (float, None if num_samples is 0)
+             mean        - mean sample timing (float, None if num_samples is 0)
+             stdev       - sample standard deviation (float, None if num_samples is 0)
+             wall_time   - median wall clock time (float, None if no sample has one)
+             user_time   - median user CPU time (float, None if no sample has one)
+             sys_time    - median system CPU time (float, None if no sample has one)
+    """
+
+    kept_samples = [sample for sample in samples if not sample["outlier"] and sample["timing"] is not None]
+
+    if len(kept_samples) > 0 :
+        [minimum, median, mean, stdev] = summarize([sample["timing"] for sample in kept_samples])
+    else :
+        [minimum, median, mean, stdev] = [None, None, None, None]
+
+    # manually entered timings have no Python-measured times
+    times = []
+    for name in ["wall_time", "user_time", "sys_time"] :
+        values = [sample[name] for sample in kept_samples if sample[name] is not None]
+        times.append(statistics.median(values) if len(values) > 0 else None)
+
+    [wall_time, user_time, sys_time] = times
+
+    return [len(kept_samples), minimum, median, mean, stdev, wall_time, user_time, sys_time]
+
+# end function: summarize_samples
+
+# -----------------------------------------------------------------
+
+def get_samples_status(samples) :
+    """ Outcome of a problem size's runs
+
+        In:  samples - info about each measured run (list of dictionaries)
+                       (samples without a "status", e.g. manually entered timings, are "ok")
+        Out: status  - "ok" if every run was ok, otherwise the first failed run's
+                       status (string, see runner.get_run_status())
+    """
+
+    for sample in samples :
+        status = sample.get("status", "ok")
+        if status != "ok" :
+            return status
+
+    return "ok"
+
+# end function: get_samples_status
+
+# -----------------------------------------------------------------
+
+def combine_trials(trial_samples, method) :
+    """ Combine a problem size's trials that were run separately (e.g. by different
+        worker processes) into its timing
+
+        In:  trial_samples - each trial's # and samples (list of [trial, samples])
+                             (a trial's samples are its measured run, and a failed
+                              warmup run (trial # 0) if one failed)
+             method        - outlier filter (string, see filter_outliers())
+        Out: timing        - median of the trials' (non-outlier) timings (float)
+                             (None if a run failed)
+             samples       - every trial's samples, numbered by trial, with "outlier" set
+                             (list of dictionaries)
+    """
+
+    samples = []
+    for [trial, trial_runs] in sorted(trial_samples, key=lambda entry : entry[0]) :
+        for sample in trial_runs :
+            if sample["trial"] != 0 :
+                sample["trial"] = trial
+            samples.append(sample)
+
+    if get_samples_status(samples) != "ok" :
+        for sample in samples :
+            sample["outlier"] = False
+        return [None, samples]
+
+    timings  = [sample["timing"] for sample in samples]
+    outliers = filter_outliers(timings, method)
+    for k in range(0, len(samples)) :
+        samples[k]["outlier"] = outliers[k]
+
+    return [statistics.median([timings[k] for k in range(0, len(timings)) if not outliers[k]]), samples]
+
+# end function: combine_trials
+
+# -----------------------------------------------------------------
+
+def median_ci(values, confidence) :
+    """ Distribution-free confidence interval of the median of sample timings
+
+        In:  values     - sample timings (list of floats, at least one)
+             confidence - confidence level of the interval (float, e.g. 0.95)
+        Out: ci_low     - lower end of the confidence interval (float)
+             ci_high    - upper end of the confidence interval (float)
+
+        The interval's ends are order statistics chosen with the binomial distribution
+        (no assumption about how the timings are distributed). When there are too few
+        samples to reach the confidence level, the whole range of the samples is returned.
+    """
+
+    values = sorted(values)
+    n = len(values)
+    alpha = 1.0 - confidence
+
+    # find the largest k where P(fewer than k samples below the median) <= alpha/2;
+    # the interval is then [k-th smallest, k-th largest]
+    k = 0
+    cumulative = 0.0
+    while k < n // 2 :
+        cumulative += math.comb(n, k) / 2.0**n
+        if cumulative > alpha / 2.0 :
+            break
+        k += 1
+
+    if k == 0 :
+        return [values[0], values[-1]]
+
+    return [values[k-1], values[n-k]]
+
+# end function: median_ci
+
+# -----------------------------------------------------------------
+
+def filter_outliers(values, method) :
+    """ Find which sample timings are outliers
+
+        In:  values   - sample timings (list of floats)
+             method   - outlier filter (string):
+                           "mad"  - more than 3.5 scaled median absolute deviations from the median
+                           "iqr"  - more than 1.5 interquartile ranges outside the quartiles
+                           "none" - no outliers
+        Out: outliers - is each sample timing an outlier? (list of booleans)
+
+        Fewer than 3 sample timings never have outliers
+    """
+
+    outliers = [False] * len(values)
+
+    if method == "none" or len(values) < 3 :
+        return outliers
+
+    if method == "mad" :
+        median = statistics.median(values)
+        mad = 1.4826 * statistics.median([abs(value - median) for value in values])
+        if mad > 0.0 :
+            outliers = [abs(value - median) > 3.5 * mad for value in values]
+
+    elif method == "iqr" :
+        [q1, q2, q3] = statistics.quantiles(values, n=4, method="inclusive")
+        iqr = q3 - q1
+        if iqr > 0.0 :
+            outliers = [value < q1 - 1.5 * iqr or value > q3 + 1.5 * iqr for value in values]
+
+    return outliers
+
+# end function: filter_outliers
+
+# -----------------------------------------------------------------
@@ -12,6 +12,11 @@
 #         - display timings for a program
 #         - delete all of a program's timings
 #         - plot timings for a program
+#         - change application settings
+#         - export timings to a CSV file
+#         - analyze a program's timing complexity
+#         - sweep a program's problem sizes within a time budget
+#         - resume an interrupted sweep
 #
 #    - runs on Linux (not tested on Windows)
 #    - Python 3.x (not tested with Python 2.x)
@@ -144,13 +149,96 @@
 #
 #    12/31/2018 (pf)   - RELEASING AS VERSION 1.0
 #
+#    10/18/2026 (ag)   - modified generate_and_add_timings()
+#                           - generates all of the entered problem sizes with one call to
+#                             main.generate_and_add_timings(), which runs them in parallel
+#                           - prints each timing as soon as it finishes
+#                      - added change_settings()
+#                      - modified top_menu() to add new change settings option
+#
+#    10/18/2026 (ag)   - modified change_settings() to handle settings chosen from a list of values
+#
+#    10/18/2026 (ag)   - modified display_timings()
+#                           - displays each problem size's # of samples and min/median/mean/stdev timings
+#                      - modified manually_add_timings()
+#                                 generate_and_add_timings()
+#                                 choose_program_and_display_timings()
+#                                 plot_timings()
+#                           - use main.get_timing_stats() instead of main.get_timings()
+#                      - modified plot_timings() to add standard deviation error bars
+#
+#    10/18/2026 (ag)   - modified manually_add_timings()
+#                                 generate_and_add_timings()
+#                           - check for a problem size already in the database with main.has_timing()
+#                             (an index lookup) instead of searching the program's list of problem sizes
+#                           - an existing problem size's timing is skipped, replaced or merged, depending
+#                             on the "on_conflict" setting
+#
+#    10/18/2026 (ag)   - modified display_timings()
+#                           - displays timing rows as they are streamed from main.iter_timings()
+#                           - displays the "has no timings" message itself
+#                      - modified manually_add_timings()
+#                                 generate_and_add_timings()
+#                                 choose_program_and_display_timings()
+#                           - pass main.iter_timings() to display_timings()
+#                      - added export_timings()
+#                      - modified top_menu() to add new export timings option
+#
+#    10/18/2026 (ag)   - modified plot_timings()
+#                           - gets all the chosen programs' timings with one main.get_timings_many() call
+#
+#    10/18/2026 (ag)   - added analyze_complexity()
+#                      - modified top_menu() to add new analyze complexity option
+#
+#    10/18/2026 (ag)   - added sweep_timings()
+#                      - modified top_menu() to add new problem size sweep option
+#
+#    10/18/2026 (ag)   - modified display_timings(), generate_and_add_timings() and sweep_timings()
+#                        to show the status of failed problem sizes (e.g. "timeout")
+#                      - added print_generated_timing()
+#                      - modified delete_program_timings() to also count failed problem sizes
+#
+#    10/18/2026 (ag)   - modified generate_and_add_timings() to only skip problem sizes whose stored
+#                        timing matches the program's current executable (main.get_cached_sizes())
+#
+#    10/18/2026 (ag)   - modified generate_and_add_timings() to record the problem sizes as a sweep
+#                        (main.plan_sweep()), which can be resumed if it is interrupted (e.g. Ctrl-C)
+#                      - added resume_sweep() and run_sweep()
+#                      - modified top_menu() to add new resume sweep option
+#
+#    10/18/2026 (ag)   - modified change_settings() to input settings that are free-form strings
+#                        (e.g. "cpu_affinity")
+#
+#    10/18/2026 (ag)   - modified plot_timings()
+#                           - can plot the programs' resource usage (e.g. peak memory) under their timings
+#                           - uses the figure manager's set_window_title() (the canvas' was removed
+#                             in matplotlib 3.6)
+#                      - added choose_metrics()
+#
+#    10/18/2026 (ag)   - modified add_program() to add Python functions as programs (called in-process)
+#                      - generating/displaying timings checks that the program exists with
+#                        main.program_exists() (an executable, or a Python module)
+#
+#    10/18/2026 (ag)   - modified add_program() to choose the program's type, which can also be a
+#                        C function in a shared library (called in-process with ctypes)
+#
+#    10/18/2026 (ag)   - modified add_program() to add sweep programs (measure all of the problem
+#                        sizes in one run)
+#
+#    10/18/2026 (ag)   - modified generate_and_add_timings() to regenerate problem sizes whose stored
+#                        timing failed (e.g. a timeout) instead of skipping them
+#
+#    10/18/2026 (ag)   - modified sweep_timings(): Ctrl-C stops the sweep and returns to the menu
+#                        (the timings finished so far are kept)
+#
 # (pf) Patrick Flynn
+# (ag) agent
 #
 # ======================================================================================
 
 # standard modules
-import os
 import sys
+import time
 
 # third-party modules
 import matplotlib.pyplot as plt
@@ -163,6 +251,27 @@ import matplotlib.pyplot as plt
 #   of at the beginning. Did not investigate the suggestion. Just put it there to get
 #   it working first thing!
 
+# ======================================================================================
+
+# resource usage that can be plotted under the timings (see db.sample_metrics):
+#    name -> [axis label, scale of the stored values]
+metric_plots = {
+    "max_rss"            : ["peak memory (MB)", 1.0 / (1024 * 1024)],
+    "minor_faults"       : ["minor page faults", 1.0],
+    "major_faults"       : ["major page faults", 1.0],
+    "vol_ctx_switches"   : ["voluntary context switches", 1.0],
+    "invol_ctx_switches" : ["involuntary context switches", 1.0],
+}
+
+# types of programs that can be added (see runner.program_types):
+#    program type -> prompt for its command line prefix
+program_type_prompts = {
+    "executable" : "Command line prefix (e.g. \"l2vecnorm\") : ",
+    "python"     : "Python function (\"module:function\" or \"module:function:setup\") : ",
+    "library"    : "Shared library function (e.g. \"libl2vecnorm.so:l2norm(double*, long)\") : ",
+    "sweep"      : "Command line prefix of the sweep program (e.g. \"l2vecnorm_sweep\") : ",
+}
+
 # ======================================================================================
 #
 #    Utility functions
@@ -341,6 +450,11 @@ def top_menu() :
         print("(6) Display a program's timings in the database")
         print("(7) Delete all of a program's timings")
         print("(8) Plot timings for programs")
+        print("(9) Change settings")
+        print("(10) Export timings to a CSV file")
+        print("(11) Analyze a program's timing complexity")
+        print("(12) Automatically sweep a program's problem sizes within a time budget")
+        print("(13) Resume an interrupted sweep")
         print("")
 
         # user inputs the menu option #
@@ -378,6 +492,21 @@ def top_menu() :
         elif selection == 8 :  # plot timings for program(s)
             plot_timings()
 
+        elif selection == 9 :  # change application settings
+            change_settings()
+
+        elif selection == 10 : # export timings to a CSV file
+            export_timings()
+
+        elif selection == 11 : # analyze a program's timing complexity
+            analyze_complexity()
+
+        elif selection == 12 : # sweep a program's problem sizes within a time budget
+            sweep_timings()
+
+        elif selection == 13 : # resume an interrupted sweep
+            resume_sweep()
+
         else :                 # improper entry
             print("\nIMPROPER ENTRY!")
 
@@ -487,17 +616,36 @@ def add_program() :
         new_prog_desc       = input("Description : ").strip()
         if new_prog_desc == "" : return
 
-        new_cmd_line_prefix = input("Command line prefix (e.g. \"l2vecnorm\") : ").strip()
+        # a Python function or a shared library's C function is called in-process
+        # (for kernels too quick to time as an executable)
+        print("Program types: " + ", ".join(program_type_prompts))
+        new_prog_type = input("Program type (BLANK for executable) : ").strip()
+        if new_prog_type == "" :
+            new_prog_type = "executable"
+        if new_prog_type not in program_type_prompts :
+            print("Invalid program type")
+            continue
+
+        new_cmd_line_prefix = input(program_type_prompts[new_prog_type]).strip()
+
         if new_cmd_line_prefix == "" : return
         else:
-            # see if there is an executable file of that name
-            filepath = './' + new_cmd_line_prefix
-            if not os.path.isfile(filepath) :
-                print("That executable file doesn't exist in current directory!")
+            # see if there is an executable file (or Python module, or shared library) of that name
+            if not main.program_exists(new_cmd_line_prefix, new_prog_type) :
+                if new_prog_type == "python" :
+                    print("That Python module doesn't exist in current directory!")
+                elif new_prog_type == "library" :
+                    print("That shared library doesn't exist in current directory!")
+                else :
+                    print("That executable file doesn't exist in current directory!")
                 if not yes_or_no("Do you want to add the program anyway?") :
                     return
 
-        main.add_program(new_prog_name, new_prog_desc, new_cmd_line_prefix)
+        try :
+            main.add_program(new_prog_name, new_prog_desc, new_cmd_line_prefix, new_prog_type)
+        except ValueError as ex :
+            print(ex)
+            return
         print()
         print("Program \"{}\" added.".format(new_prog_name))
         
@@ -528,23 +676,40 @@ def delete_program() :
 
 # -----------------------------------------------------------------
 
-def display_timings(prog_name, prob_sizes, timings) :
+def display_timings(prog_name, timing_rows) :
     """ Display all of a program's timings in the database
 
-        In:  prog_name  - name of the program displaying timings for (string)
-             prob_sizes - the program's problems sizes (list)
-             timings    - the program's timings
+        In:  prog_name   - name of the program displaying timings for (string)
+             timing_rows - the program's timing rows (iterable, e.g. main.iter_timings(prog_name)):
+                              [prog_name, prob_size, timing (median), timing_min, timing_mean,
+                               timing_stdev, num_samples, status]
         Out: nothing
     """
 
-    print()
-    print("     \"" + prog_name + "\" timings in database")
-    print()
-    print("  Problem size   Timing")
-    print("  ------------   ---------------")
+    # rows are displayed as they are read, so the heading waits for the first row
+    num_timings = 0
+    for [row_prog_name, prob_size, timing, timing_min, timing_mean, timing_stdev, num_samples, status] in timing_rows :
+
+        if num_timings == 0 :
+            print()
+            print("     \"" + prog_name + "\" timings in database")
+            print()
+            print("  Problem size   Samples   Min               Timing (median)   Mean              Stdev")
+            print("  ------------   -------   ---------------   ---------------   ---------------   ---------------")
 
-    for k in range(0, len(prob_sizes)) :
-        print("  {:<12d}   {:>15.6f}".format(prob_sizes[k], timings[k]))
+        # a failed problem size has no timing, only its status
+        if status != "ok" :
+            print("  {:<12d}   {:>7d}   FAILED: {}".format(prob_size, num_samples, status))
+        else :
+            print("  {:<12d}   {:>7d}   {:>15.6f}   {:>15.6f}   {:>15.6f}   {:>15.6f}".format(
+                  prob_size, num_samples, timing_min, timing, timing_mean, timing_stdev))
+        num_timings += 1
+
+    # check if no timings were found
+    if num_timings == 0 :
+        print()
+        print(prog_name, "has no timings in database")
+        return
 
     print()
 
@@ -565,14 +730,7 @@ def manually_add_timings() :
     if prog_name == "":
         return
     else :
-        [prob_sizes, timings]  = main.get_timings(prog_name)
-        
-        # check if no timings were found
-        if len(prob_sizes) == 0 :
-            print()
-            print(prog_name, "has no timings in database")
-        else :
-            display_timings(prog_name, prob_sizes, timings)
+        display_timings(prog_name, main.iter_timings(prog_name))
 
         # each loop is a manual entry of a program size and its accompanying timing
         while 1 :
@@ -590,9 +748,13 @@ def manually_add_timings() :
                 prob_size = prob_size_input[0]
 
                 # is problem size already in database for the chosen program?
-                if prob_size in prob_sizes :
-                    print("Problem size already in database for the chosen program")
-                    continue
+                # (only a problem in the "skip" conflict setting)
+                on_conflict = main.settings["on_conflict"]
+                if main.has_timing(prog_name, prob_size) :
+                    if on_conflict == "skip" :
+                        print("Problem size already in database for the chosen program")
+                        continue
+                    print("Problem size already in database for the chosen program. Timing will be {}d".format(on_conflict))
                 
                 timing_input = get_float_from_input("Enter a timing (nonnegative decimal, BLANK line to exit) : ")
                 
@@ -603,9 +765,8 @@ def manually_add_timings() :
                     print("Timing needs to be >= 0")
                     return                
                 else :
-                    main.add_timing(prog_name, prob_size, timing_input[0])
+                    main.add_timing(prog_name, prob_size, timing_input[0], None, on_conflict)
                     print("Timing added to database")
-                    prob_sizes.append(prob_size)
                     
 # end function: manually_add_timings
 
@@ -624,21 +785,13 @@ def generate_and_add_timings() :
     if prog_name == "":
         return
     else :
-        # check if external executable program exists in current directory
+        # check if external executable program (or Python module) exists in current directory
         cmd_line_prefix = main.get_cmd_line_prefix(prog_name)
-        filepath = './' + cmd_line_prefix
-        if not os.path.isfile(filepath) :
-            print("The \"{}\" external executable file doesn't exist in current directory!".format(cmd_line_prefix))
+        if not main.program_exists(cmd_line_prefix, main.get_program_type(prog_name)) :
+            print("The \"{}\" program doesn't exist in current directory!".format(cmd_line_prefix))
             return
         
-        [prob_sizes, timings]  = main.get_timings(prog_name)
-        
-        # check if no timings were found for the program
-        if len(prob_sizes) == 0 :
-            print()
-            print(prog_name, "has no timings in database")
-        else :
-            display_timings(prog_name, prob_sizes, timings)
+        display_timings(prog_name, main.iter_timings(prog_name))
 
         print()
             
@@ -649,25 +802,125 @@ def generate_and_add_timings() :
         if prob_sizes_input == [] :
             return
         else :
+            # weed out the problem sizes that shouldn't be generated
+            on_conflict = main.settings["on_conflict"]
+            [cached_sizes, stale_sizes, failed_sizes] = main.get_cached_sizes(prog_name, prob_sizes_input)
+            new_prob_sizes = []
+            entered_prob_sizes = set()
             for prob_size in prob_sizes_input :
                 if prob_size <= 0 :
                     print("Problem size of {} is invalid".format(prob_size,))
+                elif prob_size in entered_prob_sizes :
+                    print("Problem size {} entered more than once. SKIPPING".format(prob_size))
                 else :
+                    entered_prob_sizes.add(prob_size)
+
                     # is problem size already in database for the chosen program?
-                    if prob_size in prob_sizes :
-                        print("Problem size {} already in database for the chosen program. SKIPPING".format(prob_size))
-                        continue
-                    
-                    timing = main.generate_and_add_timing(prog_name, prob_size)
-                    print("Timing for problem size {} = {:>.6f} seconds".format(prob_size, timing))
-                    prob_sizes.append(prob_size)
-                    
-            print()
+                    # (only skipped in the "skip" conflict setting)
+                    if prob_size in cached_sizes :
+                        if on_conflict == "skip" :
+                            print("Problem size {} already in database for the chosen program. SKIPPING".format(prob_size))
+                            continue
+                        print("Problem size {} already in database for the chosen program. Timing will be {}d".format(prob_size, on_conflict))
+
+                    # a stale timing was generated by a different executable (e.g. recompiled)
+                    elif prob_size in stale_sizes :
+                        print("Problem size {} has a stale timing (program changed since). Timing will be replaced".format(prob_size))
+
+                    # a failed timing (e.g. a timeout) isn't a valid timing
+                    elif prob_size in failed_sizes :
+                        print("Problem size {} has a failed timing. Timing will be replaced".format(prob_size))
+
+                    new_prob_sizes.append(prob_size)
+
+            if new_prob_sizes == [] :
+                return
+
+            # recorded as a sweep, so that it can be resumed if interrupted
+            sweep_id = main.plan_sweep(prog_name, new_prob_sizes)
+            run_sweep(sweep_id)
                 
 # end function: generate_and_add_timings
 
 # -----------------------------------------------------------------
 
+def run_sweep(sweep_id) :
+    """ Run (or resume) a recorded sweep, printing its timings as they finish
+
+        In:  sweep_id - id of the sweep (integer)
+        Out: nothing
+
+        Ctrl-C stops the sweep (the finished timings are kept) and returns to the menu
+    """
+
+    print("\nSweep {} (Ctrl-C to stop it; it can be resumed later)".format(sweep_id))
+
+    # timings are printed as they finish (in parallel, not necessarily in the entered order)
+    try :
+        for [prob_size, timing, status] in main.run_sweep(sweep_id) :
+            print_generated_timing(prob_size, timing, status)
+    except KeyboardInterrupt :
+        print("\nSweep {} interrupted. Resume it with menu option 13".format(sweep_id))
+
+    print()
+
+# end function: run_sweep
+
+# -----------------------------------------------------------------
+
+def resume_sweep() :
+    """ Choose an interrupted sweep and resume it
+
+        In:  nothing
+        Out: nothing
+    """
+
+    sweeps = main.get_unfinished_sweeps()
+
+    if sweeps == [] :
+        print("\nThere are no interrupted sweeps")
+        return
+
+    print("\nInterrupted sweeps:\n")
+    print("Sweep #   Program                State         Started               Sizes done")
+    print("-------   --------------------   -----------   -------------------   ----------")
+    for [sweep_id, prog_name, state, started, num_sizes, num_done] in sweeps :
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started))
+        print("{:>7d}   {:<20s}   {:<11s}   {}   {:>4d} of {:d}".format(sweep_id, prog_name, state, started, num_done, num_sizes))
+
+    print()
+    sweep_id = get_int_from_input("Enter the sweep # to resume (BLANK to cancel): ")
+    if sweep_id == [] :
+        return
+
+    if sweep_id[0] not in [sweep[0] for sweep in sweeps] :
+        print("Sweep # {} isn't an interrupted sweep".format(sweep_id[0]))
+        return
+
+    run_sweep(sweep_id[0])
+
+# end function: resume_sweep
+
+# -----------------------------------------------------------------
+
+def print_generated_timing(prob_size, timing, status) :
+    """ Print a problem size's newly generated timing
+
+        In:  prob_size - problem size (integer)
+             timing    - timing for the problem size (float, None if a run failed)
+             status    - outcome of the problem size's runs (string, e.g. "ok" or "timeout")
+        Out: nothing
+    """
+
+    if status != "ok" :
+        print("Problem size {} FAILED: {}".format(prob_size, status))
+    else :
+        print("Timing for problem size {} = {:>.6f} seconds".format(prob_size, timing))
+
+# end function: print_generated_timing
+
+# -----------------------------------------------------------------
+
 def choose_program_and_display_timings() :
     """ Choose a program and display its timings
 
@@ -681,14 +934,7 @@ def choose_program_and_display_timings() :
     if prog_name == "":
         return
     else :
-        [prob_sizes, timings]  = main.get_timings(prog_name)
-        
-        # check if no timings were found
-        if len(prob_sizes) == 0 :
-            print()
-            print(prog_name, "has no timings in database")
-        else :
-            display_timings(prog_name, prob_sizes, timings)
+        display_timings(prog_name, main.iter_timings(prog_name))
 
 # end function: choose_and_display_timings
 
@@ -706,11 +952,10 @@ def delete_program_timings() :
     if prog_name == "":
         return
     else :
-        # get timings that are being deleted
-        [prob_sizes, timings]  = main.get_timings(prog_name)
-        
+        # count the timings that are being deleted (failed problem sizes too)
+        num_timings = sum(1 for row in main.iter_timings(prog_name))
+
         # check if any timings were found
-        num_timings = len(prob_sizes)
         if num_timings == 0 :
             print()
             print(prog_name, "has no timings in database")
@@ -742,11 +987,9 @@ def plot_timings() :
         return
     else :
        
-        # looping through chosen programs to make sure have at least
-        # one set of program's timings to plot
-        valid_prog_names   = []
-        valid_prob_sizes   = []
-        valid_prog_timings = []
+        # looping through chosen programs to get the valid program #'s
+        chosen_prog_nums  = []
+        chosen_prog_names = []
         for k in range(0,len(prog_nums_input)) :
 
             prog_num = prog_nums_input[k]
@@ -755,12 +998,24 @@ def plot_timings() :
             if prog_num < 1 or prog_num > len(prog_names) :
                 print("{} is not a valid program #".format(prog_num))
                 continue
-            
-            # get current program's program name
-            prog_name = prog_names[prog_num-1]
-            
-            # get current program's timings
-            [prob_sizes, timings] = main.get_timings(prog_name)
+
+            chosen_prog_nums.append(prog_num)
+            chosen_prog_names.append(prog_names[prog_num-1])
+
+        # get all the chosen programs' timings (and their spread, for the error bars) at once
+        timings_arrays = main.get_timings_many(chosen_prog_names)
+
+        # looping through chosen programs to make sure have at least
+        # one set of program's timings to plot
+        valid_prog_names   = []
+        valid_prob_sizes   = []
+        valid_prog_timings = []
+        valid_prog_stdevs  = []
+        for [prog_num, prog_name, timings_array] in zip(chosen_prog_nums, chosen_prog_names, timings_arrays) :
+
+            prob_sizes    = timings_array["problem_size"]
+            timings       = timings_array["timing"]
+            timing_stdevs = timings_array["timing_stdev"]
             
             # check if current program has any timings
             if len(prob_sizes) == 0 :
@@ -772,34 +1027,268 @@ def plot_timings() :
                 valid_prog_names.append(prog_name)
                 valid_prob_sizes.append(prob_sizes)
                 valid_prog_timings.append(timings)
+                valid_prog_stdevs.append(timing_stdevs)
 
         # check to see if ended up with any chosen programs
         # that actually have timings
         if len(valid_prog_names) == 0 :
             print("None of the valid programs have timings")
         else :
-            # start up the plot
-            fig = plt.figure()
+            # resource usage (e.g. peak memory) to plot under the timings
+            metric_names = choose_metrics()
+
+            # start up the plot: the timings on top, each chosen resource usage under them
+            [fig, axes] = plt.subplots(1 + len(metric_names), 1, sharex=True, squeeze=False)
+            axes = axes[:, 0]
             title = 'Timing vs Problem Size'
-            fig.canvas.set_window_title(title) 
+            if fig.canvas.manager is not None :
+                fig.canvas.manager.set_window_title(title)
 
             # plotting the timing curves for the chosen programs that actually have timings
-            for prob_sizes, timings in zip(valid_prob_sizes, valid_prog_timings) :
+            for prob_sizes, timings, timing_stdevs in zip(valid_prob_sizes, valid_prog_timings, valid_prog_stdevs) :
             
-                # plot the current program's timings
-                plt.plot(prob_sizes, timings, 'o-')
+                # plot the current program's timings (medians), with +/- one standard deviation error bars
+                axes[0].errorbar(prob_sizes, timings, yerr=timing_stdevs, fmt='o-', capsize=3)
+
+            # plotting the resource usage curves (medians of the samples), in the same program order
+            # (so each program keeps its color; a program without resource usage gets an empty curve)
+            for [axis, metric_name] in zip(axes[1:], metric_names) :
+                [label, scale] = metric_plots[metric_name]
+                for [prob_sizes, values] in main.get_sample_metric_many(valid_prog_names, metric_name) :
+                    axis.plot(prob_sizes, values * scale, 'o-')
+                axis.set_ylabel(label)
 
             # add overall plotting embellishments 
-            plt.xlabel('problem size')
-            plt.ylabel('timing (seconds)')
-            plt.title(title)
-            plt.legend(valid_prog_names)
+            axes[-1].set_xlabel('problem size')
+            axes[0].set_ylabel('timing (seconds)')
+            axes[0].set_title(title)
+            axes[0].legend(valid_prog_names)
             plt.show()
 
 # end function: plot_timings
 
 # -----------------------------------------------------------------
 
+def choose_metrics() :
+    """ Choose the resource usage to plot under the timings
+
+        In:  nothing
+        Out: metric_names - the chosen resource usage (list of strings, see metric_plots)
+    """
+
+    all_metric_names = list(metric_plots.keys())
+
+    print()
+    for k in range(0, len(all_metric_names)) :
+        print("{}) {}".format(k+1, metric_plots[all_metric_names[k]][0]))
+    print()
+
+    metric_nums_input = get_ints_from_input("Enter resource usage #'s to plot under the timings (e.g., 1 3, BLANK for none): ")
+
+    metric_names = []
+    for metric_num in metric_nums_input :
+        if metric_num < 1 or metric_num > len(all_metric_names) :
+            print("{} is not a valid resource usage #".format(metric_num))
+            continue
+        metric_names.append(all_metric_names[metric_num-1])
+
+    return metric_names
+
+# end function: choose_metrics
+
+# -----------------------------------------------------------------
+
+def change_settings() :
+    """ Display and change the application settings
+
+        In:  nothing
+        Out: nothing
+    """
+
+    # each loop displays the settings and changes one of them
+    while 1 :
+        setting_names = list(main.settings.keys())
+
+        print()
+        print("\t\tSettings")
+        print()
+        print("    Setting              Value")
+        print("    -------------------- --------------------")
+
+        for k in range(0, len(setting_names)) :
+            print("{:>2d}) {:<20s} {}".format(k+1, setting_names[k], main.settings[setting_names[k]]))
+
+        print()
+        setting_num = get_int_from_input("Choose the setting # to change (BLANK to exit): ")
+
+        # check for no entry
+        if setting_num == [] :
+            return
+
+        setting_num = setting_num[0]
+        if setting_num < 1 or setting_num > len(setting_names) :
+            print("Invalid setting #")
+            continue
+
+        name = setting_names[setting_num-1]
+
+        # new value is input as the same type as the setting's current value
+        current_value = main.settings[name]
+        if name in main.setting_choices :
+            print("Choices: " + ", ".join(main.setting_choices[name]))
+            value_string = input("New value for {} (BLANK to cancel): ".format(name)).strip()
+            value_input = [value_string] if value_string != "" else []
+        elif isinstance(current_value, str) :
+            value_string = input("New value for {} (- to clear, BLANK to cancel): ".format(name)).strip()
+            value_input = [value_string] if value_string != "" else []
+            if value_input == ["-"] :
+                value_input = [""]
+        elif isinstance(current_value, int) :
+            value_input = get_int_from_input("New value for {} (BLANK to cancel): ".format(name))
+        else :
+            value_input = get_float_from_input("New value for {} (BLANK to cancel): ".format(name))
+
+        if value_input == [] :
+            continue
+
+        try :
+            main.set_setting(name, value_input[0])
+        except ValueError as ex :
+            print("INPUT ERROR! {}".format(ex))
+
+# end function: change_settings
+
+# -----------------------------------------------------------------
+
+def export_timings() :
+    """ Export one program's (or all programs') timings to a CSV file
+
+        In:  nothing
+        Out: nothing
+    """
+
+    [prog_names, descriptions, cmd_line_prefixes] = display_programs()
+    if len(prog_names) == 0: return
+
+    print()
+    prog_num = get_int_from_input("Choose the program # to export (0 for all programs, BLANK to cancel): ")
+
+    # check for no entry
+    if prog_num == [] :
+        return
+
+    prog_num = prog_num[0]
+    if prog_num == 0 :
+        prog_name = None
+    elif prog_num < 1 or prog_num > len(prog_names) :
+        print("Invalid program #")
+        return
+    else :
+        prog_name = prog_names[prog_num-1]
+
+    csv_filename = input("CSV file name (BLANK to cancel): ").strip()
+    if csv_filename == "" : return
+
+    num_timings = main.export_timings(csv_filename, prog_name)
+    print("{} timings exported to {}".format(num_timings, csv_filename))
+
+# end function: export_timings
+
+# -----------------------------------------------------------------
+
+def analyze_complexity() :
+    """ Choose a program and display how well each growth model fits its timings
+
+        In:  nothing
+        Out: nothing
+    """
+
+    prog_name = choose_program()
+
+    # check if no program was selected
+    if prog_name == "":
+        return
+
+    [best_fit, fits] = main.fit_complexity(prog_name)
+
+    if best_fit is None :
+        print()
+        print(prog_name, "needs at least 3 timings to analyze its complexity")
+        return
+
+    print()
+    print("     \"" + prog_name + "\" timing complexity")
+    print()
+    print("  Model        a                 b                 R^2           Rel. RMS error")
+    print("  ----------   ---------------   ---------------   -----------   --------------")
+
+    for fit in fits :
+        [a, b] = fit["coefficients"]
+        print("  {:<10s}   {:>15.6g}   {:>15.6g}   {:>11.6f}   {:>14.6f}{}".format(
+              fit["model"], a, b, fit["r_squared"], fit["rel_rms_error"],
+              "   <== best fit" if fit is best_fit else ""))
+
+    print()
+    print("  (growth models are  timing = a + b * f(n);  the power law is  timing = a * n^b)")
+    print()
+
+# end function: analyze_complexity
+
+# -----------------------------------------------------------------
+
+def sweep_timings() :
+    """ Generate and add a program's timings for growing problem sizes, until a time budget is used up
+
+        In:  nothing
+        Out: nothing
+
+        Ctrl-C stops the sweep (the finished timings are kept) and returns to the menu
+    """
+
+    prog_name = choose_program()
+
+    # check if no program was selected
+    if prog_name == "":
+        return
+
+    # check if external executable program (or Python module) exists in current directory
+    cmd_line_prefix = main.get_cmd_line_prefix(prog_name)
+    if not main.program_exists(cmd_line_prefix, main.get_program_type(prog_name)) :
+        print("The \"{}\" program doesn't exist in current directory!".format(cmd_line_prefix))
+        return
+
+    print()
+    start_size = get_int_from_input("Starting problem size (BLANK to cancel): ")
+    if start_size == [] : return
+
+    growth_factor = get_float_from_input("Growth factor of the problem sizes (e.g., 2, BLANK to cancel): ")
+    if growth_factor == [] : return
+
+    total_budget = get_float_from_input("Time budget of the whole sweep in seconds (BLANK to cancel): ")
+    if total_budget == [] : return
+
+    max_run_time = get_float_from_input("Most seconds for one run of the program (BLANK to cancel): ")
+    if max_run_time == [] : return
+
+    print("\n(Ctrl-C to stop the sweep)")
+    num_timings = 0
+    try :
+        for [prob_size, timing, status] in main.sweep_timings(prog_name, start_size[0], growth_factor[0], total_budget[0], max_run_time[0]) :
+            print_generated_timing(prob_size, timing, status)
+            num_timings += 1
+    except ValueError as ex :
+        print("ERROR! {}".format(ex))
+        return
+    except KeyboardInterrupt :
+        print("\nSweep interrupted: {} problem sizes timed".format(num_timings))
+        return
+
+    print("Sweep done: {} problem sizes timed".format(num_timings))
+
+# end function: sweep_timings
+
+# -----------------------------------------------------------------
+
 
 # custom module
 import pycnumanal as main
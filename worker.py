@@ -0,0 +1,213 @@
+# worker.py : Worker processes of the pycnumanal application's work queue
+#
+#    VERSION 1.00
+#
+#    - runs the jobs queued in the database (see pycnumanal.enqueue_timings() and
+#      the batch module's "queue" job files) until stopped:
+#
+#         python3 pycnumanal.py --worker [--worker-id NAME] [--exit-when-empty] [--shared]
+#
+#    - any # of workers can share a queue: start several on one host, or on several
+#      hosts whose current directories are the same shared directory (with "--shared",
+#      and the programs' executables built for every host)
+#    - a worker claims one job at a time with a lease, which it renews while the job
+#      runs; a killed worker's job is requeued when its lease runs out
+#    - progress is printed as JSON lines (one JSON object per line) on stdout
+#
+#    - runs on Linux (not tested on Windows)
+#    - Python 3.x (not tested with Python 2.x)
+#
+# --------------------------------------------------------
+#
+# Change log:
+#
+#    10/18/2026 (ag)   - created this module
+#                      - added run_worker() and run_job()
+#                      - added Heartbeat class
+#
+# (ag) agent
+#
+# ---------------------------------------------------------
+
+# standard modules
+import os
+import signal
+import socket
+import threading
+import time
+
+# custom modules
+import batch
+import database as db
+
+# -----------------------------------------------------------------
+
+# seconds a worker waits before checking an empty work queue again
+poll_interval = 2.0
+
+# -----------------------------------------------------------------
+
+class Heartbeat :
+    """ Renews a worker's lease of a job from its own thread while the job runs
+
+        The lease is renewed every third of the lease time, so a renewal can be
+        late (e.g. the database is busy) without the lease running out. Leaving the
+        "with" block stops the renewals.
+    """
+
+    def __init__(self, job_id, worker_id, lease_time) :
+        """ Starts the heartbeat's thread
+
+            In:  job_id     - id of the job (integer)
+                 worker_id  - name of the worker (string)
+                 lease_time - seconds the lease lasts unless renewed (float)
+        """
+
+        self.job_id     = job_id
+        self.worker_id  = worker_id
+        self.lease_time = lease_time
+
+        self.stopped    = threading.Event()
+        self.lease_lost = False  # did a renewal find the job requeued?
+
+        self.thread = threading.Thread(target=self.renew_loop, name="Heartbeat", daemon=True)
+        self.thread.start()
+
+    # end method: __init__
+
+    # -----------------------------------------------------------------
+
+    def renew_loop(self) :
+        """ The heartbeat thread: renews the lease until stopped (or the lease is lost)
+
+            In:  nothing
+            Out: nothing
+        """
+
+        try :
+            while not self.stopped.wait(self.lease_time / 3.0) :
+                if not db.renew_lease(self.job_id, self.worker_id, self.lease_time) :
+                    self.lease_lost = True
+                    return
+        finally :
+            # (a heartbeat per job: its connection isn't kept until the database is closed)
+            db.close_thread_connection()
+
+    # end method: renew_loop
+
+    # -----------------------------------------------------------------
+
+    def __enter__(self) :
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) :
+        self.stopped.set()
+        self.thread.join()
+
+# end class: Heartbeat
+
+# -----------------------------------------------------------------
+
+def run_job(job, worker_id) :
+    """ Run a claimed job and hand its result back to the work queue
+
+        In:  job       - the claimed job (dictionary, see db.claim_job())
+             worker_id - name of the worker (string)
+        Out: nothing
+
+        The job is released (given back to the queue) if it can't be run here,
+        e.g. the program's executable isn't in this host's current directory
+        (OSError), or the worker is stopped (KeyboardInterrupt)
+    """
+
+    fields = {"worker" : worker_id, "program" : job["program_name"], "problem_size" : job["problem_size"],
+              "trial" : job["trial"]}
+    batch.report("job_start", dict(fields, attempt=job["attempts"]))
+
+    try :
+        with Heartbeat(job["id"], worker_id, main.settings["lease_time"]) :
+            [timing, samples] = main.run_queued_job(job)
+    except (OSError, KeyboardInterrupt) :
+        db.release_job(job["id"], worker_id)
+        raise
+
+    [stored, collected] = db.finish_job(job["id"], worker_id, timing, samples)
+
+    # a job whose lease ran out was requeued; its result is thrown away
+    if not stored :
+        batch.report("lease_lost", fields)
+        return
+
+    batch.report("job_done", dict(fields, timing=timing, status=samples[-1]["status"]))
+
+    if collected is not None :
+        [prog_name, prob_size, timing, status] = collected
+        batch.report("timing", {"program" : prog_name, "problem_size" : prob_size, "timing" : timing, "status" : status})
+
+# end function: run_job
+
+# -----------------------------------------------------------------
+
+def run_worker(worker_id=None, exit_when_empty=False) :
+    """ Run jobs from the work queue until stopped (Ctrl-C or SIGTERM)
+
+        In:  worker_id       - name of this worker (string, None for "host:pid")
+             exit_when_empty - stop once no jobs are queued or running? (boolean)
+        Out: exit_code       - exit status of the worker (integer, see batch.exit_codes)
+                               ("error" if a job couldn't be run on this host)
+
+        The leases use this process's "lease_time" and "max_attempts" settings
+    """
+
+    if worker_id is None :
+        worker_id = "{}:{}".format(socket.gethostname(), os.getpid())
+
+    signal.signal(signal.SIGTERM, batch.stop_on_sigterm)
+
+    start_time = time.perf_counter()
+    batch.report("worker_start", {"worker" : worker_id})
+
+    num_jobs  = 0
+    exit_code = batch.exit_codes["ok"]
+    try :
+        while 1 :
+            [job, num_requeued, collected] = db.claim_job(worker_id, main.settings["lease_time"],
+                                                          main.settings["max_attempts"])
+
+            if num_requeued > 0 :
+                batch.report("requeued", {"worker" : worker_id, "num_jobs" : num_requeued})
+            for [prog_name, prob_size, timing, status] in collected :
+                batch.report("timing", {"program" : prog_name, "problem_size" : prob_size,
+                                        "timing" : timing, "status" : status})
+
+            if job is None :
+                if exit_when_empty :
+                    counts = db.get_queue_counts()
+                    if counts["queued"] == 0 and counts["leased"] == 0 :
+                        break
+                time.sleep(poll_interval)
+                continue
+
+            try :
+                run_job(job, worker_id)
+            except OSError as ex :
+                batch.report("error", {"worker" : worker_id, "message" : str(ex)})
+                exit_code = batch.exit_codes["error"]
+                break
+
+            num_jobs += 1
+
+    except KeyboardInterrupt :
+        exit_code = batch.exit_codes["interrupted"]
+
+    batch.report("worker_done", {"worker" : worker_id, "num_jobs" : num_jobs, "exit_code" : exit_code,
+                                 "seconds" : time.perf_counter() - start_time})
+
+    return exit_code
+
+# end function: run_worker
+
+# -----------------------------------------------------------------
+
+# custom module
+import pycnumanal as main